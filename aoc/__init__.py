@@ -0,0 +1,3 @@
+"""
+Shared tooling for running and measuring the solutions in the dayNN folders.
+"""
@@ -0,0 +1,222 @@
+"""
+Chooses between pure Python and NumPy for the solvers' dense numeric loops.
+
+    @backend.dispatch
+    def change(before: Grid) -> Grid:
+        ...                                 # pure Python, always there
+
+    @change.register("numpy")
+    def change_numpy(before: Grid) -> Grid:
+        np = backend.numpy()
+        ...
+
+    python -m aoc.runner 18 --backend python
+    AOC_BACKEND=python python -m aoc.runner 18     # same
+    with backend.use("python"):
+        ...
+
+A dispatched function runs the implementation registered for the current
+backend, which is "numpy" when NumPy can be imported and "python" when it
+cannot, unless AOC_BACKEND or `use` asks for another. Asking for a backend
+that is not installed falls back to python, so nothing needs NumPy to run.
+NumPy is only imported when a NumPy implementation is first called.
+
+NumPy implementations work on `view(grid)`, an ndarray over the grid's own
+buffer, and return the same types as the Python ones. `compare` runs a
+function on every available backend and checks that they agree; the days'
+test_backends use it on inputs from their generate.py.
+"""
+import contextlib
+import functools
+import importlib.util
+import io
+import os
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from aoc.grid import Grid
+
+
+F = TypeVar("F", bound=Callable)
+
+BACKENDS = ("python", "numpy")
+
+# Set by use(); takes precedence over AOC_BACKEND.
+_chosen: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=None)
+def numpy() -> Optional[ModuleType]:
+    """
+    The numpy module, or None if it is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        # installed() may have found it, but it does not import.
+        installed.cache_clear()
+        return None
+
+    return numpy
+
+
+@functools.lru_cache(maxsize=None)
+def installed() -> bool:
+    """
+    Whether NumPy can be imported, found without importing it. Looked up
+    once, since current() asks on every dispatched call.
+    """
+    if numpy.cache_info().currsize:
+        return numpy() is not None
+    try:
+        return importlib.util.find_spec("numpy") is not None
+    except ValueError:
+        return False
+
+
+def available() -> List[str]:
+
+    return [name for name in BACKENDS if name == "python" or installed()]
+
+
+def current() -> str:
+
+    name = _chosen or os.environ.get("AOC_BACKEND") or "numpy"
+    if name not in BACKENDS:
+        raise ValueError("unknown backend {!r}, expected one of {}".format(
+            name, ", ".join(BACKENDS)))
+    if name != "python" and name not in available():
+        return "python"
+
+    return name
+
+
+@contextlib.contextmanager
+def use(name: str) -> Iterator[None]:
+
+    global _chosen
+
+    if name not in BACKENDS:
+        raise ValueError("unknown backend {!r}".format(name))
+    saved, _chosen = _chosen, name
+    try:
+        yield
+    finally:
+        _chosen = saved
+
+
+def dispatch(function: F) -> F:
+    """
+    Makes function the python implementation of a dispatched function, to
+    which others are added with `.register(backend)`.
+    """
+    implementations: Dict[str, Callable] = {"python": function}
+
+    @functools.wraps(function)
+    def dispatcher(*args: Any, **kwargs: Any) -> Any:
+
+        return implementations.get(current(), function)(*args, **kwargs)
+
+    def register(name: str) -> Callable[[F], F]:
+
+        if name not in BACKENDS:
+            raise ValueError("unknown backend {!r}".format(name))
+
+        def decorate(implementation: F) -> F:
+
+            implementations[name] = implementation
+            return implementation
+
+        return decorate
+
+    dispatcher.register = register  # type: ignore
+    dispatcher.implementations = implementations  # type: ignore
+
+    return dispatcher  # type: ignore
+
+
+def view(grid: Grid, pad: int = 0) -> Any:
+    """
+    2-D ndarray sharing the cells of a grid: the inner rows and columns and
+    up to grid.pad of the padding around them. Writing to it writes to the
+    grid.
+    """
+    if pad > grid.pad:
+        raise ValueError("the grid has only {} of padding".format(grid.pad))
+    np = numpy()
+    cells = np.frombuffer(grid.cells, dtype=grid.typecode)
+    cells = cells.reshape(grid.rows + 2 * grid.pad, grid.stride)
+    skip = grid.pad - pad
+
+    return cells[skip:skip + grid.rows + 2 * pad,
+                 skip:skip + grid.cols + 2 * pad]
+
+
+def compare(function: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Result of function on every available backend, which must all agree.
+    """
+    results = dict()
+    for name in available():
+        with use(name):
+            results[name] = function(*args, **kwargs)
+
+    expected = results["python"]
+    for name, result in results.items():
+        if result != expected:
+            raise AssertionError("{} gives {!r} where python gives {!r}".format(
+                name, result, expected))
+
+    return expected
+
+
+def generated(day: int, size: int, seed: int = 0) -> io.StringIO:
+    """
+    An input from the generate.py of a day, as a file object.
+    """
+    from aoc.runner import load_modules
+
+    generator = load_modules(day, ["generate"])["generate"]
+
+    return io.StringIO(generator.generate(size, seed))
+
+
+def test_dispatch():
+
+    @dispatch
+    def double(x):
+        return 2 * x
+
+    @double.register("numpy")
+    def double_numpy(x):
+        return x + x + (current() == "numpy")
+
+    with use("python"):
+        assert double(3) == 6
+    with use("numpy"):
+        assert double(3) == (7 if numpy() is not None else 6)
+    assert double.__name__ == "double"
+
+    try:
+        compare(double, 3)
+    except AssertionError:
+        assert numpy() is not None
+    else:
+        assert numpy() is None
+
+
+def test_view():
+
+    if numpy() is None:
+        return
+
+    grid = Grid.from_lines(["ab", "cd"], pad=1, fill="#")
+    assert view(grid).tolist() == [[ord("a"), ord("b")], [ord("c"), ord("d")]]
+    assert view(grid, 1).shape == (4, 4)
+
+    view(grid)[1, 0] = ord("x")
+    assert grid.lines() == ["ab", "xd"]
+
+    numbers = Grid(2, 3, typecode="q")
+    view(numbers)[:] = [[1, 2, 3], [4, 5, 6]]
+    assert numbers.to_rows() == [[1, 2, 3], [4, 5, 6]]
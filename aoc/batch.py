@@ -0,0 +1,289 @@
+"""
+Solves one day for many puzzle inputs at once, streaming the answers back as
+JSON lines.
+
+    python -m aoc.batch 1 inputs/               # every file in a directory
+    python -m aoc.batch 16 requests.jsonl -j 8  # {"id": ..., "input": ...} lines
+    cat requests.jsonl | python -m aoc.batch 22 - --budget 30
+
+Every answer is printed as soon as it is ready, one JSON object per part and
+input: {"id", "day", "part", "answer", "wall", "cached", "error"}. The
+order follows completion, not the input.
+
+The inputs are spread over a pool of worker processes that import the day
+once and solve chunks of inputs, so cheap days are not dominated by process
+and message overhead. An input that runs past --budget seconds is stopped
+and reported with an error; its worker carries on with the next one.
+
+Work is shared wherever the answer cannot change:
+- identical inputs are solved once, whichever tenants sent them;
+- answers and intermediate artifacts, such as the day 16 opcode table and
+  the day 22 cave map, go through the cache of aoc.cache, so later batches
+  reuse them;
+- anything a day keeps at module level, such as the part of the day 11
+  power levels that does not depend on the serial number, lives for the
+  whole life of a worker.
+"""
+import hashlib
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from multiprocessing import util
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set,
+    TextIO, Tuple)
+
+from aoc.runner import PARTS, Result, load_day, run_part
+
+if TYPE_CHECKING:
+    from aoc.cache import ResultCache
+
+
+# Inputs sent to a worker at a time, and chunks in flight per worker.
+CHUNK = 8
+QUEUE_PER_WORKER = 4
+
+Record = Tuple[str, str]
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def read_directory(path: str) -> Iterator[Record]:
+
+    for name in sorted(os.listdir(path)):
+        filename = os.path.join(path, name)
+        if os.path.isfile(filename):
+            with open(filename) as f:
+                yield name, f.read()
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Record]:
+
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            record = json.loads(line)
+            yield str(record.get("id", number)), record["input"]
+
+
+def read_records(source: str) -> Iterator[Record]:
+
+    if source == "-":
+        yield from read_jsonl(sys.stdin)
+    elif os.path.isdir(source):
+        yield from read_directory(source)
+    else:
+        with open(source) as f:
+            yield from read_jsonl(f)
+
+
+# State of a worker process, set up by _start_worker.
+_worker: Dict[str, Any] = dict()
+
+
+def _on_alarm(signum, frame):
+
+    raise BudgetExceeded("over the time budget")
+
+
+def _start_worker(
+    days: List[int],
+    parts: List[int],
+    cache: Optional["ResultCache"]
+    ) -> None:
+
+    _worker["days"] = {day: load_day(day, parts) for day in days}
+    _worker["cache"] = cache
+    _worker["directory"] = tempfile.mkdtemp(prefix="aoc-batch-")
+    # Pool workers leave through multiprocessing, which runs finalizers but
+    # not atexit handlers.
+    util.Finalize(None, shutil.rmtree, args=(_worker["directory"], True),
+                  exitpriority=0)
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def solve_one(
+    day: int,
+    part: int,
+    text: str,
+    budget: Optional[float] = None
+    ) -> Result:
+    """
+    Solves one input in a worker started by _start_worker.
+    """
+    modules = _worker["days"].get(day, dict())
+    if part not in modules:
+        return Result(day, part, error="missing part{}.py".format(part))
+
+    filename = os.path.join(_worker["directory"], "input.txt")
+    with open(filename, "w") as f:
+        f.write(text)
+
+    if budget:
+        signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        return run_part(day, part, modules[part], filename, _worker["cache"])
+    except BudgetExceeded as e:
+        # The alarm went off outside the solver, after it had finished.
+        return Result(day, part, error="{}: {}".format(type(e).__name__, e))
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def solve_chunk(
+    day: int,
+    jobs: List[Tuple[int, str]],
+    budget: Optional[float]
+    ) -> List[Result]:
+
+    return [solve_one(day, part, text, budget) for part, text in jobs]
+
+
+def chunks(
+    records: Iterable[Record],
+    parts: List[int],
+    size: int,
+    groups: Dict[Tuple[str, int], List[str]]
+    ) -> Iterator[List[Tuple[int, str]]]:
+    """
+    Chunks of (part, text) jobs, one per distinct input and part. The ids
+    waiting for each job are added to groups, keyed by input digest and part;
+    ids of inputs that are already pending join the existing group.
+    """
+    chunk: List[Tuple[int, str]] = []
+    for id, text in records:
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        for part in parts:
+            key = (digest, part)
+            if key in groups:
+                groups[key].append(id)
+                continue
+            groups[key] = [id]
+            chunk.append((part, text))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def solve_batch(
+    day: int,
+    records: Iterable[Record],
+    parts: Iterable[int] = PARTS,
+    workers: Optional[int] = None,
+    budget: Optional[float] = None,
+    cache: Optional["ResultCache"] = None,
+    chunk_size: int = CHUNK
+    ) -> Iterator[Dict[str, Any]]:
+    """
+    Answers for every record (id, input text) and part, as they complete.
+    Records are read lazily, keeping only a few chunks per worker in flight.
+    """
+    parts = list(parts)
+    workers = workers or os.cpu_count() or 1
+    groups: Dict[Tuple[str, int], List[str]] = dict()
+    pending = chunks(records, parts, chunk_size, groups)
+
+    with ProcessPoolExecutor(
+            max_workers=workers, initializer=_start_worker,
+            initargs=([day], parts, cache)) as executor:
+
+        def submit() -> Optional[Future]:
+            jobs = next(pending, None)
+            if jobs is None:
+                return None
+            future = executor.submit(solve_chunk, day, jobs, budget)
+            future.jobs = jobs  # type: ignore
+            return future
+
+        running: Set[Future] = set()
+        for _ in range(workers * QUEUE_PER_WORKER):
+            future = submit()
+            if future is None:
+                break
+            running.add(future)
+
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                for (part, text), result in zip(future.jobs, future.result()):
+                    digest = hashlib.sha256(text.encode()).hexdigest()
+                    for id in groups.pop((digest, part)):
+                        yield {
+                            "id": id,
+                            "day": day,
+                            "part": part,
+                            "answer": result.answer,
+                            "wall": round(result.wall, 6),
+                            "cached": result.cached,
+                            "error": result.error,
+                        }
+                following = submit()
+                if following is not None:
+                    running.add(following)
+
+
+def test_chunks():
+
+    groups: Dict[Tuple[str, int], List[str]] = dict()
+    records = [("a", "1\n"), ("b", "2\n"), ("c", "1\n")]
+
+    assert list(chunks(records, [1, 2], 3, groups)) == [
+        [(1, "1\n"), (2, "1\n"), (1, "2\n")], [(2, "2\n")]]
+    assert sorted(groups.values()) == [["a", "c"], ["a", "c"], ["b"], ["b"]]
+
+
+def test_solve_batch():
+
+    records = [("a", "+1\n+2\n"), ("b", "-1\n"), ("c", "+1\n+2\n")]
+    results = list(solve_batch(1, records, [1], workers=1, budget=10))
+
+    assert sorted((r["id"], r["answer"]) for r in results) == [
+        ("a", 3), ("b", -1), ("c", 3)]
+    assert all(r["error"] is None for r in results)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("day", type=int)
+    parser.add_argument("source",
+                        help="directory of inputs, JSONL file, or - for stdin")
+    parser.add_argument("--part", type=int, choices=PARTS, action="append")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="number of worker processes (0 for one per CPU)")
+    parser.add_argument("--budget", type=float,
+                        help="seconds allowed for each input and part")
+    parser.add_argument("--chunk", type=int, default=CHUNK,
+                        help="inputs sent to a worker at a time")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not reuse or store cached answers")
+    args = parser.parse_args(argv)
+
+    cache = None
+    if not args.no_cache:
+        from aoc.cache import ResultCache
+        cache = ResultCache()
+
+    failed = False
+    for answer in solve_batch(
+            args.day, read_records(args.source), args.part or PARTS,
+            args.jobs or None, args.budget, cache, args.chunk):
+        failed = failed or answer["error"] is not None
+        print(json.dumps(answer, default=str), flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Sweeps every day over synthetic inputs of growing size and reports how the
+runtime and memory of each part scale.
+
+    python -m aoc.bench                     # all days at their default sizes
+    python -m aoc.bench 6 25                # only days 6 and 25
+    python -m aoc.bench 6 --sizes 25,50,100 # explicit sizes
+    python -m aoc.bench --json              # one JSON object per measurement
+
+Inputs come from the `generate(size, seed)` function of dayNN/generate.py and
+the default sizes from its SIZES list. Each measurement runs in a fresh
+process that is killed after --timeout seconds; a part stops sweeping at the
+first size that fails or times out. The growth column is the log-log slope of
+the wall time between consecutive sizes, about 1 for a linear solver and 2
+for a quadratic one.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+from typing import Iterator, List, NamedTuple, Optional
+
+from aoc.runner import DAYS, PARTS, load_day, load_modules, max_rss, run_part
+
+
+# Slopes above this are flagged in the report.
+SUPERLINEAR = 1.5
+
+# Timings below this are too noisy to compute a slope from.
+MIN_WALL = 0.01
+
+
+class Measurement(NamedTuple):
+
+    day: int
+    part: int
+    size: int
+    wall: float = 0.0
+    cpu: float = 0.0
+    rss_growth: int = 0
+    growth: Optional[float] = None
+    error: Optional[str] = None
+
+
+def write_input(day: int, size: int, seed: int, directory: str) -> str:
+
+    generator = load_modules(day, ["generate"])["generate"]
+    filename = os.path.join(
+        directory, "day{:02d}_{}_{}.txt".format(day, size, seed))
+    with open(filename, "w") as f:
+        f.write(generator.generate(size, seed))
+
+    return filename
+
+
+def default_sizes(day: int) -> List[int]:
+
+    modules = load_modules(day, ["generate"])
+    if "generate" not in modules:
+        return []
+
+    return list(modules["generate"].SIZES)
+
+
+def _measure(day: int, part: int, filename: str, conn) -> None:
+
+    module = load_day(day)[part]
+    baseline = max_rss()
+    result = run_part(day, part, module, filename)
+    conn.send((result.wall, result.cpu, result.max_rss - baseline,
+               result.error))
+    conn.close()
+
+
+def measure(
+    day: int,
+    part: int,
+    size: int,
+    filename: str,
+    timeout: float
+    ) -> Measurement:
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_measure, args=(day, part, filename, sender))
+    process.start()
+    sender.close()
+
+    if not receiver.poll(timeout):
+        process.kill()
+        process.join()
+        return Measurement(day, part, size, wall=timeout,
+                           error="timeout after {}s".format(timeout))
+
+    try:
+        wall, cpu, rss_growth, error = receiver.recv()
+    except EOFError:
+        wall, cpu, rss_growth, error = 0.0, 0.0, 0, "worker died"
+    process.join()
+
+    return Measurement(day, part, size, wall, cpu, rss_growth, error=error)
+
+
+def growth(previous: Measurement, current: Measurement) -> Optional[float]:
+
+    if previous.wall < MIN_WALL or current.wall < MIN_WALL:
+        return None
+
+    return (math.log(current.wall / previous.wall)
+            / math.log(current.size / previous.size))
+
+
+def sweep(
+    days: List[int],
+    parts: List[int],
+    sizes: Optional[List[int]] = None,
+    seed: int = 0,
+    timeout: float = 60.0
+    ) -> Iterator[Measurement]:
+
+    with tempfile.TemporaryDirectory(prefix="aoc-bench-") as directory:
+        for day in days:
+            day_sizes = sorted(sizes or default_sizes(day))
+            if not day_sizes:
+                continue
+            modules = load_day(day)
+
+            inputs = dict()
+            for part in parts:
+                if part not in modules:
+                    continue
+                previous = None
+                for size in day_sizes:
+                    if size not in inputs:
+                        inputs[size] = write_input(day, size, seed, directory)
+                    current = measure(day, part, size, inputs[size], timeout)
+                    if previous is not None and current.error is None:
+                        current = current._replace(
+                            growth=growth(previous, current))
+                    yield current
+                    if current.error is not None:
+                        break
+                    previous = current
+
+
+def format_measurement(m: Measurement) -> str:
+
+    line = "day{:02d}/part{}  size {:>8}  ".format(m.day, m.part, m.size)
+    if m.error is not None:
+        return line + "error: " + m.error
+
+    line += "{:8.3f}s wall  {:8.3f}s cpu  {:+9.1f} MB rss".format(
+        m.wall, m.cpu, m.rss_growth / 1024)
+    if m.growth is not None:
+        line += "  growth {:5.2f}".format(m.growth)
+        if m.growth > SUPERLINEAR:
+            line += " (super-linear)"
+
+    return line
+
+
+def test_growth():
+
+    linear = Measurement(1, 1, 100, wall=1.0)
+    quadratic = Measurement(1, 1, 200, wall=4.0)
+    assert abs(growth(linear, quadratic) - 2.0) < 1e-9
+
+    tiny = Measurement(1, 1, 100, wall=0.001)
+    assert growth(tiny, quadratic) is None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--part", type=int, choices=PARTS, action="append")
+    parser.add_argument("--sizes", type=lambda s: [int(n) for n in s.split(",")],
+                        help="comma separated sizes to use for every day")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="seconds allowed for a single measurement")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON object per measurement")
+    args = parser.parse_args(argv)
+
+    for m in sweep(args.days, args.part or PARTS, args.sizes, args.seed,
+                   args.timeout):
+        if args.json:
+            print(json.dumps(m._asdict()), flush=True)
+        else:
+            print(format_measurement(m), flush=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
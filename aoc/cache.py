@@ -0,0 +1,307 @@
+"""
+On-disk cache of answers and intermediate artifacts of the day solvers.
+
+Entries are keyed by a hash of the input bytes together with a hash of the
+source of the day's solver modules (and the shared aoc modules they import),
+so editing a solver or its input invalidates its entries. Each entry is a
+pickle file in the cache directory; reading an entry refreshes its
+modification time and the least recently used entries are evicted once the
+directory grows past its size limit.
+
+Solvers store intermediate results through `artifact(name, compute)`, which
+only touches the disk while the runner is solving with a cache:
+
+    table = artifact("opcode table", lambda: match_opcode(...))
+
+    python -m aoc.cache             # show what is cached
+    python -m aoc.cache --clear     # empty the cache
+"""
+import ast
+import contextlib
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from types import ModuleType
+from typing import Any, Callable, Iterator, List, Optional, Tuple, TypeVar
+
+from aoc.runner import ROOT, day_directory
+
+
+CACHE_DIR = os.environ.get("AOC_CACHE_DIR", os.path.join(ROOT, ".cache"))
+MAX_BYTES = 256 * 1024 * 1024
+
+# Modules of a day folder that make up its solvers.
+SOLVER_MODULES = ["part1", "part2"]
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class ResultCache:
+
+    def __init__(
+        self,
+        directory: str = CACHE_DIR,
+        max_bytes: int = MAX_BYTES
+        ) -> None:
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+
+        digest = hashlib.sha256(key.encode()).hexdigest()
+
+        return os.path.join(self.directory, digest + ".pickle")
+
+    def get(self, key: str, default: Any = None) -> Any:
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return default
+
+        with contextlib.suppress(OSError):
+            os.utime(path)
+
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, self._path(key))
+
+        self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Modification time, size and path of every entry, oldest first.
+        """
+        result = []
+        with contextlib.suppress(FileNotFoundError):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".pickle"):
+                    with contextlib.suppress(FileNotFoundError):
+                        stat = entry.stat()
+                        result.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return sorted(result)
+
+    def evict(self) -> None:
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+
+    def solve(
+        self,
+        day: int,
+        part: int,
+        module: ModuleType,
+        filename: str
+        ) -> Tuple[Any, bool]:
+        """
+        Answer of a part and whether it came from the cache.
+        """
+        key = input_key(day, filename)
+        answer = self.get(key + "/part{}".format(part), _MISSING)
+        if answer is not _MISSING:
+            return answer, True
+
+        with activate(self, key):
+            answer = module.solve(filename)
+        self.put(key + "/part{}".format(part), answer)
+
+        return answer, False
+
+    def clear(self) -> None:
+
+        for _, _, path in self.entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+
+def imported_files(path: str) -> List[str]:
+    """
+    Source files of the day modules and aoc modules imported by a file.
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            # "from aoc import backend" imports the module aoc.backend.
+            if node.module == "aoc":
+                names.extend("aoc." + alias.name for alias in node.names)
+
+    result = []
+    for name in names:
+        if name in SOLVER_MODULES:
+            result.append(os.path.join(os.path.dirname(path), name + ".py"))
+        elif name == "aoc" or name.startswith("aoc."):
+            module = os.path.join(ROOT, *name.split("."))
+            if os.path.isdir(module):
+                module = os.path.join(module, "__init__")
+            result.append(module + ".py")
+
+    return [p for p in result if os.path.exists(p)]
+
+
+def source_files(day: int) -> List[str]:
+
+    pending = [
+        os.path.join(day_directory(day), name + ".py")
+        for name in SOLVER_MODULES
+    ]
+    seen = set()
+    while pending:
+        path = pending.pop()
+        if path in seen or not os.path.exists(path):
+            continue
+        seen.add(path)
+        pending.extend(imported_files(path))
+
+    return sorted(seen)
+
+
+@functools.lru_cache(maxsize=None)
+def source_digest(day: int) -> bytes:
+    """
+    Digest of the solver sources of a day. It is computed once per process,
+    like the modules themselves are imported once.
+    """
+    digest = hashlib.sha256()
+    for path in source_files(day):
+        with open(path, "rb") as f:
+            digest.update(os.path.relpath(path, ROOT).encode())
+            digest.update(f.read())
+
+    return digest.digest()
+
+
+def input_key(day: int, filename: str) -> str:
+
+    digest = hashlib.sha256(source_digest(day))
+    with open(filename, "rb") as f:
+        digest.update(f.read())
+
+    return "day{:02d}/{}".format(day, digest.hexdigest())
+
+
+# The cache and key of the input currently being solved, if any.
+_active: Optional[Tuple[ResultCache, str]] = None
+
+
+@contextlib.contextmanager
+def activate(cache: ResultCache, key: str) -> Iterator[None]:
+
+    global _active
+    previous, _active = _active, (cache, key)
+    try:
+        yield
+    finally:
+        _active = previous
+
+
+def artifact(name: str, compute: Callable[[], T]) -> T:
+    """
+    Returns the artifact `name` of the input being solved, computing and
+    storing it on a miss. Outside a cached run it simply calls `compute`.
+    """
+    if _active is None:
+        return compute()
+
+    cache, key = _active
+    value = cache.get(key + "/" + name, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.put(key + "/" + name, value)
+
+    return value
+
+
+def test_cache():
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(directory, max_bytes=1000)
+        cache.put("a", "x" * 400)
+        cache.put("b", "y" * 400)
+        assert cache.get("a") == "x" * 400
+        assert cache.get("c", 42) == 42
+
+        os.utime(cache._path("b"), (0, 0))
+        cache.put("c", "z" * 400)
+        assert cache.get("b") is None
+        assert cache.get("a") == "x" * 400
+        assert cache.get("c") == "z" * 400
+
+
+def test_source_files():
+
+    files = [os.path.relpath(path, ROOT) for path in source_files(2)]
+
+    assert os.path.join("day02", "part1.py") in files
+    assert os.path.join("aoc", "inputs.py") in files
+    assert os.path.join("aoc", "backend.py") in files
+
+
+def test_artifact():
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [1, 2, 3]
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResultCache(directory)
+        assert artifact("table", compute) == [1, 2, 3]
+        with activate(cache, "key"):
+            assert artifact("table", compute) == [1, 2, 3]
+            assert artifact("table", compute) == [1, 2, 3]
+        assert len(calls) == 2
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clear", action="store_true",
+                        help="remove every cached entry")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache()
+    if args.clear:
+        cache.clear()
+
+    entries = cache.entries()
+    print("{}: {} entries, {:.1f} MB of {:.0f} MB".format(
+        cache.directory, len(entries),
+        sum(size for _, size, _ in entries) / 2 ** 20,
+        cache.max_bytes / 2 ** 20))
+
+    return 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Cycle detection for simulations that eventually repeat, so they can be run
+for 10**9 steps or more without storing every state they pass through.
+
+    area = fast_forward(area, change, 1000000000)
+
+Cycles are found with Brent's algorithm, which keeps two states at a time
+whatever the length of the cycle. States are compared by `key(state)`: by a
+64-bit fingerprint first, and in full only when the fingerprints match, so
+a hash collision can never be taken for a cycle.
+
+Some simulations repeat up to a steady drift, like a pattern that moves one
+pot to the right every generation. For those the key leaves the drifting
+part out, and `extrapolate(before, after, cycles)` returns the state that
+many more cycles after `after`, given two states a cycle apart.
+"""
+from typing import (
+    Callable, Generic, Hashable, NamedTuple, Optional, Tuple, TypeVar)
+
+
+T = TypeVar("T")
+
+MASK = (1 << 64) - 1
+
+
+def identity(state: T) -> T:
+
+    return state
+
+
+def fingerprint(key: Hashable) -> int:
+
+    return hash(key) & MASK
+
+
+class _Marked(Generic[T]):
+    """
+    A state with its key and fingerprint, computed once.
+    """
+    __slots__ = ("state", "key", "fingerprint")
+
+    def __init__(self, state: T, key: Callable[[T], Hashable]) -> None:
+
+        self.state = state
+        self.key = key(state)
+        self.fingerprint = fingerprint(self.key)
+
+    def same(self, other: "_Marked") -> bool:
+
+        return (self.fingerprint == other.fingerprint
+                and self.key == other.key)
+
+
+class Cycle(NamedTuple):
+
+    # Steps before the cycle is entered, and its length.
+    start: int
+    length: int
+    # States at step `start` and one cycle later, whose keys are equal, and
+    # the state just before the later one: the last before any repeat.
+    first: object
+    second: object
+    last: object
+
+
+def _meet(
+    start: T,
+    step: Callable[[T], T],
+    key: Callable[[T], Hashable],
+    limit: Optional[int]
+    ) -> Tuple[int, int, T, T]:
+    """
+    Brent's search: (steps taken, cycle length, state a cycle before the
+    last one, last state). The length is 0 if no cycle shows up within
+    limit steps, and the last state is then the one `limit` steps on.
+    """
+    tortoise = _Marked(start, key)
+    hare = _Marked(step(start), key)
+    taken = 1
+    power = length = 1
+    while not tortoise.same(hare):
+        if limit is not None and taken >= limit:
+            return taken, 0, tortoise.state, hare.state
+        if power == length:
+            tortoise = hare
+            power *= 2
+            length = 0
+        hare = _Marked(step(hare.state), key)
+        taken += 1
+        length += 1
+
+    return taken, length, tortoise.state, hare.state
+
+
+def find_cycle(
+    start: T,
+    step: Callable[[T], T],
+    key: Callable[[T], Hashable] = identity,
+    limit: Optional[int] = None
+    ) -> Optional[Cycle]:
+    """
+    The cycle reached from start, or None if none shows up within `limit`
+    steps of start.
+    """
+    length = _meet(start, step, key, limit)[1]
+    if length == 0:
+        return None
+
+    # Walk two states `length` apart from the start until they meet.
+    tortoise = _Marked(start, key)
+    last = ahead = start
+    for _ in range(length):
+        last, ahead = ahead, step(ahead)
+    hare = _Marked(ahead, key)
+    first = 0
+    while not tortoise.same(hare):
+        last = hare.state
+        tortoise = _Marked(step(tortoise.state), key)
+        hare = _Marked(step(hare.state), key)
+        first += 1
+
+    return Cycle(first, length, tortoise.state, hare.state, last)
+
+
+def fast_forward(
+    start: T,
+    step: Callable[[T], T],
+    steps: int,
+    key: Callable[[T], Hashable] = identity,
+    extrapolate: Optional[Callable[[T, T, int], T]] = None
+    ) -> T:
+    """
+    The state after `steps` steps from start. Any state on the cycle will
+    do to skip ahead from, so the start of the cycle is never looked for.
+    """
+    if steps == 0:
+        return start
+
+    taken, length, before, state = _meet(start, step, key, steps)
+    if length == 0:
+        return state
+    cycles, remainder = divmod(steps - taken, length)
+    if extrapolate is not None and cycles:
+        state = extrapolate(before, state, cycles)
+    for _ in range(remainder):
+        state = step(state)
+
+    return state
+
+
+def test_find_cycle():
+
+    # 0 1 2 3 4 5 6 4 5 6 ...
+    step = lambda n: n + 1 if n < 6 else 4
+    cycle = find_cycle(0, step)
+
+    assert cycle is not None
+    assert (cycle.start, cycle.length, cycle.first, cycle.last) == (4, 3, 4, 6)
+    assert find_cycle(0, step, limit=5) is None
+
+
+def test_fast_forward():
+
+    step = lambda n: n + 1 if n < 6 else 4
+    assert [fast_forward(0, step, n) for n in range(12)] == \
+        [0, 1, 2, 3, 4, 5, 6, 4, 5, 6, 4, 5]
+    assert fast_forward(0, step, 10 ** 12) == 4 + (10 ** 12 - 4) % 3
+
+    # A pattern of period 2 moving right by 3 every cycle: states are
+    # (position, phase), with the phase as the key.
+    move = lambda s: (s[0] + (3 if s[1] else 0), 1 - s[1])
+    shift = lambda a, b, cycles: (b[0] + cycles * (b[0] - a[0]), b[1])
+    assert fast_forward((0, 0), move, 10 ** 9 + 1, lambda s: s[1], shift) == \
+        (3 * (10 ** 9 // 2), 1)
+
+
+def test_collisions():
+
+    class Colliding:
+        def __init__(self, n):
+            self.n = n
+        def __hash__(self):
+            return 0
+        def __eq__(self, other):
+            return self.n == other.n
+
+    step = lambda c: Colliding((c.n + 1) % 5)
+    assert find_cycle(Colliding(0), step).length == 5
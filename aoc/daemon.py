@@ -0,0 +1,525 @@
+"""
+A long-running solver service with every day already imported.
+
+    python -m aoc.daemon serve                    # on the Unix socket
+    python -m aoc.daemon serve --http 8018 -j 4   # and on 127.0.0.1:8018
+    python -m aoc.daemon solve 1 2 day01/input.txt
+
+The server keeps a pool of worker processes that import all the day modules
+when they start, so a request only pays for sending the input to a worker and
+solving it. Requests are JSON objects
+
+    {"id": "a", "day": 1, "part": 2, "input": "+1\\n-2\\n", "timeout": 5}
+
+with "filename" (a path the server can read) instead of "input" also
+accepted. Over the Unix socket each request and reply is one line, and a
+connection may send many requests without waiting; replies carry the id of
+their request. Over HTTP, POST the request to /solve, or GET /health.
+
+Replies add "answer", "error", "cached" and the timings in seconds: "solve"
+inside the solver, "total" from reading the request to having the answer,
+and "queued", the difference: waiting for a worker and talking to it. At
+most --max-pending requests are solved or queued at once. Beyond that the
+server stops reading from connections until a slot frees up, and requests
+that still find no slot before their timeout get a "busy" error. A solve
+that runs past its timeout is stopped in the worker, and a worker that does
+not stop, or dies, is replaced.
+"""
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from aoc.batch import _start_worker, solve_one
+from aoc.runner import DAYS, PARTS, ROOT, Result
+
+if TYPE_CHECKING:
+    from aoc.cache import ResultCache
+
+
+SOCKET = os.environ.get("AOC_SOCKET", os.path.join(ROOT, ".daemon.sock"))
+
+TIMEOUT = 60.0
+
+# Extra time given to a worker to report a solve it had to stop.
+GRACE = 1.0
+
+
+def _serve(conn: Connection, cache: Optional["ResultCache"]) -> None:
+    """
+    Worker loop: imports every day, then solves (day, part, text, timeout)
+    messages until it receives None.
+    """
+    _start_worker(DAYS, PARTS, cache)
+    conn.send("ready")
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        conn.send(solve_one(*message))
+
+
+class Worker:
+
+    def __init__(self, cache: Optional["ResultCache"]) -> None:
+
+        self.conn, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_serve, args=(child, cache), daemon=True)
+        self.process.start()
+        child.close()
+        self.future: Optional[asyncio.Future] = None
+        self.dead = False
+
+    def on_readable(self) -> None:
+
+        try:
+            message = self.conn.recv()
+        except (EOFError, OSError) as e:
+            # The pipe stays readable at EOF; stop watching it.
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+            self.dead = True
+            message = e
+        if self.future is not None and not self.future.done():
+            self.future.set_result(message)
+
+    def stop(self) -> None:
+
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class Daemon:
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: float = TIMEOUT,
+        cache: Optional["ResultCache"] = None
+        ) -> None:
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.workers
+        self.timeout = timeout
+        self.cache = cache
+        self.slots = asyncio.Semaphore(self.max_pending)
+        # Notified whenever a request gives its slot back.
+        self.freed = asyncio.Condition()
+        self.idle: asyncio.Queue = asyncio.Queue()
+        self.pending = 0
+
+    async def start_worker(self) -> None:
+        """
+        Starts a worker and waits until it has imported the days. Replies
+        come straight from its pipe through the event loop, without the
+        threads of a concurrent.futures pool.
+        """
+        loop = asyncio.get_running_loop()
+        worker = Worker(self.cache)
+        worker.future = loop.create_future()
+        loop.add_reader(worker.conn.fileno(), worker.on_readable)
+        ready = await worker.future
+        if ready != "ready":
+            raise RuntimeError("worker failed to start: {}".format(ready))
+        self.idle.put_nowait(worker)
+
+    async def warm_up(self) -> None:
+
+        await asyncio.gather(*[
+            self.start_worker() for _ in range(self.workers)])
+
+    def close(self) -> None:
+
+        loop = asyncio.get_event_loop()
+        while not self.idle.empty():
+            worker = self.idle.get_nowait()
+            loop.remove_reader(worker.conn.fileno())
+            worker.stop()
+
+    def replace(self, worker: Worker) -> None:
+        """
+        Stops a worker that is stuck or dead and starts another in its place.
+        """
+        if not worker.dead:
+            asyncio.get_running_loop().remove_reader(worker.conn.fileno())
+        worker.process.kill()
+        worker.stop()
+        asyncio.ensure_future(self.start_worker())
+
+    async def run_on_worker(
+        self,
+        day: int,
+        part: int,
+        text: str,
+        timeout: float
+        ) -> Result:
+
+        worker = await self.idle.get()
+        while worker.dead:
+            # Died while idle.
+            self.replace(worker)
+            worker = await self.idle.get()
+
+        loop = asyncio.get_running_loop()
+        worker.future = loop.create_future()
+        try:
+            worker.conn.send((day, part, text, timeout))
+            result = await asyncio.wait_for(
+                asyncio.shield(worker.future), timeout + GRACE)
+        except OSError:
+            result = None
+        except asyncio.TimeoutError:
+            # Stuck where the alarm cannot interrupt it: replace the worker.
+            self.replace(worker)
+            raise
+
+        if not isinstance(result, Result):
+            self.replace(worker)
+            return Result(day, part, error="worker died")
+        self.idle.put_nowait(worker)
+
+        return result
+
+    async def solve(self, request: Dict[str, Any]) -> Dict[str, Any]:
+
+        received = time.perf_counter()
+        reply: Dict[str, Any] = {"id": request.get("id")}
+        try:
+            day, part = int(request["day"]), int(request["part"])
+            timeout = float(request.get("timeout", self.timeout))
+            if "input" in request:
+                text = request["input"]
+            else:
+                with open(request["filename"]) as f:
+                    text = f.read()
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            reply["error"] = "bad request: {}: {}".format(type(e).__name__, e)
+            return reply
+
+        try:
+            await asyncio.wait_for(self.slots.acquire(), timeout)
+        except asyncio.TimeoutError:
+            reply["error"] = "busy"
+            return reply
+
+        self.pending += 1
+        try:
+            result = await self.run_on_worker(day, part, text, timeout)
+            reply.update(answer=result.answer, error=result.error,
+                         cached=result.cached, solve=round(result.wall, 6))
+        except asyncio.TimeoutError:
+            reply["error"] = "timeout after {}s".format(timeout)
+        finally:
+            self.pending -= 1
+            self.slots.release()
+            async with self.freed:
+                self.freed.notify_all()
+
+        reply["total"] = round(time.perf_counter() - received, 6)
+        if "solve" in reply:
+            reply["queued"] = round(reply["total"] - reply["solve"], 6)
+
+        return reply
+
+    async def serve_lines(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+        ) -> None:
+        """
+        One JSON request per line; replies are written as they complete.
+        """
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line: bytes) -> None:
+            try:
+                reply = await self.solve(json.loads(line))
+            except ValueError as e:
+                reply = {"id": None, "error": "bad request: {}".format(e)}
+            async with lock:
+                writer.write(json.dumps(reply, default=str).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                # Backpressure: with no free slot, stop reading.
+                async with self.freed:
+                    await self.freed.wait_for(
+                        lambda: self.pending < self.max_pending)
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.CancelledError):
+            # The client went away, or the server is shutting down.
+            pass
+        finally:
+            writer.close()
+
+    async def serve_http(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter
+        ) -> None:
+
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+
+                headers = dict()
+                while True:
+                    line = (await reader.readline()).decode().strip()
+                    if not line:
+                        break
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(
+                    int(headers.get("content-length", 0)))
+
+                if method == "GET" and path == "/health":
+                    status, reply = "200 OK", {
+                        "workers": self.workers, "pending": self.pending}
+                elif method == "POST" and path == "/solve":
+                    try:
+                        reply = await self.solve(json.loads(body))
+                        status = ("400 Bad Request"
+                                  if str(reply.get("error")).startswith("bad")
+                                  else "200 OK")
+                    except ValueError as e:
+                        status, reply = "400 Bad Request", {"error": str(e)}
+                else:
+                    status, reply = "404 Not Found", {"error": "not found"}
+
+                payload = json.dumps(reply, default=str).encode()
+                close = headers.get("connection", "").lower() == "close"
+                writer.write(
+                    "HTTP/1.1 {}\r\nContent-Type: application/json\r\n"
+                    "Content-Length: {}\r\n{}\r\n".format(
+                        status, len(payload),
+                        "Connection: close\r\n" if close else ""
+                    ).encode() + payload)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError,
+                asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    daemon: Daemon,
+    socket_path: Optional[str] = SOCKET,
+    http_port: Optional[int] = None,
+    ready: Optional[asyncio.Event] = None
+    ) -> None:
+
+    await daemon.warm_up()
+
+    servers = []
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        servers.append(await asyncio.start_unix_server(
+            daemon.serve_lines, path=socket_path))
+    if http_port is not None:
+        servers.append(await asyncio.start_server(
+            daemon.serve_http, host="127.0.0.1", port=http_port))
+
+    if ready is not None:
+        ready.set()
+    try:
+        await asyncio.gather(*(server.serve_forever() for server in servers))
+    finally:
+        for server in servers:
+            server.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+async def request(
+    requests: List[Dict[str, Any]],
+    socket_path: str = SOCKET
+    ) -> List[Dict[str, Any]]:
+    """
+    Sends requests over the Unix socket; replies in the order of requests.
+    """
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    for i, r in enumerate(requests):
+        writer.write(json.dumps(dict(r, id=r.get("id", i))).encode() + b"\n")
+    await writer.drain()
+
+    replies = dict()
+    for _ in requests:
+        reply = json.loads(await reader.readline())
+        replies[reply["id"]] = reply
+    writer.close()
+    await writer.wait_closed()
+
+    return [replies[r.get("id", i)] for i, r in enumerate(requests)]
+
+
+def test_daemon():
+
+    import tempfile
+
+    async def scenario(socket_path):
+        daemon = Daemon(workers=1, max_pending=2)
+        ready = asyncio.Event()
+        server = asyncio.ensure_future(serve(daemon, socket_path, ready=ready))
+        await ready.wait()
+        try:
+            return await request([
+                {"day": 1, "part": 1, "input": "+1\n+2\n"},
+                {"day": 1, "part": 2, "input": "+1\n-1\n"},
+                {"day": 9, "part": 1, "timeout": 0.2,
+                 "input": "400 players; last marble is worth 9000000 points"},
+                {"day": 1, "part": 1, "input": "+1\n+2\n"},
+                {"day": 1},
+            ], socket_path)
+        finally:
+            server.cancel()
+            daemon.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        replies = asyncio.run(scenario(os.path.join(directory, "aoc.sock")))
+
+    assert [r.get("answer") for r in replies] == [3, 0, None, 3, None]
+    assert "BudgetExceeded" in replies[2]["error"]
+    assert replies[4]["error"].startswith("bad request")
+    assert replies[0]["total"] >= replies[0]["solve"] > 0
+
+
+def test_dead_worker():
+
+    import tempfile
+
+    async def scenario(socket_path):
+        daemon = Daemon(workers=1)
+        ready = asyncio.Event()
+        server = asyncio.ensure_future(serve(daemon, socket_path, ready=ready))
+        await ready.wait()
+        try:
+            # Killed while idle: the request goes to its replacement.
+            worker = daemon.idle.get_nowait()
+            worker.process.kill()
+            worker.process.join()
+            daemon.idle.put_nowait(worker)
+            await asyncio.sleep(0.1)
+            first = await request([{"day": 1, "part": 1, "input": "+4\n"}],
+                                  socket_path)
+
+            # Killed while solving: that request fails, the next one does not.
+            async def kill_busy():
+                while daemon.pending == 0:
+                    await asyncio.sleep(0.01)
+                await asyncio.sleep(0.1)
+                for child in multiprocessing.active_children():
+                    child.kill()
+            killer = asyncio.ensure_future(kill_busy())
+            second = await request([{
+                "day": 9, "part": 1, "timeout": 10,
+                "input": "400 players; last marble is worth 9000000 points"
+            }], socket_path)
+            await killer
+            third = await request([{"day": 1, "part": 1, "input": "+5\n"}],
+                                  socket_path)
+            return first + second + third
+        finally:
+            server.cancel()
+            daemon.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        replies = asyncio.run(scenario(os.path.join(directory, "aoc.sock")))
+
+    assert replies[0]["answer"] == 4
+    assert replies[1]["error"] == "worker died"
+    assert replies[2]["answer"] == 5
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the server")
+    serve_parser.add_argument("--socket", default=SOCKET)
+    serve_parser.add_argument("--http", type=int, metavar="PORT",
+                              help="also serve HTTP on 127.0.0.1:PORT")
+    serve_parser.add_argument("-j", "--jobs", type=int, default=0,
+                              help="number of workers (0 for one per CPU)")
+    serve_parser.add_argument("--max-pending", type=int,
+                              help="requests solved or queued at once")
+    serve_parser.add_argument("--timeout", type=float, default=TIMEOUT,
+                              help="default seconds allowed per request")
+    serve_parser.add_argument("--no-cache", action="store_true",
+                              help="do not reuse or store cached answers")
+
+    solve_parser = commands.add_parser("solve", help="ask a running server")
+    solve_parser.add_argument("day", type=int)
+    solve_parser.add_argument("part", type=int, choices=PARTS)
+    solve_parser.add_argument("filename")
+    solve_parser.add_argument("--socket", default=SOCKET)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "solve":
+        reply, = asyncio.run(request([{
+            "day": args.day, "part": args.part,
+            "filename": os.path.abspath(args.filename)
+        }], args.socket))
+        print(json.dumps(reply))
+        return 0 if reply.get("error") is None else 1
+
+    cache = None
+    if not args.no_cache:
+        from aoc.cache import ResultCache
+        cache = ResultCache()
+
+    async def run() -> None:
+        daemon = Daemon(args.jobs or None, args.max_pending, args.timeout,
+                        cache)
+        task = asyncio.current_task()
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, task.cancel)  # type: ignore
+        try:
+            await serve(daemon, args.socket, args.http)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            daemon.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+A virtual machine for the elfcode of days 16, 19 and 21.
+
+A program is parsed once into a compact array of (opcode, a, b, c) and
+compiled to Python source with its operands baked in as constants. Each run
+of instructions up to the next jump becomes one generated function, and reads
+of the instruction pointer register inside it become constants, so running a
+program does no parsing, lookups or argument unpacking per step:
+
+    vm = VM(Program.parse(lines), [1, 0, 0, 0, 0, 0])
+    vm.run(breakpoints={2})   # stops before executing instruction 2
+    vm.registers[4] = 0       # inspect or patch the state
+    vm.run()                  # continue until the program halts
+
+When the program binds the instruction pointer to a register (`#ip n`), the
+pointer is written to that register before every instruction and read back
+after it, as in day 19.
+"""
+from array import array
+from typing import (
+    AbstractSet, Callable, Dict, FrozenSet, Iterable, Iterator, List,
+    Optional, Sequence, Tuple)
+
+
+# Opcodes in the order used by day 16 to number them.
+OPCODES = [
+    "addr", "addi", "mulr", "muli", "banr", "bani", "borr", "bori",
+    "setr", "seti", "gtir", "gtri", "gtrr", "eqir", "eqri", "eqrr"
+]
+
+# What each opcode does to the registers r: {ra} and {rb} read registers a
+# and b, {a} and {b} are the values a and b, and {c} is the output register.
+TEMPLATES = {
+    "addr": "r[{c}] = {ra} + {rb}",
+    "addi": "r[{c}] = {ra} + {b}",
+    "mulr": "r[{c}] = {ra} * {rb}",
+    "muli": "r[{c}] = {ra} * {b}",
+    "banr": "r[{c}] = {ra} & {rb}",
+    "bani": "r[{c}] = {ra} & {b}",
+    "borr": "r[{c}] = {ra} | {rb}",
+    "bori": "r[{c}] = {ra} | {b}",
+    "setr": "r[{c}] = {ra}",
+    "seti": "r[{c}] = {a}",
+    "gtir": "r[{c}] = 1 if {a} > {rb} else 0",
+    "gtri": "r[{c}] = 1 if {ra} > {b} else 0",
+    "gtrr": "r[{c}] = 1 if {ra} > {rb} else 0",
+    "eqir": "r[{c}] = 1 if {a} == {rb} else 0",
+    "eqri": "r[{c}] = 1 if {ra} == {b} else 0",
+    "eqrr": "r[{c}] = 1 if {ra} == {rb} else 0",
+}
+
+# Longest run of instructions compiled into a single block.
+MAX_BLOCK = 64
+
+Instruction = Tuple[int, int, int, int]
+Operation = Callable[[List[int]], None]
+Block = Tuple[Callable[[List[int]], int], int]
+
+
+def compile_functions(sources: Sequence[Tuple[str, str, str]]) -> List[Callable]:
+    """
+    Compiles (name, arguments, body) triples into functions in one go.
+    """
+    source = ''.join(
+        "def {}({}):\n    {}\n".format(name, args, body.replace("\n", "\n    "))
+        for name, args, body in sources)
+    namespace: dict = dict()
+    exec(compile(source, "<elfcode>", "exec"), namespace)
+
+    return [namespace[name] for name, _, _ in sources]
+
+
+# Generic versions of the opcodes, called as f(registers, a, b, c).
+OPERATIONS = compile_functions([
+    (name, "r, a, b, c",
+     TEMPLATES[name].format(ra="r[a]", rb="r[b]", a="a", b="b", c="c"))
+    for name in OPCODES
+])
+
+
+def execute(opcode: int, registers: Sequence[int], a: int, b: int, c: int
+    ) -> List[int]:
+    """
+    Registers after running one instruction on a copy of them.
+    """
+    result = list(registers)
+    OPERATIONS[opcode](result, a, b, c)
+
+    return result
+
+
+class Program:
+
+    def __init__(
+        self,
+        instructions: Iterable[Instruction],
+        ip_register: Optional[int] = None
+        ) -> None:
+
+        self.code = array('q')
+        for instruction in instructions:
+            self.code.extend(instruction)
+        self.ip_register = ip_register
+
+        # One function per instruction, for single stepping.
+        self.operations: List[Operation] = compile_functions([
+            ("i{}".format(i), "r", self.statement(i))
+            for i in range(len(self))
+        ])
+
+        # Blocks compiled so far, for each set of breakpoints.
+        self._blocks: Dict[FrozenSet[int], List[Optional[Block]]] = dict()
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> "Program":
+
+        ip_register = None
+        instructions = []
+        for line in lines:
+            tokens = line.split()
+            if not tokens:
+                continue
+            if tokens[0] == "#ip":
+                ip_register = int(tokens[1])
+            else:
+                instructions.append(
+                    (OPCODES.index(tokens[0]), *map(int, tokens[1:4])))
+
+        return cls(instructions, ip_register)
+
+    def __len__(self) -> int:
+
+        return len(self.code) // 4
+
+    def __getitem__(self, i: int) -> Instruction:
+
+        return tuple(self.code[4 * i:4 * i + 4])  # type: ignore
+
+    def __iter__(self) -> Iterator[Instruction]:
+
+        for i in range(len(self)):
+            yield self[i]
+
+    def statement(self, i: int, fold_ip: bool = False) -> str:
+        """
+        Python source of instruction i. With fold_ip, reads of the pointer
+        register are replaced by the pointer itself.
+        """
+        op, a, b, c = self[i]
+
+        def read(register: int) -> str:
+            if fold_ip and register == self.ip_register:
+                return str(i)
+            return "r[{}]".format(register)
+
+        return TEMPLATES[OPCODES[op]].format(
+            ra=read(a), rb=read(b), a=a, b=b, c=c)
+
+    def block_table(self, breakpoints: FrozenSet[int]) -> List[Optional[Block]]:
+
+        if breakpoints not in self._blocks:
+            self._blocks[breakpoints] = [None] * len(self)
+
+        return self._blocks[breakpoints]
+
+    def compile_block(self, start: int, breakpoints: FrozenSet[int]) -> Block:
+        """
+        Function running the instructions from start up to the first one that
+        writes the pointer register, the end of the program or a breakpoint,
+        and returning the next pointer; and the number of instructions run.
+        """
+        lines = []
+        i = start
+        while True:
+            lines.append(self.statement(i, fold_ip=True))
+            length = i - start + 1
+            if self[i][3] == self.ip_register:
+                lines.append("return r[{}] + 1".format(self.ip_register))
+                break
+            i += 1
+            if (i == len(self) or i in breakpoints
+                or i - start == MAX_BLOCK):
+                if self.ip_register is not None:
+                    lines.append("r[{}] = {}".format(self.ip_register, i - 1))
+                lines.append("return {}".format(i))
+                break
+
+        function, = compile_functions(
+            [("b{}".format(start), "r", "\n".join(lines))])
+        block = (function, length)
+        self.block_table(breakpoints)[start] = block
+
+        return block
+
+
+class VM:
+
+    def __init__(
+        self,
+        program: Program,
+        registers: Optional[Sequence[int]] = None
+        ) -> None:
+
+        self.program = program
+        self.registers = list(registers) if registers is not None else [0] * 6
+        self.ip = 0
+        self.steps = 0
+
+    @property
+    def halted(self) -> bool:
+
+        return not 0 <= self.ip < len(self.program)
+
+    def step(self) -> bool:
+        """
+        Executes one instruction; False if the program has already halted.
+        """
+        if self.halted:
+            return False
+
+        ip_register, r = self.program.ip_register, self.registers
+        if ip_register is None:
+            self.program.operations[self.ip](r)
+            self.ip += 1
+        else:
+            r[ip_register] = self.ip
+            self.program.operations[self.ip](r)
+            self.ip = r[ip_register] + 1
+        self.steps += 1
+
+        return True
+
+    def run(
+        self,
+        breakpoints: AbstractSet[int] = frozenset(),
+        max_steps: Optional[int] = None
+        ) -> Optional[int]:
+        """
+        Runs until the program halts, returning None, or until the pointer
+        reaches a breakpoint or max_steps instructions have been executed,
+        returning the pointer. The instruction at the pointer is always
+        executed first, so calling run again continues past a breakpoint.
+        """
+        if max_steps is not None:
+            for _ in range(max_steps):
+                if not self.step():
+                    return None
+                if self.ip in breakpoints:
+                    break
+            return None if self.halted else self.ip
+
+        breakpoints = frozenset(breakpoints)
+        program, r = self.program, self.registers
+        blocks, n = program.block_table(breakpoints), len(program)
+        ip, steps = self.ip, 0
+
+        try:
+            while 0 <= ip < n:
+                if steps and ip in breakpoints:
+                    return ip
+                block = blocks[ip]
+                if block is None:
+                    block = program.compile_block(ip, breakpoints)
+                function, length = block
+                ip = function(r)
+                steps += length
+        finally:
+            self.ip = ip
+            self.steps += steps
+
+        return None
+
+
+def test_execute():
+
+    addi = OPCODES.index("addi")
+    assert execute(addi, [3, 2, 1, 1], 2, 1, 2) == [3, 2, 2, 1]
+    assert execute(OPCODES.index("mulr"), [3, 2, 1, 1], 2, 1, 2) == [3, 2, 2, 1]
+    assert execute(OPCODES.index("seti"), [3, 2, 1, 1], 2, 1, 2) == [3, 2, 2, 1]
+    assert execute(OPCODES.index("gtir"), [3, 2, 1, 1], 3, 0, 1) == [3, 0, 1, 1]
+
+
+def test_run():
+
+    program = Program.parse([
+        "#ip 0",
+        "seti 5 0 1",
+        "seti 6 0 2",
+        "addi 0 1 0",
+        "addr 1 2 3",
+        "setr 1 0 0",
+        "seti 8 0 4",
+        "seti 9 0 5"
+    ])
+    assert len(program) == 7
+    assert program[2] == (OPCODES.index("addi"), 0, 1, 0)
+
+    vm = VM(program)
+    assert vm.run() is None
+    assert vm.registers == [6, 5, 6, 0, 0, 9]
+    assert vm.steps == 5
+    assert not vm.step()
+
+
+def test_breakpoints():
+
+    program = Program.parse(["#ip 0", "seti 5 0 1", "seti 6 0 2",
+                             "addi 0 1 0", "addr 1 2 3", "setr 1 0 0",
+                             "seti 8 0 4", "seti 9 0 5"])
+    vm = VM(program)
+
+    assert vm.run(breakpoints={6}) == 6
+    assert vm.registers == [5, 5, 6, 0, 0, 0]
+    assert vm.step() and vm.ip == 7
+    assert vm.run(breakpoints={6}) is None
+
+    vm = VM(program)
+    assert vm.run(max_steps=2) == 2
+    assert vm.registers[1:3] == [5, 6]
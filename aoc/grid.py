@@ -0,0 +1,210 @@
+"""
+A rectangular grid of small integers or characters kept in one flat,
+row-major buffer instead of a list of lists.
+
+Character grids are stored as a bytearray of their ASCII codes and numeric
+grids as an array.array of the given typecode, so a cell costs one to eight
+bytes rather than a pointer to a boxed object. The grid can be surrounded by
+`pad` rows and columns of `fill`, which lets loops read the neighbours of any
+inner cell without bounds checks:
+
+    grid = Grid.from_lines(["#.#", "..#"], pad=1, fill="#")
+    i = grid.index(0, 1)
+    [grid.cells[i + o] for o in grid.offsets()]   # up, left, right, down
+
+Flat indices increase in reading order (top to bottom, left to right), so
+sorting them sorts cells the way most puzzles break ties.
+"""
+from array import array
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
+
+
+Cell = Union[int, str]
+
+
+class Grid:
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        fill: Cell = 0,
+        pad: int = 0,
+        typecode: str = "B"
+        ) -> None:
+
+        if isinstance(fill, str):
+            fill = ord(fill)
+
+        self.rows = rows
+        self.cols = cols
+        self.pad = pad
+        self.fill = fill
+        self.typecode = typecode
+        self.stride = cols + 2 * pad
+
+        size = self.stride * (rows + 2 * pad)
+        if typecode == "B":
+            self.cells: Union[bytearray, array] = bytearray([fill]) * size
+        else:
+            self.cells = array(typecode, [fill]) * size
+
+    @classmethod
+    def from_lines(
+        cls,
+        lines: Iterable[str],
+        pad: int = 0,
+        fill: Cell = " "
+        ) -> "Grid":
+        """
+        Character grid from lines of text; short lines are padded with fill.
+        """
+        lines = [line.rstrip("\n") for line in lines]
+        grid = cls(len(lines), max(map(len, lines), default=0), fill, pad)
+        for row, line in enumerate(lines):
+            start = grid.index(row, 0)
+            grid.cells[start:start + len(line)] = line.encode()
+
+        return grid
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Sequence[int]],
+        pad: int = 0,
+        fill: int = 0,
+        typecode: str = "i"
+        ) -> "Grid":
+
+        grid = cls(len(rows), len(rows[0]) if rows else 0, fill, pad, typecode)
+        for row, values in enumerate(rows):
+            start = grid.index(row, 0)
+            grid.cells[start:start + len(values)] = (
+                bytearray(values) if typecode == "B"
+                else array(typecode, values))
+
+        return grid
+
+    def index(self, row: int, col: int) -> int:
+
+        return (row + self.pad) * self.stride + col + self.pad
+
+    def position(self, index: int) -> Tuple[int, int]:
+
+        row, col = divmod(index, self.stride)
+
+        return row - self.pad, col - self.pad
+
+    def __getitem__(self, key: Tuple[int, int]) -> int:
+
+        return self.cells[self.index(*key)]
+
+    def __setitem__(self, key: Tuple[int, int], value: Cell) -> None:
+
+        if isinstance(value, str):
+            value = ord(value)
+        self.cells[self.index(*key)] = value
+
+    def row(self, row: int) -> Union[bytearray, array]:
+
+        start = self.index(row, 0)
+
+        return self.cells[start:start + self.cols]
+
+    def lines(self) -> List[str]:
+
+        return [self.row(row).decode() for row in range(self.rows)]
+
+    def to_rows(self) -> List[List[int]]:
+
+        return [list(self.row(row)) for row in range(self.rows)]
+
+    def count(self, value: Cell) -> int:
+        """
+        Number of inner cells equal to value.
+        """
+        if isinstance(value, str):
+            value = ord(value)
+
+        if self.pad == 0:
+            return self.cells.count(value)
+
+        return sum(self.row(row).count(value) for row in range(self.rows))
+
+    def offsets(self, diagonal: bool = False) -> Tuple[int, ...]:
+        """
+        Index offsets of the neighbours of a cell, in reading order.
+        """
+        s = self.stride
+        if diagonal:
+            return (-s - 1, -s, -s + 1, -1, 1, s - 1, s, s + 1)
+
+        return (-s, -1, 1, s)
+
+    def neighbours(self, index: int, diagonal: bool = False) -> Iterator[int]:
+
+        for offset in self.offsets(diagonal):
+            yield index + offset
+
+    def copy(self) -> "Grid":
+
+        other = Grid.__new__(Grid)
+        other.__dict__.update(self.__dict__)
+        other.cells = self.cells[:]
+
+        return other
+
+    def __eq__(self, other: object) -> bool:
+
+        return (isinstance(other, Grid)
+                and (self.rows, self.cols, self.pad, self.typecode)
+                    == (other.rows, other.cols, other.pad, other.typecode)
+                and self.cells == other.cells)
+
+    def __hash__(self) -> int:
+
+        return hash((self.rows, self.cols, bytes(self.cells)))
+
+    def __repr__(self) -> str:
+
+        return "Grid({}x{}, pad={}, typecode={!r})".format(
+            self.rows, self.cols, self.pad, self.typecode)
+
+
+def test_from_lines():
+
+    grid = Grid.from_lines(["#.#", ".", "##"], pad=1, fill="#")
+
+    assert (grid.rows, grid.cols, grid.stride) == (3, 3, 5)
+    assert grid.lines() == ["#.#", ".##", "###"]
+    assert grid[1, 0] == ord(".")
+    assert grid.position(grid.index(2, 1)) == (2, 1)
+    assert grid.count("#") == 7
+    assert len(grid.cells) == 25
+
+
+def test_neighbours():
+
+    grid = Grid.from_lines(["abc", "def", "ghi"], pad=1)
+    centre = grid.index(1, 1)
+
+    assert bytes(grid.cells[i] for i in grid.neighbours(centre)) == b"bdfh"
+    assert bytes(
+        grid.cells[i] for i in grid.neighbours(centre, diagonal=True)
+    ) == b"abcdfghi"
+    assert [grid.cells[i] for i in grid.neighbours(grid.index(0, 0))] == \
+        [ord(" "), ord(" "), ord("b"), ord("d")]
+
+
+def test_copy_and_hash():
+
+    grid = Grid.from_rows([[1, 2], [3, 4]])
+    other = grid.copy()
+
+    assert other == grid and hash(other) == hash(grid)
+    assert {grid: 0}[other] == 0
+
+    other[0, 0] = 9
+    assert grid[0, 0] == 1
+    assert other != grid
+    assert other.to_rows() == [[9, 2], [3, 4]]
@@ -0,0 +1,162 @@
+"""
+An index over strings for Hamming-distance queries, such as box IDs that
+differ in at most k positions, that would otherwise compare every pair.
+
+    index = HammingIndex(ids, 2)    # answers distances up to 2
+    index.within("fghij", 1)        # indices of the IDs at most 1 away
+    index.pairs(2)                  # every (i, j), i < j, at most 2 apart
+    index.add("fguij")              # one more ID, as IDs arrive
+
+Built for distances up to k, the index cuts every string into k + 1 segments
+and files it under each of them. Two strings of the same length at most k
+apart differ in at most k segments, so they agree on at least one and are
+filed together there; only strings that share a segment are compared.
+Strings of different lengths are never close and are kept apart.
+
+Pairs are reported from the first segment their strings agree on, so each
+is compared once however many segments they share. Random IDs rarely share
+a segment and queries cost about the number of segments; many strings
+alike in one segment make its bucket large, and a query then compares
+against all of it. Smaller k gives longer segments and smaller buckets.
+"""
+import itertools
+from operator import ne
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+# One dict per segment, from the segment's text to the strings that have it.
+Tables = List[Dict[str, List[int]]]
+
+
+def distance(s: str, t: str) -> int:
+
+    return sum(map(ne, s, t)) + abs(len(s) - len(t))
+
+
+def segments(length: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Bounds of parts segments of nearly equal size covering length positions.
+    """
+    cuts = [length * i // parts for i in range(parts + 1)]
+
+    return list(zip(cuts, cuts[1:]))
+
+
+class HammingIndex:
+
+    def __init__(self, strings: Iterable[str] = (), k: int = 1) -> None:
+
+        if k < 0:
+            raise ValueError("k must not be negative")
+        self.k = k
+        self.strings: List[str] = []
+        self.bounds: Dict[int, List[Tuple[int, int]]] = dict()
+        self.tables: Dict[int, Tables] = dict()
+        for s in strings:
+            self.add(s)
+
+    def __len__(self) -> int:
+
+        return len(self.strings)
+
+    def add(self, s: str) -> int:
+
+        i = len(self.strings)
+        self.strings.append(s)
+        bounds = self.bounds.get(len(s))
+        if bounds is None:
+            bounds = self.bounds[len(s)] = segments(len(s), self.k + 1)
+            self.tables[len(s)] = [dict() for _ in bounds]
+        for table, (start, stop) in zip(self.tables[len(s)], bounds):
+            table.setdefault(s[start:stop], []).append(i)
+
+        return i
+
+    def _check(self, k: int) -> None:
+
+        if not 0 <= k <= self.k:
+            raise ValueError(
+                "the index answers distances up to {}, not {}".format(
+                    self.k, k))
+
+    def within(self, s: str, k: int) -> List[int]:
+        """
+        Indices of the strings at most k from s, in increasing order.
+        """
+        self._check(k)
+        bounds = self.bounds.get(len(s))
+        if bounds is None:
+            return []
+
+        candidates: Set[int] = set()
+        for table, (start, stop) in zip(self.tables[len(s)], bounds):
+            candidates.update(table.get(s[start:stop], ()))
+
+        strings = self.strings
+
+        return sorted(
+            i for i in candidates if sum(map(ne, strings[i], s)) <= k)
+
+    def pairs(self, k: int) -> Iterator[Tuple[int, int]]:
+        """
+        Every pair (i, j), i < j, of strings at most k apart, in no
+        particular order.
+        """
+        self._check(k)
+        strings = self.strings
+        for length, bounds in self.bounds.items():
+            for n, table in enumerate(self.tables[length]):
+                earlier = bounds[:n]
+                for members in table.values():
+                    for i, j in itertools.combinations(members, 2):
+                        s, t = strings[i], strings[j]
+                        # Reported from the first segment they agree on.
+                        if any(s[a:b] == t[a:b] for a, b in earlier):
+                            continue
+                        if sum(map(ne, s, t)) <= k:
+                            yield i, j
+
+
+def test_segments():
+
+    assert segments(26, 2) == [(0, 13), (13, 26)]
+    assert segments(5, 3) == [(0, 1), (1, 3), (3, 5)]
+    assert segments(1, 3) == [(0, 0), (0, 0), (0, 1)]
+
+
+def test_within():
+
+    ids = ["abcde", "fghij", "klmno", "pqrst", "fguij", "axcye", "wvxyz",
+           "fgui", "fghij"]
+    for k in (1, 2, 4):
+        index = HammingIndex(ids, k)
+        assert index.within("fghij", 0) == [1, 8]
+        assert index.within("fghij", 1) == [1, 4, 8]
+        assert index.within("zzzzz", 0) == []
+        assert index.within("fgu", 1) == []
+    assert HammingIndex(ids, 2).within("abcde", 2) == [0, 5]
+
+    try:
+        HammingIndex(ids, 1).within("abcde", 2)
+    except ValueError:
+        pass
+    else:
+        assert False, "a distance above k must be refused"
+
+
+def test_pairs():
+
+    import random
+
+    rng = random.Random(3)
+    strings = [''.join(rng.choice("ab") for _ in range(rng.choice([5, 6])))
+               for _ in range(60)]
+    for k in (0, 1, 2, 3):
+        index = HammingIndex(strings, k)
+        expected = sorted(
+            (i, j) for i, j in itertools.combinations(range(len(strings)), 2)
+            if len(strings[i]) == len(strings[j])
+            and distance(strings[i], strings[j]) <= k)
+        found = list(index.pairs(k))
+        assert sorted(found) == expected and len(found) == len(expected)
+        assert sorted(HammingIndex(strings, 3).pairs(k)) == expected
@@ -0,0 +1,291 @@
+"""
+Opens puzzle input given as a path, as "-" for stdin, or as a file object,
+so that every day can read its input however it arrives.
+
+    with open_input(source) as f:       # "input.txt", "-", open(p, "rb")
+        for line in f:
+            ...
+
+    for n in words(source):             # whitespace-separated, lazily
+        ...
+
+    values = integers(source)           # array("q") of every number
+    for block in line_blocks(source):   # bytes, whole lines at a time
+        ...
+    for x, y, z, r in records(source, 4):
+        ...
+
+A binary file object, stdin included, is decoded as UTF-8. Paths are
+closed when the block ends; file objects and stdin are left open for the
+caller. Reading goes through the usual buffered text layer a line or a
+block at a time, so a parser written as a generator over the stream keeps
+neither the whole text nor a list of records in memory.
+
+Numeric inputs have a faster path that skips lines and strings: the bytes,
+memory-mapped when the input is a path, are translated so that anything
+other than digits and signs becomes a space, split in large blocks, and
+converted straight into an array("q") that Records slices into rows.
+"""
+import contextlib
+import io
+import mmap
+import os
+import sys
+from array import array
+from typing import IO, Iterator, Sequence, TextIO, Tuple, Union
+
+
+Source = Union[str, "os.PathLike[str]", IO]
+
+BLOCK = 1 << 16
+
+# Blocks of bytes handed to the integer parser at a time.
+NUMBER_BLOCK = 1 << 22
+
+# Every byte that cannot be part of a number becomes a space.
+_NUMERIC = bytes(
+    c if chr(c) in "0123456789+-" else ord(" ") for c in range(256))
+
+
+@contextlib.contextmanager
+def open_input(source: Source) -> Iterator[TextIO]:
+
+    if isinstance(source, (str, os.PathLike)) and source != "-":
+        with open(source) as f:
+            yield f
+        return
+
+    if source == "-":
+        source = getattr(sys.stdin, "buffer", sys.stdin)
+
+    if isinstance(source, io.TextIOBase):
+        yield source  # type: ignore
+        return
+
+    text = io.TextIOWrapper(source, encoding="utf-8")  # type: ignore
+    try:
+        yield text
+    finally:
+        text.detach()
+
+
+def read_text(source: Source) -> str:
+
+    with open_input(source) as f:
+        return f.read()
+
+
+def words(source: Source, block: int = BLOCK) -> Iterator[str]:
+    """
+    Whitespace-separated words of the input, reading a block at a time.
+    """
+    with open_input(source) as f:
+        rest = ""
+        while True:
+            chunk = f.read(block)
+            if not chunk:
+                break
+            parts = (rest + chunk).split()
+            # A word running to the end of the block may go on in the next.
+            if chunk[-1].isspace():
+                rest = ""
+            else:
+                rest = parts.pop() if parts else ""
+            yield from parts
+        if rest:
+            yield rest
+
+
+def _byte_blocks(source: Source, block: int) -> Iterator[bytes]:
+    """
+    The raw bytes of the input in blocks; files named by path are mapped
+    into memory rather than read.
+    """
+    if isinstance(source, (str, os.PathLike)) and source != "-":
+        with open(source, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                for start in range(0, size, block):
+                    yield m[start:start + block]
+        return
+
+    if source == "-":
+        source = getattr(sys.stdin, "buffer", sys.stdin)
+
+    while True:
+        chunk = source.read(block)  # type: ignore
+        if not chunk:
+            break
+        yield chunk.encode() if isinstance(chunk, str) else chunk
+
+
+def line_blocks(source: Source, block: int = NUMBER_BLOCK) -> Iterator[bytes]:
+    """
+    The raw bytes of the input in blocks of whole lines, each about block
+    bytes long; the last line may lack its newline.
+    """
+    rest = b""
+    for chunk in _byte_blocks(source, block):
+        text = rest + chunk
+        cut = text.rfind(b"\n") + 1
+        rest = text[cut:]
+        if cut:
+            yield text[:cut]
+    if rest:
+        yield rest
+
+
+def integer_blocks(source: Source, block: int = NUMBER_BLOCK
+    ) -> Iterator[array]:
+    """
+    Every signed integer in the input, in order, as arrays of typecode "q"
+    of about one block of text each. Anything other than digits and signs
+    separates numbers, so "pos=<-1,2,3>" gives -1, 2 and 3; a sign must
+    come right before its digits.
+    """
+    rest = b""
+    for chunk in _byte_blocks(source, block):
+        text = rest + chunk.translate(_NUMERIC)
+        # A number running to the end of the block may go on in the next.
+        cut = text.rfind(b" ") + 1
+        rest = text[cut:]
+        yield array("q", map(int, text[:cut].split()))
+    if rest:
+        yield array("q", [int(rest)])
+
+
+def integers(source: Source, numpy: bool = False) -> Sequence[int]:
+    """
+    Every signed integer in the input in one array("q"), or in a NumPy
+    int64 array sharing its memory if numpy is set.
+    """
+    values = array("q")
+    for part in integer_blocks(source):
+        values.extend(part)
+
+    if numpy:
+        import numpy as np
+        return np.frombuffer(values, dtype=np.int64)
+
+    return values
+
+
+class Records:
+    """
+    Fixed-width records over a flat array of numbers, such as the four
+    numbers on each line of day 23: record i is values[i * width:][:width].
+    """
+
+    def __init__(self, values: array, width: int) -> None:
+
+        if len(values) % width:
+            raise ValueError("{} numbers do not make records of {}".format(
+                len(values), width))
+        self.values = values
+        self.width = width
+        self._view = memoryview(values)
+
+    def __len__(self) -> int:
+
+        return len(self.values) // self.width
+
+    def __getitem__(self, i: int) -> memoryview:
+        """
+        Record i as a view into the array, without copying.
+        """
+        if not -len(self) <= i < len(self):
+            raise IndexError("record index out of range")
+        start = (i % len(self)) * self.width
+
+        return self._view[start:start + self.width]
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+
+        return zip(*[iter(self.values)] * self.width)
+
+    def column(self, j: int) -> memoryview:
+        """
+        Field j of every record, as a strided view into the array.
+        """
+        return self._view[j::self.width]
+
+
+def records(source: Source, width: int) -> Records:
+
+    return Records(integers(source), width)
+
+
+def test_open_input():
+
+    import tempfile
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write("1\n2\n")
+    try:
+        assert read_text(f.name) == "1\n2\n"
+        with open(f.name, "rb") as binary:
+            assert read_text(binary) == "1\n2\n"
+            assert not binary.closed
+    finally:
+        os.unlink(f.name)
+
+    assert read_text(io.BytesIO(b"a\r\nb\n")) == "a\nb\n"
+    assert read_text(io.StringIO("text")) == "text"
+
+    stdin = sys.stdin
+    sys.stdin = io.TextIOWrapper(io.BytesIO(b"from stdin\n"))
+    try:
+        assert read_text("-") == "from stdin\n"
+    finally:
+        sys.stdin = stdin
+
+
+def test_words():
+
+    text = b"10 2 333\n4  55\n6"
+    for block in (1, 2, 3, 100):
+        assert list(words(io.BytesIO(text), block)) == \
+            ["10", "2", "333", "4", "55", "6"]
+    assert list(words(io.BytesIO(b""))) == []
+
+
+def test_line_blocks():
+
+    text = b"ab\ncd\n\nefg"
+    for block in (1, 2, 4, 100):
+        blocks = list(line_blocks(io.BytesIO(text), block))
+        assert b"".join(blocks) == text
+        assert all(b.endswith(b"\n") for b in blocks[:-1])
+    assert list(line_blocks(io.BytesIO(b""))) == []
+
+
+def test_integers():
+
+    import tempfile
+
+    text = b"pos=<-1,2,+3>, r=40\n+7\n-12 13\n"
+    expected = [-1, 2, 3, 40, 7, -12, 13]
+    for block in (1, 2, 5, 1000):
+        assert [n for part in integer_blocks(io.BytesIO(text), block)
+                for n in part] == expected
+    assert list(integers(io.StringIO(text.decode()))) == expected
+
+    with tempfile.NamedTemporaryFile("wb", delete=False) as f:
+        f.write(text)
+    try:
+        assert list(integers(f.name)) == expected
+        assert len(integers(os.devnull)) == 0
+    finally:
+        os.unlink(f.name)
+
+
+def test_records():
+
+    table = Records(array("q", [1, 2, 3, 4, 5, 6]), 3)
+
+    assert len(table) == 2
+    assert list(table) == [(1, 2, 3), (4, 5, 6)]
+    assert list(table[1]) == [4, 5, 6] and list(table[-2]) == [1, 2, 3]
+    assert list(table.column(2)) == [3, 6]
@@ -0,0 +1,364 @@
+"""
+Opt-in instrumentation of the known hot functions of the solvers.
+
+    python -m aoc.runner 15 --profile          # calls and times
+    python -m aoc.runner 15 --profile memory   # and allocations
+    AOC_PROFILE=1 python -m aoc.runner 15      # same as --profile
+
+While a part is solved under `session`, `solve` and the functions listed in
+HOT_FUNCTIONS are replaced by wrappers that count calls and measure
+cumulative and self time; the elfcode days also time every compiled block of
+the VM. In memory mode tracemalloc is started as well, and each function is
+charged with the traced memory and the allocated blocks its calls leave
+behind. This slows allocation down a lot, so it is not the default. The
+wrappers' own overhead is counted as self time of their caller, which matters
+for functions called millions of times.
+
+A report is printed to stderr and the time spent in each stack of
+instrumented functions is written as a collapsed-stack file,
+`.profile/dayNN-partN.collapsed`, which flamegraph.pl and speedscope read
+directly. The original functions are put back when the session ends.
+Nothing is wrapped unless profiling is enabled, so normal runs pay nothing.
+"""
+import contextlib
+import functools
+import os
+import sys
+import time
+import tracemalloc
+import types
+from collections import Counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+
+PROFILE_DIR = os.environ.get(
+    "AOC_PROFILE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 ".profile"))
+
+# Hot functions of each day, as names in the namespace of its part modules.
+HOT_FUNCTIONS = {
+    6: ["closest_point"],
+    12: ["grow"],
+    13: ["move"],
+    15: ["Board.move_mob", "grid_bfs"],
+    16: ["VM.run", "VM.step"],
+    18: ["change"],
+    20: ["bfs"],
+    19: ["VM.run", "VM.step"],
+    21: ["VM.run", "VM.step"],
+    22: ["Cave._compute_map", "dijkstra"],
+    24: ["select_target"],
+}
+
+Stack = Tuple[str, ...]
+Namespace = Union[dict, type]
+
+
+def enabled() -> bool:
+
+    return os.environ.get("AOC_PROFILE", "") not in ("", "0")
+
+
+def memory_enabled() -> bool:
+
+    return os.environ.get("AOC_PROFILE", "") == "memory"
+
+
+class Stats:
+
+    __slots__ = ("calls", "total", "own", "memory", "blocks")
+
+    def __init__(self) -> None:
+
+        self.calls = 0
+        self.total = 0.0
+        self.own = 0.0
+        self.memory = 0
+        self.blocks = 0
+
+
+class _Frame:
+
+    __slots__ = ("stack", "children")
+
+    def __init__(self, stack: Stack) -> None:
+
+        self.stack = stack
+        self.children = 0.0
+
+
+class Profiler:
+
+    def __init__(self, memory: bool = False) -> None:
+
+        self.memory = memory
+        self.stats: Dict[str, Stats] = dict()
+        # Self time of every stack of instrumented functions. Direct
+        # recursion is folded into a single frame.
+        self.stacks: Counter = Counter()
+        self._frames: List[_Frame] = []
+        self._active: Counter = Counter()
+
+    def wrap(
+        self,
+        name: str,
+        function: Callable,
+        memory: bool = True
+        ) -> Callable:
+        """
+        Instrumented version of function. Allocations are only measured in
+        memory mode and when memory is set, which keeps tiny functions
+        called millions of times cheap enough to profile.
+        """
+        memory = memory and self.memory
+        self.stats.setdefault(name, Stats())
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self.call(name, function, args, kwargs, memory)
+
+        return wrapper
+
+    def call(
+        self,
+        name: str,
+        function: Callable,
+        args: tuple,
+        kwargs: dict,
+        memory: bool = True
+        ) -> Any:
+
+        frames = self._frames
+        parent = frames[-1] if frames else None
+        if parent is None:
+            stack: Stack = (name,)
+        elif parent.stack[-1] == name:
+            stack = parent.stack
+        else:
+            stack = parent.stack + (name,)
+
+        frame = _Frame(stack)
+        frames.append(frame)
+
+        # Recursive calls are only counted once in the cumulative figures.
+        outermost = self._active[name] == 0
+        self._active[name] += 1
+        measure = memory and outermost
+        if measure:
+            traced = tracemalloc.get_traced_memory()[0]
+            blocks = sys.getallocatedblocks()
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            frames.pop()
+            self._active[name] -= 1
+
+            stats = self.stats[name]
+            stats.calls += 1
+            stats.own += elapsed - frame.children
+            self.stacks[stack] += elapsed - frame.children
+            if parent is not None:
+                parent.children += elapsed
+            if outermost:
+                stats.total += elapsed
+            if measure:
+                stats.memory += tracemalloc.get_traced_memory()[0] - traced
+                stats.blocks += sys.getallocatedblocks() - blocks
+
+    def collapsed(self) -> List[str]:
+        """
+        Lines of "frame;frame;frame microseconds", for flamegraph tools.
+        """
+        return [
+            "{} {}".format(";".join(stack), round(seconds * 1e6))
+            for stack, seconds in sorted(self.stacks.items())
+            if round(seconds * 1e6) > 0
+        ]
+
+    def report(self) -> str:
+
+        header = "{:<24} {:>10} {:>9} {:>9}".format(
+            "function", "calls", "cum s", "self s")
+        if self.memory:
+            header += " {:>10} {:>9}".format("net KB", "blocks")
+
+        lines = [header]
+        ranked = sorted(self.stats.items(), key=lambda item: -item[1].own)
+        for name, s in ranked:
+            if not s.calls:
+                continue
+            line = "{:<24} {:>10} {:>9.3f} {:>9.3f}".format(
+                name, s.calls, s.total, s.own)
+            if self.memory:
+                line += " {:>10.1f} {:>9}".format(s.memory / 1024, s.blocks)
+            lines.append(line)
+
+        return "\n".join(lines)
+
+
+def _set(namespace: Namespace, attribute: str, value: Any) -> None:
+
+    if isinstance(namespace, dict):
+        namespace[attribute] = value
+    else:
+        setattr(namespace, attribute, value)
+
+
+def _targets(
+    module: types.ModuleType,
+    name: str
+    ) -> List[Tuple[Namespace, str, Any]]:
+    """
+    The places that hold the hot function `name` of a part module: the class
+    for a method, otherwise the module and the module that defined it.
+    """
+    owner_name, _, attribute = name.rpartition(".")
+    if owner_name:
+        owner = getattr(module, owner_name, None)
+        if not isinstance(owner, type):
+            return []
+        for klass in owner.__mro__:
+            if attribute in vars(klass):
+                return [(klass, attribute, vars(klass)[attribute])]
+        return []
+
+    function = getattr(module, attribute, None)
+    if not isinstance(function, types.FunctionType):
+        return []
+
+    result: List[Tuple[Namespace, str, Any]] = [
+        (vars(module), attribute, function)]
+    if function.__globals__ is not vars(module) \
+            and function.__globals__.get(attribute) is function:
+        result.append((function.__globals__, attribute, function))
+
+    return result
+
+
+def _instrument_blocks(profiler: Profiler, program_class: type) -> Callable:
+    """
+    Replacement for Program.compile_block that times each compiled block.
+    """
+    compile_block = program_class.compile_block
+
+    def instrumented(self, start, breakpoints):
+        function, length = compile_block(self, start, breakpoints)
+        name = "VM.block[{}]".format(start)
+        block = (profiler.wrap(name, function, memory=False), length)
+        self.block_table(breakpoints)[start] = block
+        return block
+
+    return instrumented
+
+
+def instrument(
+    profiler: Profiler,
+    day: int,
+    module: types.ModuleType
+    ) -> List[Tuple[Namespace, str, Any]]:
+    """
+    Wraps the hot functions of a part module; returns what to restore.
+    """
+    patches = []
+    for name in ["solve"] + HOT_FUNCTIONS.get(day, []):
+        for namespace, attribute, original in _targets(module, name):
+            patches.append((namespace, attribute, original))
+            _set(namespace, attribute, profiler.wrap(name, original))
+
+    program = getattr(module, "Program", None)
+    if isinstance(program, type) and hasattr(program, "compile_block"):
+        patches.append((program, "compile_block", program.compile_block))
+        program.compile_block = _instrument_blocks(profiler, program)
+
+    return patches
+
+
+@contextlib.contextmanager
+def session(
+    day: int,
+    part: int,
+    module: types.ModuleType,
+    directory: Optional[str] = None
+    ) -> Iterator[Optional[Profiler]]:
+    """
+    Profiles the part while the block runs, if profiling is enabled.
+    """
+    if not enabled():
+        yield None
+        return
+
+    profiler = Profiler(memory_enabled())
+    started = profiler.memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    patches = instrument(profiler, day, module)
+    try:
+        yield profiler
+    finally:
+        for namespace, attribute, original in reversed(patches):
+            _set(namespace, attribute, original)
+        if started:
+            tracemalloc.stop()
+
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        filename = os.path.join(
+            directory, "day{:02d}-part{}.collapsed".format(day, part))
+        with open(filename, "w") as f:
+            f.writelines(line + "\n" for line in profiler.collapsed())
+
+        print("day {:02d} part {} profile ({})\n{}".format(
+            day, part, filename, profiler.report()), file=sys.stderr)
+
+
+def test_profiler():
+
+    profiler = Profiler(memory=True)
+
+    def fib(n):
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    fib = profiler.wrap("fib", fib)
+    outer = profiler.wrap("outer", lambda: fib(10))
+
+    assert outer() == 55
+    assert profiler.stats["fib"].calls == 177
+    assert profiler.stats["outer"].calls == 1
+    assert profiler.stats["outer"].total >= profiler.stats["fib"].total
+    assert set(profiler.stacks) == {("outer",), ("outer", "fib")}
+    assert profiler.collapsed()[-1].startswith("outer;fib ")
+    assert "net KB" in profiler.report()
+
+
+def test_session():
+
+    import io
+    import tempfile
+
+    module = types.ModuleType("part1")
+    exec("def grow(n):\n    return n + 1\n\n"
+         "def solve(filename):\n    return grow(grow(0))\n", vars(module))
+    grow = module.grow
+
+    os.environ["AOC_PROFILE"] = "memory"
+    try:
+        with tempfile.TemporaryDirectory() as directory, \
+             contextlib.redirect_stderr(io.StringIO()) as report:
+            with session(12, 1, module, directory) as profiler:
+                assert module.solve("input.txt") == 2
+            with open(os.path.join(directory, "day12-part1.collapsed")) as f:
+                assert all(line.startswith("solve") for line in f)
+    finally:
+        del os.environ["AOC_PROFILE"]
+
+    assert profiler.stats["grow"].calls == 2
+    assert profiler.memory and not tracemalloc.is_tracing()
+    assert module.grow is grow
+    assert "grow" in report.getvalue()
+
+    with session(12, 1, module) as profiler:
+        assert profiler is None and module.grow is grow
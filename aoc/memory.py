@@ -0,0 +1,546 @@
+"""
+Reports the peak Python memory of every part and where it was allocated,
+and checks it against the budgets in perf_baseline.json.
+
+    python -m aoc.memory                    # every day on its reference input
+    python -m aoc.memory 20 22 --top 10     # ten allocation sites per part
+    python -m aoc.memory 9 --size 5000000   # a generated input of that size
+    python -m aoc.memory 22 --update        # record the peaks and sites
+    python -m aoc.memory 22 --update --budget 1.5   # and allow 1.5x as budget
+
+Each part is solved under tracemalloc on the same reference input as
+aoc.regress, or on a generated input of --size, twice and each time in a
+fresh process. The first run only reads the peak: the most memory the
+solver's Python objects and NumPy arrays held at any one time, which unlike
+the resident set size of aoc.regress does not depend on the allocator or on
+memory the process had already. NumPy, when it is the backend, is imported
+before tracing starts. In the second run a background thread looks at the
+traced memory every few milliseconds, and each time it has grown by half
+since the last look it keeps the allocations of that moment, so the sites
+shown are those live close to the peak rather than those left when the
+solver returns. The sites take a run of their own because gathering them
+allocates memory too. Tracing slows solvers that allocate many small
+objects by ten times or more.
+
+The figures are stored next to the runtime baseline, as "peak" in
+kilobytes and "sites" for every part, a site being a file and function so
+that unrelated edits do not change it. A part fails when its peak is above
+its "budget", or without a budget when it grew by more than the threshold
+over the recorded peak; the exit status is then 1. Budgets are kept by
+--update, and set to a multiple of the measured peak with --budget.
+"""
+import argparse
+import ast
+import functools
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import tracemalloc
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from aoc import backend
+from aoc.bench import default_sizes, write_input
+from aoc.regress import (
+    BASELINE_FILE, read_baseline, reference_input, regressed, write_baseline)
+from aoc.runner import DAYS, PARTS, ROOT, load_day, run_part
+from aoc.scheduler import job_key
+
+
+# Frames kept per allocation; the innermost one in the repository is shown.
+# Each frame costs time on every allocation, a lot for solvers that
+# allocate millions of short-lived objects.
+FRAMES = 4
+
+# Seconds between looks at the traced memory.
+INTERVAL = 0.005
+
+# Sites are gathered again when the traced memory reaches this many times
+# the size it had when they were last gathered, and not below MIN_SITES.
+GROWTH = 1.5
+MIN_SITES = 1 << 20
+
+# Peak changes smaller than this, in kilobytes, are noise.
+MIN_PEAK_CHANGE = 1024
+
+
+class Site(NamedTuple):
+
+    where: str
+    size: int
+    count: int
+
+
+class Footprint(NamedTuple):
+
+    day: int
+    part: int
+    peak: int = 0
+    sites: Tuple[Site, ...] = ()
+    error: Optional[str] = None
+
+
+def short(filename: str) -> str:
+    """
+    A path relative to the repository, or for code outside it relative to
+    the longest entry of sys.path that holds it, as in "inspect.py".
+    """
+    if filename.startswith("<"):
+        return filename
+    filename = os.path.abspath(filename)
+    if filename.startswith(ROOT + os.sep):
+        return os.path.relpath(filename, ROOT)
+
+    prefixes = [os.path.abspath(entry) + os.sep for entry in sys.path if entry]
+    prefix = max((p for p in prefixes if filename.startswith(p)),
+                 key=len, default="")
+
+    return filename[len(prefix):]
+
+
+@functools.lru_cache(maxsize=None)
+def functions(filename: str) -> List[Tuple[int, int, str]]:
+    """
+    First line, last line and qualified name, such as "Cave._compute_map",
+    of every function and class in a source file.
+    """
+    try:
+        with open(filename, "rb") as f:
+            tree = ast.parse(f.read(), filename)
+    except (OSError, SyntaxError, ValueError):
+        return []
+
+    spans: List[Tuple[int, int, str]] = []
+
+    def visit(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                  ast.ClassDef)):
+                name = prefix + child.name
+                spans.append((child.lineno, child.end_lineno or child.lineno,
+                              name))
+                visit(child, name + ".")
+            else:
+                visit(child, prefix)
+
+    visit(tree, "")
+
+    return spans
+
+
+def function_at(filename: str, lineno: int) -> str:
+    """
+    Qualified name of the innermost function holding a line of a file, or
+    "<module>" for code outside any.
+    """
+    name, start = "<module>", 0
+    for first, last, qualified in functions(filename):
+        if first <= lineno <= last and first >= start:
+            name, start = qualified, first
+
+    return name
+
+
+def where(filename: str, lineno: int) -> str:
+
+    if filename.startswith("<"):
+        return "{}:{}".format(filename, lineno)
+
+    return "{}:{}".format(short(filename), function_at(filename, lineno))
+
+
+# Allocated bytes and blocks by the file and line that made them.
+Lines = Dict[Tuple[str, int], List[int]]
+
+
+def allocating_lines(snapshot: tracemalloc.Snapshot) -> Lines:
+    """
+    Allocations of a snapshot by the innermost line in the repository that
+    led to them, or by their innermost line if none did.
+    """
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    lines: Lines = dict()
+    for stat in snapshot.statistics("traceback"):
+        for frame in reversed(stat.traceback):
+            if not frame.filename.startswith("<") and os.path.abspath(
+                    frame.filename).startswith(ROOT + os.sep):
+                break
+        else:
+            frame = stat.traceback[-1]
+        totals = lines.setdefault((frame.filename, frame.lineno), [0, 0])
+        totals[0] += stat.size
+        totals[1] += stat.count
+
+    return lines
+
+
+def top_sites(lines: Lines, top: int) -> Tuple[Site, ...]:
+    """
+    The largest sites, adding up the lines of every function. Source files
+    are parsed to name the functions, so call it once tracing is over.
+    """
+    sizes: Dict[str, List[int]] = dict()
+    for (filename, lineno), (size, count) in lines.items():
+        totals = sizes.setdefault(where(filename, lineno), [0, 0])
+        totals[0] += size
+        totals[1] += count
+
+    ranked = sorted(sizes.items(), key=lambda item: -item[1][0])
+
+    return tuple(Site(key, size, count) for key, (size, count) in ranked[:top])
+
+
+class PeakWatcher:
+    """
+    Keeps the allocations of the moments the traced memory reached a new
+    high, looking from a background thread, and their largest sites once
+    it stops.
+    """
+
+    def __init__(
+        self,
+        top: int,
+        frames: int = FRAMES,
+        interval: float = INTERVAL
+        ) -> None:
+
+        self.top = top
+        self.frames = frames
+        self.interval = interval
+        self.lines: Lines = dict()
+        self.sites: Tuple[Site, ...] = ()
+        self.size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def __enter__(self) -> "PeakWatcher":
+
+        tracemalloc.start(self.frames)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+
+        self._stop.set()
+        self._thread.join()
+        self.look()
+        tracemalloc.stop()
+        self.sites = top_sites(self.lines, self.top)
+
+    def look(self) -> None:
+
+        current = tracemalloc.get_traced_memory()[0]
+        if current < max(self.size * GROWTH, MIN_SITES) and self.lines:
+            return
+        # Dropped first, or the last look's lines would be among the sites.
+        self.lines = dict()
+        self.lines = allocating_lines(tracemalloc.take_snapshot())
+        self.size = current
+
+    def _watch(self) -> None:
+
+        while not self._stop.wait(self.interval):
+            self.look()
+
+
+def _footprint(
+    day: int,
+    part: int,
+    filename: str,
+    top: int,
+    frames: int,
+    conn
+    ) -> None:
+    """
+    Worker: solves a part and sends its peak, or with top its sites.
+    """
+    module = load_day(day)[part]
+    # NumPy is imported on first use; its import is not the solver's memory.
+    if backend.current() == "numpy":
+        backend.numpy()
+
+    if top:
+        with PeakWatcher(top, frames) as watcher:
+            result = run_part(day, part, module, filename)
+        conn.send((0, watcher.sites, result.error))
+    else:
+        tracemalloc.start(1)
+        result = run_part(day, part, module, filename)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        conn.send((peak, (), result.error))
+    conn.close()
+
+
+def _run(
+    day: int,
+    part: int,
+    filename: str,
+    top: int,
+    frames: int,
+    timeout: float
+    ) -> Footprint:
+
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_footprint, args=(day, part, filename, top, frames, sender))
+    process.start()
+    sender.close()
+
+    if not receiver.poll(timeout):
+        process.kill()
+        process.join()
+        return Footprint(day, part, error="timeout after {}s".format(timeout))
+
+    try:
+        peak, sites, error = receiver.recv()
+    except EOFError:
+        peak, sites, error = 0, (), "worker died"
+    process.join()
+
+    return Footprint(day, part, peak, tuple(sites), error)
+
+
+def footprint(
+    day: int,
+    part: int,
+    filename: str,
+    top: int = 5,
+    frames: int = FRAMES,
+    timeout: float = 300.0
+    ) -> Footprint:
+    """
+    The peak of a part from one run and its largest sites from another. A
+    part whose sites run fails, as slower under the watcher, keeps its peak
+    without sites.
+    """
+    peak = _run(day, part, filename, 0, 1, timeout)
+    if peak.error is not None or not top:
+        return peak
+
+    sites = _run(day, part, filename, top, frames, timeout)
+    if sites.error is not None:
+        return peak
+
+    return peak._replace(sites=sites.sites)
+
+
+def footprints(
+    days: List[int],
+    parts: List[int],
+    size: Optional[int] = None,
+    top: int = 5,
+    frames: int = FRAMES,
+    timeout: float = 300.0
+    ) -> Iterator[Footprint]:
+
+    with tempfile.TemporaryDirectory(prefix="aoc-memory-") as directory:
+        for day in days:
+            modules = load_day(day)
+            if size is None:
+                filename = reference_input(day, directory)
+            elif default_sizes(day):
+                filename = write_input(day, size, 0, directory)
+            else:
+                filename = None
+            for part in parts:
+                if part not in modules:
+                    continue
+                if filename is None:
+                    yield Footprint(day, part, error="no input")
+                    continue
+                yield footprint(day, part, filename, top, frames, timeout)
+
+
+def check(
+    f: Footprint,
+    baseline: Dict[str, Dict],
+    threshold: float
+    ) -> Optional[bool]:
+    """
+    Whether a part is over its budget, or without one grew past the
+    threshold; None if nothing is recorded for it yet.
+    """
+    if f.error is not None:
+        return True
+
+    recorded = baseline.get(job_key(f.day, f.part), {})
+    peak = f.peak / 1024
+    if "budget" in recorded:
+        return peak > recorded["budget"]
+    if "peak" in recorded:
+        return regressed(recorded["peak"], peak, threshold, MIN_PEAK_CHANGE)
+
+    return None
+
+
+def format_footprint(
+    f: Footprint,
+    baseline: Dict[str, Dict],
+    status: Optional[bool]
+    ) -> str:
+
+    line = "{}  ".format(job_key(f.day, f.part))
+    if f.error is not None:
+        return line + "error: " + f.error
+
+    recorded = baseline.get(job_key(f.day, f.part), {})
+    line += "peak {:9.1f}MB".format(f.peak / 1024 / 1024)
+    if "budget" in recorded:
+        line += "  budget {:9.1f}MB".format(recorded["budget"] / 1024)
+    elif "peak" in recorded:
+        line += "  was {:9.1f}MB".format(recorded["peak"] / 1024)
+    if status is not None:
+        line += "  " + ("OVER" if status else "ok")
+
+    for site in f.sites:
+        line += "\n    {:9.1f}MB {:>9} blocks  {}".format(
+            site.size / 1024 / 1024, site.count, site.where)
+
+    return line
+
+
+def record(
+    f: Footprint,
+    baseline: Dict[str, Dict],
+    budget: Optional[float] = None
+    ) -> None:
+    """
+    Stores the peak and sites of a part next to its runtime figures, and a
+    budget of that many times the peak if one is given.
+    """
+    entry = baseline.setdefault(job_key(f.day, f.part), dict())
+    entry["peak"] = round(f.peak / 1024)
+    entry["sites"] = [site.where for site in f.sites]
+    if budget is not None:
+        entry["budget"] = max(round(entry["peak"] * budget), MIN_PEAK_CHANGE)
+
+
+def test_watcher():
+
+    with PeakWatcher(3) as watcher:
+        blocks = [bytearray(1 << 16) for _ in range(64)]
+        watcher.look()
+        del blocks
+        kept = bytes(1 << 10)
+
+    assert watcher.sites[0].where == \
+        os.path.join("aoc", "memory.py") + ":test_watcher"
+    assert watcher.sites[0].count >= 64
+    assert watcher.sites[0].size >= 4 << 20
+    assert not tracemalloc.is_tracing()
+    del kept
+
+
+def test_short():
+
+    assert short(os.path.join(ROOT, "day22", "part1.py")) == \
+        os.path.join("day22", "part1.py")
+    assert short(threading.__file__) == "threading.py"
+    assert short("<frozen importlib._bootstrap>") == \
+        "<frozen importlib._bootstrap>"
+
+
+def test_function_at():
+
+    assert function_at(__file__, PeakWatcher.look.__code__.co_firstlineno + 2) \
+        == "PeakWatcher.look"
+    assert function_at(__file__, 1) == "<module>"
+    assert function_at("no such file", 10) == "<module>"
+
+
+def test_footprint():
+
+    global _run
+
+    def fake(day, part, filename, top, frames, timeout):
+        if top and part == 2:
+            return Footprint(day, part, error="timeout after 1s")
+        return Footprint(day, part, 0 if top else 1 << 20,
+                         (Site("day09/part1.py:play", 1, 1),)[:top])
+
+    saved, _run = _run, fake
+    try:
+        assert footprint(9, 1, "input.txt") == Footprint(
+            9, 1, 1 << 20, (Site("day09/part1.py:play", 1, 1),))
+        assert footprint(9, 2, "input.txt") == Footprint(9, 2, 1 << 20)
+    finally:
+        _run = saved
+
+
+def test_check():
+
+    baseline = {
+        "day22/part1": {"peak": 100000, "budget": 150000},
+        "day09/part1": {"peak": 100000},
+    }
+
+    assert check(Footprint(22, 1, 140000 * 1024), baseline, 0.25) is False
+    assert check(Footprint(22, 1, 160000 * 1024), baseline, 0.25) is True
+    assert check(Footprint(9, 1, 120000 * 1024), baseline, 0.25) is False
+    assert check(Footprint(9, 1, 130000 * 1024), baseline, 0.25) is True
+    assert check(Footprint(9, 2, 1), baseline, 0.25) is None
+    assert check(Footprint(9, 1, error="timeout"), baseline, 0.25) is True
+
+    record(Footprint(9, 1, 2048 * 1024, (Site("day09/part1.py:play", 1, 1),)),
+           baseline, 2.0)
+    assert baseline["day09/part1"] == {
+        "peak": 2048, "sites": ["day09/part1.py:play"], "budget": 4096}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--part", type=int, choices=PARTS, action="append")
+    parser.add_argument("--size", type=int,
+                        help="use a generated input of this size instead")
+    parser.add_argument("--top", type=int, default=5,
+                        help="allocation sites to show per part")
+    parser.add_argument("--frames", type=int, default=FRAMES,
+                        help="stack frames traced per allocation; fewer "
+                             "run faster but may show library code as sites")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative growth without a budget")
+    parser.add_argument("--timeout", type=float, default=300.0,
+                        help="seconds allowed for a single run")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true",
+                        help="store the measured peaks and sites")
+    parser.add_argument("--budget", type=float,
+                        help="with --update, set budgets to this times the peak")
+    args = parser.parse_args(argv)
+
+    if args.budget is not None and not args.update:
+        parser.error("--budget needs --update")
+    if args.update and args.size is not None:
+        parser.error("only reference inputs can be recorded")
+
+    baseline = read_baseline(args.baseline)
+    updated = read_baseline(args.baseline)
+
+    failed = False
+    for f in footprints(args.days, args.part or PARTS, args.size, args.top,
+                        args.frames, args.timeout):
+        status = None if args.size is not None else \
+            check(f, baseline, args.threshold)
+        print(format_footprint(f, baseline, status), flush=True)
+        if f.error is None:
+            record(f, updated, args.budget)
+        failed = failed or bool(status)
+
+    if args.update:
+        write_baseline(updated, args.baseline)
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Checks the runtime and memory of every part against a committed baseline.
+
+    python -m aoc.regress                   # compare all days to the baseline
+    python -m aoc.regress 9 15 --repeat 5   # only days 9 and 15, five runs each
+    python -m aoc.regress --threshold 0.5   # allow 50% before failing
+    python -m aoc.regress 9 --update        # record new baseline figures
+
+Each part is solved --repeat times on its reference input, each time in a
+fresh process (see aoc.bench.measure), and the median wall time and median
+peak memory growth are compared with perf_baseline.json. A part regresses
+when either grows by more than the threshold and by more than the noise
+floor below; the command then exits with status 1. The reference input is
+the day's input.txt, or for the days without one the output of its
+generator with seed 0, at REFERENCE_SIZE if generate.py sets one and at its
+largest size otherwise.
+
+The baseline holds absolute figures from one machine, so refresh it with
+--update when moving to another or after an intended slowdown. Updating a
+few days keeps the figures of the others, and the memory figures of
+aoc.memory kept next to them.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from aoc.bench import measure, write_input
+from aoc.runner import (
+    DAYS, PARTS, ROOT, day_directory, load_day, load_modules)
+from aoc.scheduler import job_key
+
+
+BASELINE_FILE = os.path.join(ROOT, "perf_baseline.json")
+
+# Changes smaller than these are noise, whatever the threshold says.
+MIN_WALL_CHANGE = 0.05
+MIN_RSS_CHANGE = 2048
+
+
+class Sample(NamedTuple):
+
+    day: int
+    part: int
+    wall: float = 0.0
+    rss: int = 0
+    error: Optional[str] = None
+
+
+def reference_input(day: int, directory: str) -> Optional[str]:
+
+    filename = os.path.join(day_directory(day), "input.txt")
+    if os.path.exists(filename):
+        return filename
+
+    modules = load_modules(day, ["generate"])
+    if "generate" not in modules:
+        return None
+    generator = modules["generate"]
+    size = getattr(generator, "REFERENCE_SIZE", max(generator.SIZES))
+
+    return write_input(day, size, 0, directory)
+
+
+def sample(
+    day: int,
+    part: int,
+    filename: str,
+    repeat: int,
+    timeout: float
+    ) -> Sample:
+
+    walls, rss = [], []
+    for _ in range(repeat):
+        m = measure(day, part, 0, filename, timeout)
+        if m.error is not None:
+            return Sample(day, part, error=m.error)
+        walls.append(m.wall)
+        rss.append(m.rss_growth)
+
+    return Sample(day, part, statistics.median(walls),
+                  round(statistics.median(rss)))
+
+
+def samples(
+    days: List[int],
+    parts: List[int],
+    repeat: int = 3,
+    timeout: float = 300.0
+    ) -> Iterator[Sample]:
+
+    with tempfile.TemporaryDirectory(prefix="aoc-regress-") as directory:
+        for day in days:
+            modules = load_day(day)
+            filename = reference_input(day, directory)
+            for part in parts:
+                if part not in modules:
+                    continue
+                if filename is None:
+                    yield Sample(day, part, error="no reference input")
+                    continue
+                yield sample(day, part, filename, repeat, timeout)
+
+
+def read_baseline(filename: str = BASELINE_FILE) -> Dict[str, Dict]:
+
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return dict()
+
+
+def write_baseline(baseline: Dict[str, Dict], filename: str = BASELINE_FILE
+    ) -> None:
+
+    with open(filename, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regressed(before: float, after: float, threshold: float, floor: float
+    ) -> bool:
+
+    return after - before > max(threshold * before, floor)
+
+
+def compare(
+    s: Sample,
+    baseline: Dict[str, Dict],
+    threshold: float
+    ) -> Optional[bool]:
+    """
+    Whether a sample regressed against the baseline; None if the part has
+    no baseline yet.
+    """
+    if s.error is not None:
+        return True
+
+    before = baseline.get(job_key(s.day, s.part))
+    if before is None:
+        return None
+
+    return (regressed(before["wall"], s.wall, threshold, MIN_WALL_CHANGE)
+            or regressed(before["rss"], s.rss, threshold, MIN_RSS_CHANGE))
+
+
+def format_change(before: float, after: float) -> str:
+
+    if before == 0:
+        return "    new" if after else "  +0.0%"
+
+    return "{:+6.1f}%".format(100 * (after - before) / before)
+
+
+def format_sample(
+    s: Sample,
+    baseline: Dict[str, Dict],
+    status: Optional[bool]
+    ) -> str:
+
+    line = "{}  ".format(job_key(s.day, s.part))
+    if s.error is not None:
+        return line + "error: " + s.error
+
+    before = baseline.get(job_key(s.day, s.part))
+    if before is None:
+        return line + "wall {:8.3f}s  rss {:7.1f}MB  (no baseline)".format(
+            s.wall, s.rss / 1024)
+
+    return line + (
+        "wall {:8.3f}s -> {:8.3f}s {}  rss {:7.1f}MB -> {:7.1f}MB {}  {}"
+    ).format(
+        before["wall"], s.wall, format_change(before["wall"], s.wall),
+        before["rss"] / 1024, s.rss / 1024, format_change(before["rss"], s.rss),
+        "REGRESSION" if status else "ok")
+
+
+def test_compare():
+
+    baseline = {
+        "day09/part2": {"wall": 1.0, "rss": 100000},
+        "day01/part1": {"wall": 0.001, "rss": 10},
+    }
+
+    assert compare(Sample(9, 2, 1.2, 100000), baseline, 0.25) is False
+    assert compare(Sample(9, 2, 1.3, 100000), baseline, 0.25) is True
+    assert compare(Sample(9, 2, 1.0, 150000), baseline, 0.25) is True
+    assert compare(Sample(9, 2, error="timeout"), baseline, 0.25) is True
+    # Tripling a millisecond or a few kilobytes is noise.
+    assert compare(Sample(1, 1, 0.003, 1000), baseline, 0.25) is False
+    assert compare(Sample(1, 2, 0.003, 1000), baseline, 0.25) is None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--part", type=int, choices=PARTS, action="append")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per part; the median is compared")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative growth (default: 0.25)")
+    parser.add_argument("--timeout", type=float, default=300.0,
+                        help="seconds allowed for a single run")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update", action="store_true",
+                        help="store the measured figures as the new baseline")
+    args = parser.parse_args(argv)
+
+    baseline = read_baseline(args.baseline)
+    updated = dict(baseline)
+
+    failed = False
+    for s in samples(args.days, args.part or PARTS, args.repeat, args.timeout):
+        status = compare(s, baseline, args.threshold)
+        print(format_sample(s, baseline, status), flush=True)
+        if s.error is None:
+            key = job_key(s.day, s.part)
+            updated[key] = dict(baseline.get(key, {}),
+                                wall=round(s.wall, 4), rss=s.rss)
+        failed = failed or bool(status)
+
+    if args.update:
+        write_baseline(updated, args.baseline)
+        return 0
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Runs the solvers of every day in a single process and reports wall time, CPU
+time and peak resident memory for each part.
+
+    python -m aoc.runner            # all days
+    python -m aoc.runner 1 5 22     # only days 1, 5 and 22
+    python -m aoc.runner --json     # one JSON object per part
+    python -m aoc.runner -j 8       # spread the parts over 8 processes
+    python -m aoc.runner --no-cache # solve even if the answer is cached
+    python -m aoc.runner --profile  # time the hot functions, see aoc.instrument
+    python -m aoc.runner --backend python   # no NumPy, see aoc.backend
+    generate | python -m aoc.runner 1 --part 1 --input -   # input from stdin
+
+Each part is solved by calling the `solve(filename)` function of its
+dayNN/partN.py module; the self-tests in the `__main__` blocks are not run.
+Answers are kept in the on-disk cache of aoc.cache, so unchanged days are
+not solved again, except while profiling or reading stdin, which is passed
+to the solver as it arrives.
+"""
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import resource
+import sys
+import time
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional)
+
+from aoc import instrument
+
+if TYPE_CHECKING:
+    from aoc.cache import ResultCache
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DAYS = list(range(1, 26))
+PARTS = [1, 2]
+
+# Modules that the parts of a day import from each other by their bare name,
+# e.g. "from part1 import read_input".
+LOCAL_MODULES = ["part1", "part2", "generate"]
+
+
+class Result(NamedTuple):
+
+    day: int
+    part: int
+    answer: Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    max_rss: int = 0
+    error: Optional[str] = None
+    cached: bool = False
+
+
+def day_directory(day: int) -> str:
+
+    return os.path.join(ROOT, "day{:02d}".format(day))
+
+
+@contextlib.contextmanager
+def working_directory(path: str) -> Iterator[None]:
+
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def load_modules(day: int, names: Iterable[str]) -> Dict[str, ModuleType]:
+    """
+    Imports modules from a day folder without leaking their bare names, so
+    that every day gets its own part1, part2 and generate modules.
+    """
+    directory = day_directory(day)
+    saved = {
+        name: sys.modules.pop(name)
+        for name in LOCAL_MODULES if name in sys.modules
+    }
+    sys.path.insert(0, directory)
+
+    modules: Dict[str, ModuleType] = dict()
+    try:
+        for name in names:
+            path = os.path.join(directory, name + ".py")
+            if not os.path.exists(path):
+                continue
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            spec.loader.exec_module(module)  # type: ignore
+            modules[name] = module
+    finally:
+        sys.path.remove(directory)
+        for name in LOCAL_MODULES:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+
+    return modules
+
+
+def load_day(day: int, parts: Iterable[int] = PARTS) -> Dict[int, ModuleType]:
+    """
+    The part modules of a day; a part only imports the other parts it uses.
+    """
+    parts = list(parts)
+    modules = load_modules(day, ["part{}".format(part) for part in parts])
+    return {
+        part: modules["part{}".format(part)]
+        for part in parts if "part{}".format(part) in modules
+    }
+
+
+def max_rss() -> int:
+    """
+    Peak resident set size of this process in kilobytes.
+    """
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def run_part(
+    day: int,
+    part: int,
+    module: ModuleType,
+    input_name: str = "input.txt",
+    cache: Optional["ResultCache"] = None
+    ) -> Result:
+
+    directory = day_directory(day)
+    filename = os.path.join(directory, input_name)
+    if input_name == "-":
+        # A stream can only be read once, so it cannot be hashed for the cache.
+        filename, cache = input_name, None
+    elif not os.path.exists(filename):
+        return Result(day, part, error="missing " + input_name)
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        with working_directory(directory), \
+             contextlib.redirect_stdout(io.StringIO()), \
+             instrument.session(day, part, module):
+            if cache is None:
+                answer, cached = module.solve(filename), False
+            else:
+                answer, cached = cache.solve(day, part, module, filename)
+    except Exception as e:
+        return Result(
+            day, part,
+            wall=time.perf_counter() - start_wall,
+            cpu=time.process_time() - start_cpu,
+            max_rss=max_rss(),
+            error="{}: {}".format(type(e).__name__, e)
+        )
+
+    return Result(
+        day, part,
+        answer=answer,
+        wall=time.perf_counter() - start_wall,
+        cpu=time.process_time() - start_cpu,
+        max_rss=max_rss(),
+        cached=cached
+    )
+
+
+def run(
+    days: Iterable[int] = DAYS,
+    parts: Iterable[int] = PARTS,
+    input_name: str = "input.txt",
+    cache: Optional["ResultCache"] = None
+    ) -> Iterator[Result]:
+
+    parts = list(parts)
+    for day in days:
+        modules = load_day(day, parts)
+        for part in parts:
+            if part in modules:
+                yield run_part(day, part, modules[part], input_name, cache)
+
+
+def format_result(result: Result) -> str:
+
+    line = "day {:02d} part {}  wall {:8.3f}s  cpu {:8.3f}s  rss {:7.1f}MB  ".format(
+        result.day, result.part, result.wall, result.cpu, result.max_rss / 1024)
+
+    if result.error is not None:
+        return line + "error: " + result.error
+
+    if result.cached:
+        line += "(cached) "
+
+    answer = str(result.answer)
+    if '\n' in answer:
+        return line + "answer:\n" + answer
+
+    return line + "answer: " + answer
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    # Imported here so that solvers importing aoc modules do not pay for it.
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--part", type=int, choices=PARTS, action="append")
+    parser.add_argument("--input", default="input.txt",
+                        help="input file name inside each day folder, "
+                             "or - for stdin")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON object per part")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes (0 for one per CPU)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always solve instead of reusing cached answers")
+    parser.add_argument("--profile", nargs="?", const="1",
+                        choices=["1", "memory"],
+                        help="instrument the hot functions of each part, "
+                             "tracing allocations too with 'memory'")
+    parser.add_argument("--backend", choices=["python", "numpy"],
+                        help="run the numeric kernels in pure Python or "
+                             "NumPy (default: NumPy when installed)")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        os.environ["AOC_PROFILE"] = args.profile
+    if args.backend:
+        os.environ["AOC_BACKEND"] = args.backend
+
+    cache = None
+    if not args.no_cache and not instrument.enabled():
+        from aoc.cache import ResultCache
+        cache = ResultCache()
+
+    if args.jobs == 1:
+        results = run(args.days, args.part or PARTS, args.input, cache)
+    else:
+        from aoc.scheduler import run_parallel
+        results = run_parallel(
+            args.days, args.part or PARTS, args.input, args.jobs or None,
+            cache=cache)
+
+    failed = False
+    for result in results:
+        failed = failed or result.error is not None
+        if args.json:
+            print(json.dumps(result._asdict(), default=str), flush=True)
+        else:
+            print(format_result(result), flush=True)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
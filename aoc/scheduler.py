@@ -0,0 +1,181 @@
+"""
+Spreads the day/part solvers over a pool of worker processes.
+
+Jobs are submitted longest first, using the wall times recorded by earlier
+runs, so the slowest solvers start right away and the cheap ones fill in the
+gaps. Results are yielded as soon as each job finishes.
+
+A solver can spread its own work too: map_blocks calls one of its functions
+on blocks of input in the workers, which import the day themselves since
+day modules cannot be imported by name.
+"""
+import json
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait)
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple)
+
+from aoc import instrument
+from aoc.runner import (
+    DAYS, PARTS, ROOT, Result, day_directory, load_day, run_part)
+
+if TYPE_CHECKING:
+    from aoc.cache import ResultCache
+
+
+RUNTIMES_FILE = os.path.join(ROOT, ".runtimes.json")
+
+Job = Tuple[int, int]
+
+# Days already imported by this worker process.
+_loaded: Dict[int, Dict[int, ModuleType]] = dict()
+
+# Blocks in flight per worker in map_blocks.
+QUEUE_PER_WORKER = 2
+
+
+def read_runtimes(filename: str = RUNTIMES_FILE) -> Dict[str, float]:
+
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return dict()
+
+
+def write_runtimes(
+    runtimes: Dict[str, float],
+    filename: str = RUNTIMES_FILE
+    ) -> None:
+
+    with open(filename, "w") as f:
+        json.dump(runtimes, f, indent=2, sort_keys=True)
+
+
+def job_key(day: int, part: int) -> str:
+
+    return "day{:02d}/part{}".format(day, part)
+
+
+def longest_first(jobs: Iterable[Job], runtimes: Dict[str, float]) -> List[Job]:
+    """
+    Orders jobs by their recorded runtime, slowest first. Jobs that have never
+    been timed go to the front, since they could be the slowest of all.
+    """
+    return sorted(
+        jobs,
+        key=lambda job: -runtimes.get(job_key(*job), float('inf'))
+    )
+
+
+def solve_job(
+    day: int,
+    part: int,
+    input_name: str,
+    cache: Optional["ResultCache"] = None
+    ) -> Result:
+
+    if day not in _loaded:
+        _loaded[day] = load_day(day)
+
+    modules = _loaded[day]
+    if part not in modules:
+        return Result(day, part, error="missing part{}.py".format(part))
+
+    return run_part(day, part, modules[part], input_name, cache)
+
+
+def call_job(day: int, part: int, name: str, *args: Any) -> Any:
+
+    if day not in _loaded:
+        _loaded[day] = load_day(day)
+
+    return getattr(_loaded[day][part], name)(*args)
+
+
+def map_blocks(
+    day: int,
+    part: int,
+    name: str,
+    blocks: Iterable[Any],
+    workers: Optional[int] = None
+    ) -> Iterator[Any]:
+    """
+    Results of the function name of a part on every block, in the order
+    they finish. Only a few blocks per worker are read ahead, so the blocks
+    can come from a stream far larger than memory.
+    """
+    workers = workers or os.cpu_count() or 1
+    blocks = iter(blocks)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def submit() -> Optional[Future]:
+            block = next(blocks, None)
+            if block is None:
+                return None
+            return executor.submit(call_job, day, part, name, block)
+
+        running: Set[Future] = set()
+        for _ in range(workers * QUEUE_PER_WORKER):
+            future = submit()
+            if future is None:
+                break
+            running.add(future)
+
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                following = submit()
+                if following is not None:
+                    running.add(following)
+
+
+def run_parallel(
+    days: Iterable[int] = DAYS,
+    parts: Iterable[int] = PARTS,
+    input_name: str = "input.txt",
+    workers: Optional[int] = None,
+    runtimes_file: str = RUNTIMES_FILE,
+    cache: Optional["ResultCache"] = None
+    ) -> Iterator[Result]:
+
+    runtimes = read_runtimes(runtimes_file)
+    # Parts a day does not have are skipped, as run() skips them.
+    jobs = longest_first([
+        (day, part) for day in days for part in parts
+        if os.path.exists(
+            os.path.join(day_directory(day), "part{}.py".format(part)))
+    ], runtimes)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(solve_job, day, part, input_name, cache)
+            for day, part in jobs
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.error is None and not result.cached:
+                runtimes[job_key(result.day, result.part)] = result.wall
+            yield result
+
+    # Instrumented runs are too slow to schedule by.
+    if input_name == "input.txt" and not instrument.enabled():
+        write_runtimes(runtimes, runtimes_file)
+
+
+def test_longest_first():
+
+    runtimes = {"day01/part1": 0.1, "day15/part2": 20.0, "day11/part2": 5.0}
+    jobs = [(1, 1), (11, 2), (15, 2), (9, 1)]
+
+    assert longest_first(jobs, runtimes) == [(9, 1), (15, 2), (11, 2), (1, 1)]
+
+
+if __name__ == "__main__":
+
+    test_longest_first()
+    print("all tests passed.")
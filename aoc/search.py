@@ -0,0 +1,279 @@
+"""
+Breadth-first search, Dijkstra and A* over graphs whose nodes are numbered
+0 to size - 1, such as the flat indices of an aoc.grid.Grid.
+
+    tree = bfs(len(graph), [start], graph.__getitem__)
+    tree.distance[goal]                     # UNREACHED if there is no path
+
+    tree = grid_bfs(grid.cells, grid.offsets(), [start], ord("."))
+
+    tree = dijkstra(size, [start], edges, targets={goal},
+                    heuristic=lambda i: manhattan(i, goal))
+
+Distances, and parents when asked for, are kept in flat arrays indexed by
+node rather than in dicts keyed by tuples, and a node is marked as soon as
+it is first reached, so it never sits in a queue twice for the same
+distance. Weighted searches take their edges as (node, weight) pairs with
+small non-negative integer weights, which lets them use a bucket queue in
+place of a binary heap.
+"""
+from array import array
+from typing import (
+    AbstractSet, Callable, Iterable, List, NamedTuple, Optional, Sequence,
+    Tuple)
+
+
+UNREACHED = -1
+
+Neighbours = Callable[[int], Iterable[int]]
+Edges = Callable[[int], Iterable[Tuple[int, int]]]
+
+
+class Tree(NamedTuple):
+
+    # Distance of every node from the nearest source, or UNREACHED.
+    distance: array
+    # Node each node was first reached from; None unless asked for.
+    parent: Optional[array] = None
+
+
+class BucketQueue:
+    """
+    Priority queue for small non-negative integer priorities that never go
+    below the last one popped (Dial's algorithm): one list of items per
+    priority, scanned upwards.
+    """
+
+    def __init__(self) -> None:
+
+        self.buckets: List[List[int]] = []
+        self.current = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+
+        return self.size
+
+    def push(self, priority: int, item: int) -> None:
+
+        if priority < self.current:
+            raise ValueError(
+                "priority {} is below {}".format(priority, self.current))
+        buckets = self.buckets
+        if priority >= len(buckets):
+            buckets.extend([] for _ in range(priority + 1 - len(buckets)))
+        buckets[priority].append(item)
+        self.size += 1
+
+    def pop(self) -> Tuple[int, int]:
+
+        if not self.size:
+            raise IndexError("pop from an empty queue")
+        buckets = self.buckets
+        while not buckets[self.current]:
+            self.current += 1
+        self.size -= 1
+
+        return self.current, buckets[self.current].pop()
+
+
+def _tables(size: int, parents: bool) -> Tree:
+
+    return Tree(array("i", [UNREACHED]) * size,
+                array("q", [UNREACHED]) * size if parents else None)
+
+
+def bfs(
+    size: int,
+    sources: Iterable[int],
+    neighbours: Neighbours,
+    targets: Optional[AbstractSet[int]] = None,
+    parents: bool = False
+    ) -> Tree:
+    """
+    Unweighted distances from the nearest of the sources. With targets,
+    stops once every node as close as the nearest target has its distance.
+    """
+    tree = _tables(size, parents)
+    distance, parent = tree
+
+    frontier = []
+    for source in sources:
+        if distance[source] == UNREACHED:
+            distance[source] = 0
+            frontier.append(source)
+
+    d = 0
+    while frontier:
+        if targets is not None and not targets.isdisjoint(frontier):
+            break
+        d += 1
+        following = []
+        for i in frontier:
+            for j in neighbours(i):
+                if distance[j] == UNREACHED:
+                    distance[j] = d
+                    following.append(j)
+                    if parent is not None:
+                        parent[j] = i
+        frontier = following
+
+    return tree
+
+
+def grid_bfs(
+    cells: Sequence[int],
+    offsets: Sequence[int],
+    sources: Iterable[int],
+    passable: int,
+    targets: Optional[AbstractSet[int]] = None,
+    parents: bool = False
+    ) -> Tree:
+    """
+    bfs over the cells of a padded grid that hold the value passable, with
+    the neighbour loop inlined since it is run for every cell.
+    """
+    tree = _tables(len(cells), parents)
+    distance, parent = tree
+
+    frontier = []
+    for source in sources:
+        if distance[source] == UNREACHED:
+            distance[source] = 0
+            frontier.append(source)
+
+    d = 0
+    while frontier:
+        if targets is not None and not targets.isdisjoint(frontier):
+            break
+        d += 1
+        following = []
+        for i in frontier:
+            for offset in offsets:
+                j = i + offset
+                if cells[j] == passable and distance[j] == UNREACHED:
+                    distance[j] = d
+                    following.append(j)
+                    if parent is not None:
+                        parent[j] = i
+        frontier = following
+
+    return tree
+
+
+def dijkstra(
+    size: int,
+    sources: Iterable[int],
+    edges: Edges,
+    targets: Optional[AbstractSet[int]] = None,
+    heuristic: Optional[Callable[[int], int]] = None,
+    parents: bool = False
+    ) -> Tree:
+    """
+    Weighted distances from the nearest of the sources, stopping when the
+    first of the targets is settled. With a heuristic this is A*: it must
+    never overestimate the distance to the targets and must not drop by
+    more than the weight of any edge, and then the distances of the targets
+    are exact while other nodes may be left unsettled.
+    """
+    tree = _tables(size, parents)
+    distance, parent = tree
+    settled = bytearray(size)
+    queue = BucketQueue()
+
+    for source in sources:
+        if distance[source] == UNREACHED:
+            distance[source] = 0
+            queue.push(heuristic(source) if heuristic else 0, source)
+
+    while queue:
+        _, i = queue.pop()
+        if settled[i]:
+            continue
+        settled[i] = 1
+        if targets is not None and i in targets:
+            break
+
+        d = distance[i]
+        for j, weight in edges(i):
+            e = d + weight
+            if distance[j] == UNREACHED or e < distance[j]:
+                distance[j] = e
+                queue.push(e + heuristic(j) if heuristic else e, j)
+                if parent is not None:
+                    parent[j] = i
+
+    return tree
+
+
+def path(tree: Tree, node: int) -> List[int]:
+    """
+    Nodes from a source to node, following a tree searched with parents.
+    """
+    if tree.parent is None:
+        raise ValueError("the search did not record parents")
+    if tree.distance[node] == UNREACHED:
+        return []
+
+    nodes = [node]
+    while tree.parent[nodes[-1]] != UNREACHED:
+        nodes.append(tree.parent[nodes[-1]])
+
+    return nodes[::-1]
+
+
+def test_bucket_queue():
+
+    queue = BucketQueue()
+    for priority, item in [(3, 30), (1, 10), (3, 31), (2, 20)]:
+        queue.push(priority, item)
+
+    assert [queue.pop() for _ in range(3)] == [(1, 10), (2, 20), (3, 31)]
+    queue.push(5, 50)
+    assert [queue.pop() for _ in range(len(queue))] == [(3, 30), (5, 50)]
+
+
+def test_bfs():
+
+    # 0 - 1 - 2 - 3   4 on its own, 5 - 3
+    graph = {0: [1], 1: [0, 2], 2: [1, 3], 3: [2, 5], 4: [], 5: [3]}
+    tree = bfs(6, [0], graph.__getitem__, parents=True)
+
+    assert list(tree.distance) == [0, 1, 2, 3, UNREACHED, 4]
+    assert path(tree, 5) == [0, 1, 2, 3, 5]
+    assert path(tree, 4) == []
+
+    assert list(bfs(6, [0, 5], graph.__getitem__).distance) == \
+        [0, 1, 2, 1, UNREACHED, 0]
+    assert list(bfs(6, [0], graph.__getitem__, targets={2}).distance) == \
+        [0, 1, 2, UNREACHED, UNREACHED, UNREACHED]
+
+
+def test_grid_bfs():
+
+    # #####
+    # #..##
+    # ##..#
+    # #####
+    cells = b"######..####..######"
+    tree = grid_bfs(cells, (-5, -1, 1, 5), [6], ord("."), parents=True)
+
+    assert [tree.distance[i] for i in (6, 7, 12, 13)] == [0, 1, 2, 3]
+    assert tree.distance[8] == UNREACHED
+    assert path(tree, 13) == [6, 7, 12, 13]
+
+
+def test_dijkstra():
+
+    # A short hop costs more than the long way round.
+    graph = {0: [(1, 7), (2, 1)], 1: [(3, 1)], 2: [(1, 2)], 3: []}
+    tree = dijkstra(4, [0], graph.__getitem__, parents=True)
+
+    assert list(tree.distance) == [0, 3, 1, 4]
+    assert path(tree, 3) == [0, 2, 1, 3]
+
+    # Nodes on a line, 0 to 9, with A* towards 9.
+    line = lambda i: [(j, 1) for j in (i - 1, i + 1) if 0 <= j < 10]
+    tree = dijkstra(10, [4], line, targets={9}, heuristic=lambda i: 9 - i)
+    assert tree.distance[9] == 5
+    assert tree.distance[0] == UNREACHED
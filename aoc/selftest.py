@@ -0,0 +1,148 @@
+"""
+Runs the self-tests of every day and of the aoc package in one process.
+
+    python -m aoc.selftest              # everything
+    python -m aoc.selftest 11 15        # only days 11 and 15
+    python -m aoc.selftest aoc          # only the aoc modules
+    python -m aoc.selftest -k power     # tests whose name contains "power"
+    python -m aoc.selftest --quick      # skip the tests listed in SLOW
+
+The tests are the test_* functions defined in dayNN/part1.py, part2.py and
+generate.py, run from inside the day folder, and in the aoc modules. Each is
+reported with its time and any failure with its traceback; the exit status
+is 1 if a test failed. The answers themselves are left to aoc.runner, and
+running a part with --solve-only skips its tests.
+"""
+import contextlib
+import importlib
+import io
+import os
+import sys
+import time
+import traceback
+from types import ModuleType
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from aoc.runner import (
+    DAYS, ROOT, day_directory, load_modules, working_directory)
+
+
+# Tests that take seconds.
+SLOW = {
+    "day11/part2.test_process",
+    "day16/generate.test_generate",
+}
+
+DAY_MODULES = ["part1", "part2", "generate"]
+
+
+class Outcome(NamedTuple):
+
+    name: str
+    wall: float
+    error: Optional[str] = None
+
+
+def tests(module: ModuleType) -> List[Tuple[str, Callable]]:
+    """
+    Test functions defined in a module, in the order they were defined.
+    """
+    return [
+        (name, value) for name, value in vars(module).items()
+        if name.startswith("test_") and callable(value)
+        and getattr(value, "__module__", None) == module.__name__
+    ]
+
+
+def aoc_modules() -> List[ModuleType]:
+
+    names = sorted(
+        name[:-3] for name in os.listdir(os.path.join(ROOT, "aoc"))
+        if name.endswith(".py") and name != "__init__.py")
+
+    return [importlib.import_module("aoc." + name) for name in names]
+
+
+def collect(targets: List[str]) -> Iterator[Tuple[str, str, Callable]]:
+    """
+    (qualified name, working directory, test) for each target, which is a
+    day number or "aoc".
+    """
+    for target in targets:
+        if target == "aoc":
+            for module in aoc_modules():
+                for name, test in tests(module):
+                    yield "{}.{}".format(module.__name__, name), ROOT, test
+            continue
+
+        day = int(target)
+        for module_name, module in load_modules(day, DAY_MODULES).items():
+            for name, test in tests(module):
+                yield ("day{:02d}/{}.{}".format(day, module_name, name),
+                       day_directory(day), test)
+
+
+def run_test(name: str, directory: str, test: Callable) -> Outcome:
+
+    start = time.perf_counter()
+    try:
+        with working_directory(directory), \
+             contextlib.redirect_stdout(io.StringIO()):
+            test()
+    except Exception:
+        return Outcome(name, time.perf_counter() - start,
+                       traceback.format_exc())
+
+    return Outcome(name, time.perf_counter() - start)
+
+
+def test_tests():
+
+    module = ModuleType("example")
+    exec("from os.path import join as test_join\n"
+         "def test_b(): pass\n"
+         "def test_a(): assert False\n"
+         "def helper(): pass\n", vars(module))
+
+    assert [name for name, _ in tests(module)] == ["test_b", "test_a"]
+    assert run_test("example.test_b", ROOT, module.test_b).error is None
+    assert "AssertionError" in run_test("example.test_a", ROOT, module.test_a).error
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("targets", nargs="*",
+                        default=[str(day) for day in DAYS] + ["aoc"],
+                        help="day numbers, or aoc for the aoc modules")
+    parser.add_argument("-k", dest="keyword", default="",
+                        help="only run tests whose name contains this")
+    parser.add_argument("--quick", action="store_true",
+                        help="skip the slow tests")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    passed, failed = 0, 0
+    for name, directory, test in collect(args.targets):
+        if args.keyword not in name or (args.quick and name in SLOW):
+            continue
+        outcome = run_test(name, directory, test)
+        if outcome.error is None:
+            passed += 1
+            print("{:<50} ok    {:7.2f}s".format(name, outcome.wall), flush=True)
+        else:
+            failed += 1
+            print("{:<50} FAIL  {:7.2f}s\n{}".format(
+                name, outcome.wall, outcome.error), flush=True)
+
+    print("{} passed, {} failed in {:.1f}s".format(
+        passed, failed, time.perf_counter() - start))
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
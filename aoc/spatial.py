@@ -0,0 +1,299 @@
+"""
+A bucket index over integer points in any number of dimensions, for
+Manhattan-distance queries that would otherwise scan every point.
+
+    index = SpatialIndex(points)
+    index.nearest((x, y), 2)        # [(distance, i), (distance, j)]
+    index.within(point, 3)          # indices of the points at most 3 away
+    index.count_within(point, r)    # how many of them, without listing them
+    index.add(point)                # one more point, as points arrive
+
+Points are grouped into cubic buckets `cell` units wide, kept in a dict by
+bucket coordinates, so only occupied buckets take memory. A query visits the
+buckets that overlap it; a bucket entirely inside a radius is counted
+without looking at its points, and one entirely outside is skipped.
+
+Nearest lookups gather their candidates once per bucket of the query and
+reuse them for later queries in the same bucket, which suits scans over a
+grid. A badly chosen `cell` costs speed, never correctness. The default
+leaves about one point per four buckets, which keeps those candidate lists
+short. Radius queries of a fixed radius r do well with cells about r wide.
+"""
+import heapq
+import itertools
+from array import array
+from collections import defaultdict
+from itertools import repeat
+from operator import add, sub
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+Point = Tuple[int, ...]
+Key = Tuple[int, ...]
+# Point indices in increasing order and their coordinates, one array per axis.
+Candidates = Tuple[List[int], List[array]]
+
+
+def distance(a: Sequence[int], b: Sequence[int]) -> int:
+
+    return sum(map(abs, map(sub, a, b)))
+
+
+def default_cell(points: Sequence[Point], per_bucket: float = 0.25) -> int:
+
+    if not points:
+        return 1
+    volume = 1
+    for axis in zip(*points):
+        volume *= max(axis) - min(axis) + 1
+
+    return max(1, round((volume * per_bucket / len(points))
+                        ** (1 / len(points[0]))))
+
+
+class SpatialIndex:
+
+    def __init__(
+        self,
+        points: Sequence[Sequence[int]],
+        cell: Optional[int] = None
+        ) -> None:
+
+        self.points: List[Point] = [tuple(point) for point in points]
+        self.cell = cell or default_cell(self.points)
+        self.buckets: Dict[Key, List[int]] = defaultdict(list)
+        for i, point in enumerate(self.points):
+            self.buckets[self.key(point)].append(i)
+        self.buckets = dict(self.buckets)
+
+        keys = list(self.buckets)
+        self.low = tuple(map(min, zip(*keys))) if keys else ()
+        self.high = tuple(map(max, zip(*keys))) if keys else ()
+        self._rings: List[List[Key]] = []
+        self._cache: Dict[Tuple[Key, int], Candidates] = dict()
+
+    def __len__(self) -> int:
+
+        return len(self.points)
+
+    def add(self, point: Sequence[int]) -> int:
+        """
+        Adds a point and returns its index. Cached candidates for nearest
+        are dropped, since the new point may be among them.
+        """
+        i = len(self.points)
+        self.points.append(tuple(point))
+        key = self.key(point)
+        self.buckets.setdefault(key, []).append(i)
+        if self.low:
+            self.low = tuple(map(min, self.low, key))
+            self.high = tuple(map(max, self.high, key))
+        else:
+            self.low = self.high = key
+        self._cache.clear()
+
+        return i
+
+    def key(self, point: Sequence[int]) -> Key:
+
+        c = self.cell
+
+        return tuple(x // c for x in point)
+
+    def gap(self, point: Sequence[int], key: Key) -> int:
+        """
+        Smallest distance from point to any place in a bucket.
+        """
+        c = self.cell
+
+        return sum(max(0, k * c - x, x - k * c - c + 1)
+                   for x, k in zip(point, key))
+
+    def span(self, point: Sequence[int], key: Key) -> int:
+        """
+        Largest distance from point to any place in a bucket.
+        """
+        c = self.cell
+
+        return sum(max(x - k * c, k * c + c - 1 - x)
+                   for x, k in zip(point, key))
+
+    def _near(
+        self,
+        point: Sequence[int],
+        radius: int
+        ) -> Iterator[Tuple[Key, List[int]]]:
+        """
+        Occupied buckets that overlap the box around point, enumerating
+        either the box or the buckets, whichever is smaller.
+        """
+        low = self.key([x - radius for x in point])
+        high = self.key([x + radius for x in point])
+
+        boxes = 1
+        for lo, hi in zip(low, high):
+            boxes *= hi - lo + 1
+            if boxes > len(self.buckets):
+                break
+
+        if boxes > len(self.buckets):
+            for key, members in self.buckets.items():
+                if all(lo <= k <= hi for lo, k, hi in zip(low, key, high)):
+                    yield key, members
+            return
+
+        for key in itertools.product(
+                *(range(lo, hi + 1) for lo, hi in zip(low, high))):
+            members = self.buckets.get(key)
+            if members is not None:
+                yield key, members
+
+    def within(self, point: Sequence[int], radius: int) -> List[int]:
+        """
+        Indices of the points at most radius away, in no particular order.
+        """
+        points = self.points
+        result: List[int] = []
+        for key, members in self._near(point, radius):
+            if self.gap(point, key) > radius:
+                continue
+            if self.span(point, key) <= radius:
+                result.extend(members)
+                continue
+            result.extend(
+                i for i in members if distance(points[i], point) <= radius)
+
+        return result
+
+    def count_within(self, point: Sequence[int], radius: int) -> int:
+
+        points = self.points
+        count = 0
+        for key, members in self._near(point, radius):
+            if self.gap(point, key) > radius:
+                continue
+            if self.span(point, key) <= radius:
+                count += len(members)
+                continue
+            count += sum(
+                distance(points[i], point) <= radius for i in members)
+
+        return count
+
+    def _ring(self, r: int) -> List[Key]:
+        """
+        Offsets of the buckets at Chebyshev distance r from a bucket.
+        """
+        rings = self._rings
+        while len(rings) <= r:
+            n = len(rings)
+            rings.append([
+                offset for offset in itertools.product(
+                    range(-n, n + 1), repeat=len(self.low))
+                if max(map(abs, offset)) == n
+            ])
+
+        return rings[r]
+
+    def _candidates(self, centre: Key, count: int) -> Candidates:
+        """
+        Points that include the count nearest of any place in the bucket at
+        centre, with their coordinates by axis: the rings of buckets around
+        it up to where the rest cannot come closer.
+        """
+        cached = self._cache.get((centre, count))
+        if cached is not None:
+            return cached
+
+        buckets, c = self.buckets, self.cell
+        last = max((max(abs(k - lo), abs(k - hi))
+                    for k, lo, hi in zip(centre, self.low, self.high)),
+                   default=-1)
+
+        ids: List[int] = []
+        for r in range(last + 1):
+            for offset in self._ring(r):
+                ids.extend(buckets.get(tuple(map(add, centre, offset)), ()))
+            if len(ids) < count:
+                continue
+            # Anything outside the rings so far is more than r * c from
+            # every place in the bucket.
+            spans = sorted(self.span(self.points[i], centre) for i in ids)
+            if spans[count - 1] <= r * c:
+                break
+
+        ids.sort()
+        cached = (ids, [array("q", axis) for axis in
+                        zip(*(self.points[i] for i in ids))])
+        self._cache[centre, count] = cached
+
+        return cached
+
+    def nearest(self, point: Sequence[int], count: int = 1
+        ) -> List[Tuple[int, int]]:
+        """
+        (distance, index) of the count nearest points, closest first and
+        ties by index. Asking for two tells whether the nearest is unique.
+        """
+        ids, axes = self._candidates(self.key(point), count)
+        if not ids:
+            return []
+
+        distances = [0] * len(ids)
+        for axis, x in zip(axes, point):
+            distances = list(map(
+                add, distances, map(abs, map(sub, axis, repeat(x)))))
+
+        if count == 1:
+            d = min(distances)
+            return [(d, ids[distances.index(d)])]
+
+        return heapq.nsmallest(count, zip(distances, ids))
+
+
+def test_within():
+
+    points = [(0, 0), (1, 2), (3, 0), (-2, -2), (10, 10), (0, 3)]
+    for cell in (1, 2, 5, 100):
+        index = SpatialIndex(points, cell)
+        assert sorted(index.within((0, 0), 3)) == [0, 1, 2, 5]
+        assert index.count_within((0, 0), 3) == 4
+        assert index.count_within((0, 0), 4) == 5
+        assert index.within((20, 20), 5) == []
+
+
+def test_nearest():
+
+    points = [(1, 1), (1, 6), (8, 3), (3, 4), (5, 5), (8, 9)]
+    for cell in (1, 3, None):
+        index = SpatialIndex(points, cell)
+        assert index.nearest((0, 0)) == [(2, 0)]
+        # (0, 4) is 3 from both (1, 6) and (3, 4): a tie.
+        assert index.nearest((0, 4), 2) == [(3, 1), (3, 3)]
+        assert index.nearest((100, 100), 2) == [(183, 5), (189, 2)]
+        assert len(index.nearest((0, 0), 10)) == 6
+
+
+def test_add():
+
+    points = [(0, 0), (1, 2), (3, 0), (-2, -2), (10, 10), (0, 3)]
+    index = SpatialIndex([], 2)
+    for i, point in enumerate(points):
+        assert index.add(point) == i
+        assert index.nearest(point) == [(0, i)]
+
+    assert sorted(index.within((0, 0), 3)) == [0, 1, 2, 5]
+    assert index.nearest((9, 9), 2) == [(2, 4), (15, 1)]
+
+
+def test_four_dimensions():
+
+    points = [(x, y, z, w) for x in range(-2, 3) for y in range(-2, 3)
+              for z in range(-2, 3) for w in range(-2, 3)]
+    index = SpatialIndex(points, 3)
+
+    for point in [(0, 0, 0, 0), (2, -2, 1, 0), (5, 5, 5, 5)]:
+        expected = sorted(
+            i for i, p in enumerate(points) if distance(p, point) <= 3)
+        assert sorted(index.within(point, 3)) == expected
+        assert index.count_within(point, 3) == len(expected)
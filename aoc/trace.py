@@ -0,0 +1,459 @@
+"""
+Compact binary event traces of the round-based simulations (the day 15
+combat, the day 13 carts and the day 24 immune system), and a replayer that
+rebuilds the state at any round without running the simulation again.
+
+    python -m aoc.trace record 15 1 combat.trace          # solve, tracing
+    python -m aoc.trace show combat.trace --round 30      # board and events
+    python -m aoc.trace show combat.trace --run -1 --events-only
+
+    with recording("combat.trace"):
+        solve("input.txt")
+    replay = Replay("combat.trace")
+    state = replay.state(30, apply_event)
+
+A simulation asks for a recorder with `start()` when it begins, which is
+None unless a recording is active, so untraced runs pay one test per event.
+Every event is a kind and four integers in 17 bytes: a position as a flat
+Grid index, a group number, damage or hit points. Each `round(n, snapshot)`
+marks the start of round n, and every `every` rounds, and at the end, the
+state from `snapshot()` is stored as a pickle of plain data beside the
+events.
+
+Replaying round n loads the last snapshot at or before it and applies the
+events after it with the day's `apply_event(state, event)`. A file holds
+one run per simulation started, so the power search of day 15 part 2 keeps
+every battle it tried. An index of the runs and snapshots at the end of the
+file lets the replayer seek straight to them; a trace cut short by a crash
+has no index and is scanned instead.
+"""
+import contextlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+from typing import (
+    Any, BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional,
+    Tuple)
+
+
+MAGIC = b"AOC-TRACE 1\n"
+
+# Rounds between snapshots.
+EVERY = 50
+
+# Records that structure the file.
+RUN = 0         # (run number): a simulation starts
+ROUND = 1       # (round): the events that follow belong to this round
+SNAPSHOT = 2    # (round, size): the state at the start of the round follows
+INDEX = 3       # (size): the index of runs and snapshots follows
+
+# Events of the simulations.
+MOVE = 8        # (from, to, symbol, turn): a unit or cart moves
+ATTACK = 9      # (attacker, target, damage, hit points or units left)
+DEATH = 10      # (unit): a unit or group dies
+CRASH = 11      # (position): carts collide
+REMOVE = 12     # (position): a crashed cart is taken off the track
+TARGET = 13     # (attacker, target): a group picks a target, -1 for none
+
+NAMES = {
+    RUN: "run", ROUND: "round", SNAPSHOT: "snapshot", INDEX: "index",
+    MOVE: "move", ATTACK: "attack", DEATH: "death", CRASH: "crash",
+    REMOVE: "remove", TARGET: "target",
+}
+
+_RECORD = struct.Struct("<Biiii")
+_FOOTER = struct.Struct("<Q")
+_FLUSH = 1 << 16
+
+
+class Event(NamedTuple):
+
+    round: int
+    kind: int
+    a: int = 0
+    b: int = 0
+    c: int = 0
+    d: int = 0
+
+    def __str__(self) -> str:
+
+        return "{:>6} {:<8} {} {} {} {}".format(
+            self.round, NAMES.get(self.kind, self.kind),
+            self.a, self.b, self.c, self.d)
+
+
+class Recorder:
+
+    def __init__(
+        self,
+        f: BinaryIO,
+        every: int = EVERY,
+        meta: Optional[Dict[str, Any]] = None
+        ) -> None:
+
+        self.f = f
+        self.every = every
+        self.runs: List[int] = []
+        self.snapshots: List[Tuple[int, int, int]] = []
+        self._buffer = bytearray()
+        self._offset = 0
+
+        header = pickle.dumps(meta or dict())
+        self._write(MAGIC + _FOOTER.pack(len(header)) + header)
+
+    def _write(self, data: bytes) -> None:
+
+        self._buffer += data
+        self._offset += len(data)
+        if len(self._buffer) >= _FLUSH:
+            self.f.write(self._buffer)
+            self._buffer.clear()
+
+    def event(self, kind: int, a: int = 0, b: int = 0, c: int = 0,
+              d: int = 0) -> None:
+
+        self._buffer += _RECORD.pack(kind, a, b, c, d)
+        self._offset += _RECORD.size
+        if len(self._buffer) >= _FLUSH:
+            self.f.write(self._buffer)
+            self._buffer.clear()
+
+    def run(self) -> "Recorder":
+
+        self.runs.append(self._offset)
+        self.event(RUN, len(self.runs) - 1)
+
+        return self
+
+    def snapshot(self, number: int, state: Any) -> None:
+
+        data = pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+        self.snapshots.append((len(self.runs) - 1, number, self._offset))
+        self.event(SNAPSHOT, number, len(data))
+        self._write(data)
+
+    def round(self, number: int, snapshot: Callable[[], Any]) -> None:
+
+        self.event(ROUND, number)
+        if number % self.every == 0:
+            self.snapshot(number, snapshot())
+
+    def end(self, number: int, snapshot: Callable[[], Any]) -> None:
+        """
+        Marks the end of the run after `number` rounds, with its final
+        state.
+        """
+        self.event(ROUND, number)
+        self.snapshot(number, snapshot())
+
+    def flush(self) -> None:
+
+        self.f.write(self._buffer)
+        self._buffer.clear()
+        self.f.flush()
+
+    def close(self) -> None:
+
+        offset = self._offset
+        data = pickle.dumps((self.runs, self.snapshots))
+        self.event(INDEX, len(data))
+        self._write(data + _FOOTER.pack(offset))
+        self.flush()
+
+
+_active: Optional[Recorder] = None
+
+
+@contextlib.contextmanager
+def recording(
+    path: str,
+    every: int = EVERY,
+    **meta: Any
+    ) -> Iterator[Recorder]:
+    """
+    Traces every simulation started inside the block to the file at path.
+    """
+    global _active
+
+    previous = _active
+    with open(path, "wb") as f:
+        recorder = Recorder(f, every, meta)
+        _active = recorder
+        try:
+            yield recorder
+        finally:
+            _active = previous
+            # Whatever was recorded before an error is kept, without the
+            # index, for the post-mortem.
+            if sys.exc_info()[0] is None:
+                recorder.close()
+            else:
+                recorder.flush()
+
+
+def start() -> Optional[Recorder]:
+    """
+    A recorder for a simulation that is starting, or None if nothing is
+    being recorded.
+    """
+    return _active.run() if _active is not None else None
+
+
+class Replay:
+
+    def __init__(self, path: str) -> None:
+
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self.data = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                         if size else b"")
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a trace".format(path))
+
+        start = len(MAGIC) + _FOOTER.size
+        (length,) = _FOOTER.unpack_from(self.data, len(MAGIC))
+        self.meta: Dict[str, Any] = pickle.loads(
+            self.data[start:start + length])
+        self.start = start + length
+
+        # Offsets of the RUN records, and (run, round, offset) of every
+        # snapshot.
+        self.runs: List[int] = []
+        self.snapshots: List[Tuple[int, int, int]] = []
+        self.complete = self._read_index()
+        if not self.complete:
+            self._scan()
+
+    def _read_index(self) -> bool:
+
+        data = self.data
+        if len(data) < self.start + _RECORD.size + _FOOTER.size:
+            return False
+        (offset,) = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if not self.start <= offset <= len(data) - _RECORD.size:
+            return False
+        kind, size = _RECORD.unpack_from(data, offset)[:2]
+        end = offset + _RECORD.size + size
+        if kind != INDEX or end + _FOOTER.size != len(data):
+            return False
+
+        self.runs, self.snapshots = pickle.loads(
+            data[offset + _RECORD.size:end])
+
+        return True
+
+    def _scan(self) -> None:
+
+        for offset, kind, a, _, _, _ in self._records(self.start):
+            if kind == RUN:
+                self.runs.append(offset)
+            elif kind == SNAPSHOT:
+                self.snapshots.append((len(self.runs) - 1, a, offset))
+
+    def _records(
+        self,
+        offset: int,
+        snapshots: bool = False
+        ) -> Iterator[Tuple[int, int, int, int, int, int]]:
+        """
+        (offset, kind, a, b, c, d) of the records from offset on, skipping
+        over the contents of snapshots.
+        """
+        data, size = self.data, _RECORD.size
+        while offset + size <= len(data):
+            kind, a, b, c, d = _RECORD.unpack_from(data, offset)
+            if kind == INDEX:
+                return
+            yield offset, kind, a, b, c, d
+            offset += size
+            if kind == SNAPSHOT:
+                offset += b
+
+    def _run(self, run: int) -> int:
+
+        if not self.runs:
+            raise ValueError("the trace has no runs")
+
+        return range(len(self.runs))[run]
+
+    def _load(self, offset: int) -> Any:
+
+        size = _RECORD.unpack_from(self.data, offset)[2]
+        start = offset + _RECORD.size
+
+        return pickle.loads(self.data[start:start + size])
+
+    def rounds(self, run: int = -1) -> int:
+        """
+        Round the run ended on, or the last it began if it was cut short.
+        """
+        run = self._run(run)
+        last = self._closest(run, None)[0]
+        for event in self.events(run, last):
+            if event.kind == ROUND:
+                last = event.round
+
+        return last
+
+    def _closest(self, run: int, number: Optional[int]) -> Tuple[int, int]:
+        """
+        (round, offset) of the last snapshot of run at or before round
+        number, or of the start of the run if there is none.
+        """
+        best = (0, self.runs[run])
+        for r, n, offset in self.snapshots:
+            if r == run and (number is None or n <= number) and n >= best[0]:
+                best = (n, offset)
+
+        return best
+
+    def events(
+        self,
+        run: int = -1,
+        start: int = 0,
+        stop: Optional[int] = None
+        ) -> Iterator[Event]:
+        """
+        Events of rounds start to stop - 1 of a run, with the ROUND records
+        between them.
+        """
+        run = self._run(run)
+        number, offset = self._closest(run, start)
+        for _, kind, a, b, c, d in self._records(offset):
+            if kind == RUN and a != run:
+                return
+            if kind == ROUND:
+                number = a
+            if stop is not None and number >= stop:
+                return
+            if number >= start and kind not in (RUN, SNAPSHOT):
+                yield Event(number, kind, a, b, c, d)
+
+    def state(
+        self,
+        number: int,
+        apply: Callable[[Any, Event], Any],
+        run: int = -1
+        ) -> Any:
+        """
+        State at the start of round number, built from the last snapshot
+        before it; apply(state, event) returns the state after an event.
+        """
+        run = self._run(run)
+        first, offset = self._closest(run, number)
+        if offset == self.runs[run]:
+            raise ValueError("run {} has no snapshot before round {}".format(
+                run, number))
+
+        state = self._load(offset)
+        for event in self.events(run, first, number):
+            if event.kind != ROUND:
+                state = apply(state, event)
+
+        return state
+
+
+def test_round_trip():
+
+    import tempfile
+
+    # A counter that adds the value of each MOVE, one a round.
+    def apply(state, event):
+        return state + event.c if event.kind == MOVE else state
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "counter.trace")
+        with recording(path, every=4, day=0):
+            for run in range(2):
+                recorder = start()
+                total = 0
+                for n in range(10):
+                    recorder.round(n, lambda: total)
+                    recorder.event(MOVE, 0, 0, n + run)
+                    total += n + run
+                recorder.end(10, lambda: total)
+        assert start() is None
+
+        replay = Replay(path)
+        assert replay.complete and replay.meta == {"day": 0}
+        assert len(replay.runs) == 2
+        assert [n for r, n, _ in replay.snapshots] == [0, 4, 8, 10] * 2
+        assert replay.state(6, apply, run=0) == sum(range(6))
+        assert replay.state(7, apply) == sum(range(1, 8))
+        assert replay.state(10, apply) == sum(range(1, 11))
+        assert replay.rounds() == 10
+        assert [e.c for e in replay.events(0, 3, 5) if e.kind == MOVE] == [3, 4]
+
+        # Cut short: no index, so the runs are found by scanning.
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:replay.runs[1] + 200])
+        replay = Replay(path)
+        assert not replay.complete and len(replay.runs) == 2
+        assert replay.state(6, apply, run=0) == sum(range(6))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    import argparse
+
+    from aoc.runner import day_directory, load_day, working_directory
+    # Run as a script this module is __main__, but the solvers import
+    # aoc.trace and look for the recording there.
+    from aoc import trace
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="solve a part, tracing it")
+    record.add_argument("day", type=int)
+    record.add_argument("part", type=int)
+    record.add_argument("trace")
+    record.add_argument("--input", default="input.txt",
+                        help="input file name inside the day folder")
+    record.add_argument("--every", type=int, default=EVERY,
+                        help="rounds between snapshots")
+
+    show = commands.add_parser("show", help="print the state and events")
+    show.add_argument("trace")
+    show.add_argument("--run", type=int, default=-1,
+                      help="simulation in the trace, -1 for the last")
+    show.add_argument("--round", type=int,
+                      help="round to show, by default the last")
+    show.add_argument("--events-only", action="store_true",
+                      help="list every event of the run instead")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        path = os.path.abspath(args.trace)
+        module = load_day(args.day, [args.part])[args.part]
+        with working_directory(day_directory(args.day)), \
+             trace.recording(path, args.every, day=args.day, part=args.part):
+            answer = module.solve(args.input)
+        print("answer:", answer)
+        print("{} runs, {} bytes".format(
+            len(trace.Replay(path).runs), os.path.getsize(path)))
+        return 0
+
+    replay = trace.Replay(args.trace)
+    if args.events_only:
+        for event in replay.events(args.run):
+            print(event)
+        return 0
+
+    number = replay.rounds(args.run) if args.round is None else args.round
+    module = load_day(replay.meta["day"], [1])[1]
+    state = replay.state(number, module.apply_event, args.run)
+    print("\n".join(module.draw_state(state)))
+    for event in replay.events(args.run, number, number + 1):
+        print(event)
+
+    return 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Disjoint sets over the integers 0 to n - 1, for grouping things that are
+connected, such as points close enough to be in one constellation.
+
+    sets = UnionFind(len(points))
+    sets.union(i, j)                # i and j are connected
+    sets.find(i) == sets.find(j)    # whether they are in the same group
+    sets.components                 # how many groups there are
+    k = sets.add()                  # a new element, in a group of its own
+
+Parents, ranks and group sizes are kept in flat arrays indexed by element.
+Unions attach the root of lower rank under the other, and `find` halves the
+path it walks by pointing every other node at its grandparent, so any
+sequence of operations takes near-linear time. Elements can be added at any
+time, which suits inputs that arrive one item at a time.
+"""
+from array import array
+from typing import Dict, List
+
+
+class UnionFind:
+
+    def __init__(self, size: int = 0) -> None:
+
+        self.parent = array("q", range(size))
+        self.rank = bytearray(size)
+        self.sizes = array("q", [1]) * size
+        self.components = size
+
+    def __len__(self) -> int:
+
+        return len(self.parent)
+
+    def add(self) -> int:
+
+        i = len(self.parent)
+        self.parent.append(i)
+        self.rank.append(0)
+        self.sizes.append(1)
+        self.components += 1
+
+        return i
+
+    def find(self, i: int) -> int:
+
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+
+        return i
+
+    def union(self, i: int, j: int) -> bool:
+        """
+        Joins the groups of i and j; False if they were already one.
+        """
+        i, j = self.find(i), self.find(j)
+        if i == j:
+            return False
+
+        rank = self.rank
+        if rank[i] < rank[j]:
+            i, j = j, i
+        self.parent[j] = i
+        self.sizes[i] += self.sizes[j]
+        if rank[i] == rank[j]:
+            rank[i] += 1
+        self.components -= 1
+
+        return True
+
+    def connected(self, i: int, j: int) -> bool:
+
+        return self.find(i) == self.find(j)
+
+    def size(self, i: int) -> int:
+        """
+        Number of elements in the group of i.
+        """
+        return self.sizes[self.find(i)]
+
+    def groups(self) -> List[List[int]]:
+        """
+        Elements of every group in increasing order, the groups ordered by
+        their smallest element.
+        """
+        members: Dict[int, List[int]] = dict()
+        for i in range(len(self.parent)):
+            members.setdefault(self.find(i), []).append(i)
+
+        return list(members.values())
+
+
+def test_union_find():
+
+    sets = UnionFind(6)
+    assert sets.components == 6
+
+    assert sets.union(0, 1) and sets.union(2, 3) and sets.union(1, 3)
+    assert not sets.union(0, 2)
+    assert sets.connected(0, 3) and not sets.connected(0, 4)
+    assert sets.components == 3
+    assert sets.size(2) == 4 and sets.size(5) == 1
+    assert sets.groups() == [[0, 1, 2, 3], [4], [5]]
+
+
+def test_add():
+
+    sets = UnionFind()
+    for i in range(100):
+        assert sets.add() == i
+        if i % 10:
+            sets.union(i - 1, i)
+
+    assert sets.components == 10
+    assert len(sets) == 100
+    assert all(len(group) == 10 for group in sets.groups())
+
+    # A long chain still leaves short paths behind.
+    chain = UnionFind(1000)
+    for i in range(999):
+        chain.union(i + 1, i)
+    root = chain.find(0)
+    assert all(chain.find(i) == root for i in range(1000))
+    assert max(chain.rank) <= 10
@@ -0,0 +1,41 @@
+"""
+Generates frequency change lists for day 1 at a chosen size.
+
+    python generate.py 100000 > big.txt
+
+The changes are shuffled so that the net drift per pass is about half the
+number of changes, which guarantees that some frequency is reached twice.
+"""
+import random
+import sys
+
+
+SIZES = [1000, 10000, 100000, 1000000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+
+    changes = [rng.choice([-1, 1]) * rng.randint(1, 20) for _ in range(size)]
+    changes[-1] += max(1, size // 2) - sum(changes)
+    changes = [x if x != 0 else 1 for x in changes]
+
+    return ''.join("{:+d}\n".format(x) for x in changes)
+
+
+def test_generate():
+
+    text = generate(100, seed=1)
+    changes = [int(line) for line in text.split()]
+
+    assert text == generate(100, seed=1)
+    assert len(changes) == 100
+    assert sum(changes) > 0
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -48,24 +48,30 @@ Here are other example situations:
 Starting with a frequency of zero, what is the resulting frequency after all of
 the changes in frequency have been applied?
 """
-from typing import List
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import Iterable, Iterator, Sequence
 
-def read_input(filename: str) -> List[int]:
+from aoc.inputs import Source, integer_blocks, integers
+
+
+def iter_input(filename: Source) -> Iterator[int]:
     """
-    Reads file, e.g. input.txt, which has one number on each line.
+    Reads file, e.g. input.txt, which has one number on each line, yielding
+    the numbers as they are read.
     """
-    result = []
+    for block in integer_blocks(filename):
+        yield from block
+
 
-    with open(filename) as f:
-        for line in f:
-            s = line.strip()
-            result.append(int(s))
+def read_input(filename: Source) -> Sequence[int]:
 
-    return result
+    return integers(filename)
 
 
-def end_frequency(frequencies: List[int]) -> int:
+def end_frequency(frequencies: Iterable[int]) -> int:
 
     return sum(frequencies)
 
@@ -78,10 +84,16 @@ def test_end_frequency() -> None:
     assert end_frequency([-1, -2, -3]) == -6
 
 
+def solve(filename: Source) -> int:
+
+    return end_frequency(iter_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_end_frequency()
-    print("passed all tests.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_end_frequency()
+        print("passed all tests.")
 
-    answer = end_frequency(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -31,23 +31,148 @@ Here are other examples:
 
 What is the first frequency your device reaches twice?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 import itertools
-from typing import List
-from part1 import read_input
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from part1 import end_frequency, read_input
+
+from aoc.inputs import Source
+
+
+def repeat_across_passes(sums: Sequence[int], drift: int) -> Optional[int]:
+    """
+    First frequency reached twice when the frequencies of the first pass,
+    sums, are all different and every pass moves them by drift; None if no
+    frequency is ever reached twice.
+    """
+    if drift == 0:
+        return sums[0] if sums else None
+
+    # Frequency i of a pass meets frequency j of the first one only if they
+    # differ by a multiple of the drift, and it meets the nearest of them in
+    # the direction of the drift first.
+    step, sign = abs(drift), (1 if drift > 0 else -1)
+    classes = sorted((x % step, x * sign, i) for i, x in enumerate(sums))
+
+    n = len(sums)
+    first: Optional[int] = None
+    time = 0
+    for (r, x, i), (s, y, _) in zip(classes, classes[1:]):
+        if r != s:
+            continue
+        t = (y - x) // step * n + i
+        if first is None or t < time:
+            first, time = y * sign, t
+
+    return first
+
+
+class FrequencyTracker:
+    """
+    End frequency and first frequency reached twice of a list of changes
+    that grows in batches, each batch adding to what is known so far.
+
+    The frequencies of the first pass are kept sorted, and each batch finds
+    the first of them to meet another in one scan, as it goes through them
+    in the order the drift moves them with the last one seen of each residue
+    modulo the drift. A batch either reaches a frequency twice or changes
+    the drift, which every residue depends on, so each scans them all; but
+    sorting only merges the batch in, O(n + b log b), and asking is O(1).
+    """
+
+    def __init__(self, frequencies: Iterable[int] = ()) -> None:
+
+        self.changes = 0
+        self.end_frequency = 0
+        # Frequencies of the first pass, kept until one is reached twice.
+        self.sums: List[int] = []
+        self.seen = {0}
+        self.repeat: Optional[int] = None
+        # The frequencies with their positions, sorted up to the last batch.
+        self._sorted: List[Tuple[int, int]] = []
+        # Passes and position of the first frequency to meet another, and
+        # the frequency they meet at.
+        self._first: Optional[Tuple[int, int, int]] = None
+        self.extend(frequencies)
+
+    def __len__(self) -> int:
+
+        return self.changes
+
+    def extend(self, frequencies: Iterable[int]) -> None:
+
+        added = len(self.sums)
+        for freq in frequencies:
+            frequency = self.end_frequency
+            self.end_frequency += freq
+            self.changes += 1
+            if self.repeat is not None:
+                continue
+            self.sums.append(frequency)
+            if self.end_frequency in self.seen:
+                # No later change can come before this, so the rest of the
+                # first pass is no longer needed.
+                self.repeat = self.end_frequency
+                self.sums, self.seen = [], set()
+                self._sorted, self._first = [], None
+            else:
+                self.seen.add(self.end_frequency)
+
+        if self.repeat is None and len(self.sums) > added:
+            self._scan(added)
+
+    def _scan(self, added: int) -> None:
+        """
+        Merges in the frequencies from position added on and finds the
+        first to meet another under the new drift.
+        """
+        self._sorted.extend(
+            zip(self.sums[added:], range(added, len(self.sums))))
+        # The sorted run and the batch are merged, not sorted afresh.
+        self._sorted.sort()
+        self._first = None
+        drift = self.end_frequency
+        if drift == 0:
+            return
 
+        # Frequency i meets the nearest one of its residue ahead of it
+        # first, after as many passes as drifts between them. Passes count
+        # for more than positions, whatever the length of the list.
+        step, sign = abs(drift), (1 if drift > 0 else -1)
+        last: Dict[int, Tuple[int, int]] = dict()
+        for y, j in (self._sorted if sign > 0 else reversed(self._sorted)):
+            behind = last.get(y % step)
+            if behind is not None:
+                first = ((y - behind[0]) * sign // step, behind[1], y)
+                if self._first is None or first < self._first:
+                    self._first = first
+            last[y % step] = (y, j)
 
-def first_frequency_reached_twice(frequencies: List[int]) -> int:
+    def first_frequency_reached_twice(self) -> Optional[int]:
+        """
+        First frequency reached twice when the changes so far repeat, None
+        if none ever is.
+        """
+        if self.repeat is not None:
+            return self.repeat
+        if not self.sums:
+            return 0
+        if self.end_frequency == 0:
+            return self.sums[0]
 
-    next_frequency = 0
-    seen = set([next_frequency])
+        return None if self._first is None else self._first[2]
 
-    for freq in itertools.cycle(frequencies):
-        next_frequency += freq
-        if next_frequency in seen:
-            return next_frequency
-        seen.add(next_frequency)
 
-    return next_frequency
+def first_frequency_reached_twice(frequencies: Iterable[int]) -> int:
+
+    first = FrequencyTracker(frequencies).first_frequency_reached_twice()
+    if first is None:
+        raise ValueError("no frequency is reached twice")
+
+    return first
 
 
 def test_first_frequency_reached_twice():
@@ -59,10 +184,77 @@ def test_first_frequency_reached_twice():
     assert first_frequency_reached_twice([7, 7, -2, -7, -4]) == 14
 
 
+def test_repeat_across_passes():
+
+    import random
+
+    def simulate(frequencies, steps=10000):
+        frequency, seen = 0, {0}
+        for freq in itertools.islice(itertools.cycle(frequencies), steps):
+            frequency += freq
+            if frequency in seen:
+                return frequency
+            seen.add(frequency)
+        return None
+
+    rng = random.Random(1)
+    for _ in range(300):
+        frequencies = [rng.randint(-9, 9) for _ in range(rng.randint(1, 8))]
+        try:
+            first = first_frequency_reached_twice(frequencies)
+        except ValueError:
+            first = None
+        assert first == simulate(frequencies)
+
+    # A million passes, each a step closer to 0.
+    assert first_frequency_reached_twice([-999999, 1000000]) == 0
+    assert repeat_across_passes([0, 1], 2) is None
+
+
+def test_frequency_tracker():
+
+    import random
+
+    rng = random.Random(2)
+    for _ in range(200):
+        frequencies = [rng.randint(-9, 9) for _ in range(rng.randint(1, 20))]
+        batch = rng.choice([1, 3])
+        tracker = FrequencyTracker()
+        for start in range(0, len(frequencies), batch):
+            tracker.extend(frequencies[start:start + batch])
+            so_far = frequencies[:start + batch]
+            assert tracker.end_frequency == end_frequency(so_far)
+            try:
+                expected = first_frequency_reached_twice(so_far)
+            except ValueError:
+                expected = None
+            assert tracker.first_frequency_reached_twice() == expected
+
+    # An empty batch leaves everything as it was.
+    tracker = FrequencyTracker([1, -2, 3, 1])
+    tracker.extend([])
+    assert tracker.first_frequency_reached_twice() == 2
+
+    tracker = FrequencyTracker([3])
+    assert tracker.first_frequency_reached_twice() is None
+    tracker.extend([4, -4])
+    assert tracker.first_frequency_reached_twice() == 3
+    assert tracker.end_frequency == 3 and len(tracker) == 3
+    assert not tracker.sums
+
+
+def solve(filename: Source) -> int:
+
+    return first_frequency_reached_twice(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_first_frequency_reached_twice()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_first_frequency_reached_twice()
+        test_repeat_across_passes()
+        test_frequency_tracker()
+        print("all tests passed.")
 
-    answer = first_frequency_reached_twice(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,50 @@
+"""
+Generates box ID lists for day 2 at a chosen size.
+
+    python generate.py 10000 > big.txt
+
+Exactly one pair of IDs differs by a single character; its position in the
+list is random.
+"""
+import random
+import string
+import sys
+
+
+SIZES = [250, 1000, 4000, 16000]
+
+
+def generate(size: int, seed: int = 0, length: int = 26) -> str:
+
+    rng = random.Random(seed)
+
+    boxes = [
+        ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        for _ in range(size - 1)
+    ]
+
+    twin = list(rng.choice(boxes))
+    i = rng.randrange(length)
+    twin[i] = rng.choice(string.ascii_lowercase.replace(twin[i], ''))
+    boxes.insert(rng.randrange(len(boxes) + 1), ''.join(twin))
+
+    return ''.join(box + '\n' for box in boxes)
+
+
+def test_generate():
+
+    boxes = generate(50, seed=2).split()
+
+    assert len(boxes) == 50
+    assert all(len(box) == 26 for box in boxes)
+    assert sum(
+        sum(c != d for c, d in zip(s, t)) == 1
+        for i, s in enumerate(boxes) for t in boxes[i + 1:]
+    ) == 1
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
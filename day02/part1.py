@@ -44,8 +44,25 @@ Multiplying these together produces a checksum of 4 * 3 = 12.
 
 What is the checksum for your list of box IDs?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import itertools
 from collections import Counter
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from aoc import backend
+from aoc.inputs import Source, line_blocks, open_input
+
+
+# Bytes of input counted by a worker at a time.
+BLOCK = 1 << 22
+
+# Blocks smaller than this are counted faster in Python than NumPy imports.
+SMALL = 1 << 16
+
+ALPHABET = b"abcdefghijklmnopqrstuvwxyz"
 
 
 def count(s: str) -> Tuple[int, int]:
@@ -62,7 +79,7 @@ def count(s: str) -> Tuple[int, int]:
     return twos, threes
 
 
-def checksum(boxes: List[str]) -> int:
+def checksum(boxes: Iterable[str]) -> int:
 
     twos = threes = 0
     for box in boxes:
@@ -72,6 +89,75 @@ def checksum(boxes: List[str]) -> int:
     return twos * threes
 
 
+@backend.dispatch
+def count_block(block: bytes) -> Tuple[int, int]:
+    """
+    Boxes among the lines of block with some letter exactly twice, and with
+    some letter exactly three times.
+    """
+    twos = threes = 0
+    for box in block.split():
+        counts = set(map(box.count, ALPHABET))
+        twos += 2 in counts
+        threes += 3 in counts
+
+    return twos, threes
+
+
+@count_block.register("numpy")
+def count_block_numpy(block: bytes) -> Tuple[int, int]:
+
+    if not block.endswith(b"\n"):
+        block += b"\n"
+    width = block.find(b"\n")
+    if len(block) < SMALL or width < 1 or len(block) % (width + 1):
+        return count_block.implementations["python"](block)
+    np = backend.numpy()
+    lines = np.frombuffer(block, dtype="B").reshape(-1, width + 1)
+    if (lines[:, width] != ord("\n")).any():
+        return count_block.implementations["python"](block)
+
+    # Sorted, a letter that appears k times is a run of k equal bytes; pad
+    # marks whether each byte equals the next, with False at both ends.
+    boxes = np.sort(lines[:, :width], axis=1)
+    pad = np.zeros((len(boxes), width + 2), dtype=bool)
+    pad[:, 2:width + 1] = boxes[:, 1:] == boxes[:, :-1]
+    same = pad[:, 1:-1]
+    two = same[:, 1:] & ~pad[:, 1:-2] & ~pad[:, 3:]
+    three = same[:, 1:-1] & same[:, 2:] & ~pad[:, 1:-3] & ~pad[:, 4:]
+
+    return int(two.any(axis=1).sum()), int(three.any(axis=1).sum())
+
+
+def checksum_blocks(
+    filename: Source,
+    workers: Optional[int] = None,
+    block: int = BLOCK
+    ) -> int:
+    """
+    The checksum of the boxes of a file, its blocks counted on a pool of
+    workers when there is more than one of either.
+    """
+    workers = workers or os.cpu_count() or 1
+    blocks = line_blocks(filename, block)
+    first = list(itertools.islice(blocks, 2))
+    blocks = itertools.chain(first, blocks)
+
+    if workers == 1 or len(first) < 2:
+        counts = map(count_block, blocks)
+    else:
+        # Only now, since the pool and the runner take a while to import.
+        from aoc.scheduler import map_blocks
+        counts = map_blocks(2, 1, "count_block", blocks, workers)
+
+    twos = threes = 0
+    for two, three in counts:
+        twos += two
+        threes += three
+
+    return twos * threes
+
+
 def test_count():
 
     assert count("abcdef") == (0, 0)
@@ -98,20 +184,57 @@ def test_checksum():
     assert checksum(example) == 12
 
 
-def read_input(filename: str) -> List[str]:
+def test_count_block():
+
+    example = b"abcdef\nbababc\nabbcde\nabcccd\naabcdd\nabcdee\nababab\n"
+
+    assert backend.compare(count_block, example) == (4, 3)
+    assert backend.compare(count_block, example[:-1]) == (4, 3)
+    assert backend.compare(count_block, b"aa\nbbb\nabcd\n") == (1, 1)
+    assert backend.compare(count_block, b"") == (0, 0)
+
+    text = backend.generated(2, 4000).read()
+    assert backend.compare(count_block, text.encode()) == \
+        tuple(map(sum, zip(*map(count, text.split()))))
+
+
+def test_checksum_blocks():
+
+    import io
+
+    text = backend.generated(2, 2000, seed=1).read()
+    expected = checksum(text.split())
+
+    assert checksum_blocks(io.StringIO(text)) == expected
+    assert checksum_blocks(io.StringIO(text), 1, 1000) == expected
+    assert checksum_blocks(io.StringIO(text), 2, 1000) == expected
 
-    result = []
-    with open(filename) as f:
+
+def iter_input(filename: Source) -> Iterator[str]:
+
+    with open_input(filename) as f:
         for line in f:
-            result.append(line.strip())
-    return result
+            yield line.strip()
+
+
+def read_input(filename: Source) -> List[str]:
+
+    return list(iter_input(filename))
+
+
+def solve(filename: Source) -> int:
+
+    return checksum_blocks(filename)
 
 
 if __name__ == "__main__":
 
-    test_count()
-    test_checksum()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_count()
+        test_checksum()
+        test_count_block()
+        test_checksum_blocks()
+        print("all tests passed.")
 
-    answer = checksum(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -23,9 +23,21 @@ What letters are common between the two correct box IDs? (In the example above,
 this is found by removing the differing character from either ID, producing
 fgij.)
 """
-import itertools
-from typing import List, Tuple
-from part1 import read_input
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+from part1 import iter_input
+
+from aoc import backend
+from aoc.hamming import HammingIndex
+from aoc.inputs import Source
+
+
+# Masks are hashed as polynomials in BASE modulo the Mersenne prime MODULUS.
+BASE = 257
+MODULUS = (1 << 61) - 1
 
 
 def distance(s: str, t: str) -> int:
@@ -38,13 +50,42 @@ def common_letters(s: str, t: str) -> str:
     return ''.join(c for c, d in zip(s, t) if c == d)
 
 
-def find_boxes(boxes: List[str]) -> Tuple[str, str]:
-
-    for box1, box2 in itertools.permutations(boxes, 2):
-        if distance(box1, box2) == 1:
-            return box1, box2
-
-    return '', ''
+def near_pairs(boxes: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Pairs of IDs that differ in exactly one position, each yielded as soon
+    as the second of them is read, the earlier one first.
+    """
+    # Every ID is filed under the hash of each of its masks, the ID with one
+    # position blanked out. Two IDs one apart share exactly one mask, so
+    # only IDs filed under the same hash are ever compared. The hash of the
+    # ID is a polynomial in BASE, so blanking position i only subtracts its
+    # term, and all the masks of an ID cost O(L) rather than O(L^2).
+    index: Dict[Tuple[int, int], Union[str, List[str]]] = dict()
+    powers = [1]
+    for box in boxes:
+        while len(powers) < len(box):
+            powers.append(powers[-1] * BASE % MODULUS)
+        terms = [ord(c) * p for c, p in zip(box, powers)]
+        whole = sum(terms)
+        for i, term in enumerate(terms):
+            key = (i, (whole - term) % MODULUS)
+            filed = index.get(key)
+            if filed is None:
+                index[key] = box
+                continue
+            group = [filed] if isinstance(filed, str) else filed
+            for other in group:
+                if len(other) == len(box) and distance(other, box) == 1:
+                    yield other, box
+            if isinstance(filed, str):
+                index[key] = [filed, box]
+            else:
+                filed.append(box)
+
+
+def find_boxes(boxes: Iterable[str]) -> Tuple[str, str]:
+
+    return next(near_pairs(boxes), ('', ''))
 
 
 def test_distance():
@@ -72,14 +113,45 @@ def test_find_boxes():
     ]
 
     assert find_boxes(example) == ("fghij", "fguij")
+    assert find_boxes([]) == ('', '')
+
+
+def test_near_pairs():
+
+    boxes = ["abcd", "abce", "abcd", "xbce", "abcf", "abc"]
+
+    assert list(near_pairs(boxes)) == [
+        ("abcd", "abce"), ("abce", "abcd"),
+        ("abce", "xbce"), ("abcd", "abcf"), ("abce", "abcf"), ("abcd", "abcf")
+    ]
+
+
+def test_hamming_index():
+
+    boxes = backend.generated(2, 500, seed=4).read().split()
+    index = HammingIndex(boxes, 2)
+
+    # Neither yields its pairs in any particular order.
+    assert sorted((boxes[i], boxes[j]) for i, j in index.pairs(1)) == \
+        sorted(near_pairs(boxes))
+    i, j = next(index.pairs(1))
+    assert index.within(boxes[i], 1) == [i, j]
+
+
+def solve(filename: Source) -> str:
+
+    return common_letters(*find_boxes(iter_input(filename)))
 
 
 if __name__ == "__main__":
 
-    test_distance()
-    test_common_letters()
-    test_find_boxes()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_distance()
+        test_common_letters()
+        test_find_boxes()
+        test_near_pairs()
+        test_hamming_index()
+        print("all tests passed.")
 
-    answer = common_letters(*find_boxes(read_input("input.txt")))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,51 @@
+"""
+Generates fabric claims for day 3 at a chosen size.
+
+    python generate.py 10000 > big.txt
+
+The fabric grows with the square root of the number of claims, so the
+density of overlapping squares stays close to the real input. One claim is
+placed outside the shared area so that it never overlaps.
+"""
+import math
+import random
+import sys
+
+
+SIZES = [1000, 4000, 16000, 64000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    side = int(28 * math.sqrt(size)) + 30
+
+    claims = []
+    for _ in range(size - 1):
+        width, height = rng.randint(5, 29), rng.randint(5, 29)
+        left = rng.randrange(side - width)
+        top = rng.randrange(side - height)
+        claims.append((left, top, width, height))
+
+    claims.insert(rng.randrange(len(claims) + 1), (side + 1, side + 1, 3, 3))
+
+    return ''.join(
+        "#{} @ {},{}: {}x{}\n".format(i + 1, *claim)
+        for i, claim in enumerate(claims)
+    )
+
+
+def test_generate():
+
+    lines = generate(100, seed=3).splitlines()
+
+    assert len(lines) == 100
+    assert all(line.startswith("#{} @ ".format(i + 1))
+        for i, line in enumerate(lines))
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
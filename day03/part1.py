@@ -61,7 +61,15 @@ while adjacent to the others, does not overlap either of them.)
 If the Elves all proceed with their own plans, none of them will have enough
 fabric. How many square inches of fabric are within two or more claims?
 """
-from typing import List, Tuple
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from typing import Iterator, List, Tuple
+
+from aoc import backend
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
 
 
 def max_width_height(
@@ -76,24 +84,50 @@ def max_width_height(
 
 def create_fabric(
     claims: List[Tuple[int, int, int, int]]
-    ) -> List[List[int]]:
+    ) -> Grid:
 
     width, height = max_width_height(claims)
 
-    return [[0] * width for _ in range(height)]
+    return Grid(height, width, typecode="H")
 
 
+@backend.dispatch
 def cover_fabric_with_claims(
     claims: List[Tuple[int, int, int, int]]
-    ) -> List[List[int]]:
+    ) -> Grid:
 
     fabric = create_fabric(claims)
+    cells = fabric.cells
 
     for claim in claims:
         left, top, width, height = claim
         for i in range(top, top + height):
-            for j in range(left, left + width):
-                fabric[i][j] += 1
+            start = fabric.index(i, left)
+            for j in range(start, start + width):
+                cells[j] += 1
+
+    return fabric
+
+
+@cover_fabric_with_claims.register("numpy")
+def cover_fabric_with_claims_numpy(
+    claims: List[Tuple[int, int, int, int]]
+    ) -> Grid:
+
+    np = backend.numpy()
+    fabric = create_fabric(claims)
+    left, top, width, height = np.array(claims, dtype=np.int64).T
+
+    # +1 where a claim starts and -1 where it ends, along both axes, so
+    # that summing along the rows and then the columns counts the claims.
+    edges = np.zeros((fabric.rows + 1, fabric.cols + 1), dtype=np.int32)
+    np.add.at(edges, (top, left), 1)
+    np.add.at(edges, (top, left + width), -1)
+    np.add.at(edges, (top + height, left), -1)
+    np.add.at(edges, (top + height, left + width), 1)
+    edges.cumsum(0, out=edges)
+    edges.cumsum(1, out=edges)
+    backend.view(fabric)[:] = edges[:-1, :-1]
 
     return fabric
 
@@ -104,7 +138,7 @@ def count_squares_with_two_or_more_claims(
 
     fabric = cover_fabric_with_claims(claims)
 
-    return sum(x >= 2 for row in fabric for x in row)
+    return len(fabric.cells) - fabric.count(0) - fabric.count(1)
 
 
 def test_max_width_height():
@@ -127,9 +161,9 @@ def test_create_fabric():
     ]
 
     fabric = create_fabric(claims)
-    assert len(fabric) == 7
-    assert all(len(row) == 7 for row in fabric)
-    assert all(all(col == 0 for col in row) for row in fabric)
+    assert fabric.rows == 7
+    assert fabric.cols == 7
+    assert fabric.count(0) == 49
 
 
 def test_cover_fabric_with_claims():
@@ -151,8 +185,8 @@ def test_cover_fabric_with_claims():
     """
 
     fabric = cover_fabric_with_claims(claims)
-    assert sum(x == 0 for row in fabric for x in row) == example.count('.')
-    assert sum(x == 2 for row in fabric for x in row) == example.count('X')
+    assert fabric.count(0) == example.count('.')
+    assert fabric.count(2) == example.count('X')
 
 
 def test_count_squares_with_two_or_more_claims():
@@ -176,26 +210,43 @@ def test_count_squares_with_two_or_more_claims():
     assert count_squares_with_two_or_more_claims(claims) == 4
 
 
-def read_input(filename: str) -> List[Tuple[int, int, int, int]]:
+def test_backends():
+
+    claims = read_input(backend.generated(3, 300))
 
-    result = []
-    with open(filename) as f:
+    backend.compare(cover_fabric_with_claims, claims)
+
+
+def iter_input(filename: Source) -> Iterator[Tuple[int, int, int, int]]:
+
+    with open_input(filename) as f:
         for line in f:
             idx, value = line.strip().split('@')
             offset, area = value.split(':')
             left, top = offset.split(',')
             width, height = area.split('x')
-            result.append((int(left), int(top), int(width), int(height)))
-    return result
+            yield int(left), int(top), int(width), int(height)
+
+
+def read_input(filename: Source) -> List[Tuple[int, int, int, int]]:
+
+    return list(iter_input(filename))
+
+
+def solve(filename: Source) -> int:
+
+    return count_squares_with_two_or_more_claims(read_input(filename))
 
 
 if __name__ == "__main__":
 
-    test_max_width_height()
-    test_create_fabric()
-    test_cover_fabric_with_claims()
-    test_count_squares_with_two_or_more_claims()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_max_width_height()
+        test_create_fabric()
+        test_cover_fabric_with_claims()
+        test_count_squares_with_two_or_more_claims()
+        test_backends()
+        print("all tests passed.")
 
-    answer = count_squares_with_two_or_more_claims(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
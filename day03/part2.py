@@ -9,21 +9,54 @@ For example, in the claims above, only claim 3 is intact after all claims are
 
 What is the ID of the only claim that doesn't overlap?
 """
-from typing import List, Tuple
-from part1 import read_input, cover_fabric_with_claims
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from collections import defaultdict
+from typing import Dict, Iterator, List, Set, Tuple
+from part1 import read_input
+
+from aoc.inputs import Source
+from aoc.unionfind import UnionFind
+
+
+def overlapping_pairs(
+    claims: List[Tuple[int, int, int, int]]
+    ) -> Iterator[Tuple[int, int]]:
+
+    # Cut the fabric into blocks as large as the largest claim, so that a
+    # claim covers at most four of them and only claims sharing a block
+    # need to be compared. Blocks are at least 1 wide, even when there are
+    # no claims or none has an area.
+    side = max(1, max(
+        (max(width, height) for _, _, width, height in claims), default=1))
+    blocks: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    for j, (left, top, width, height) in enumerate(claims):
+        seen: Set[int] = set()
+        for x in range(left // side, (left + width - 1) // side + 1):
+            for y in range(top // side, (top + height - 1) // side + 1):
+                for i in blocks[x, y]:
+                    i_left, i_top, i_width, i_height = claims[i]
+                    if (i not in seen
+                        and i_left < left + width and left < i_left + i_width
+                        and i_top < top + height and top < i_top + i_height):
+                        seen.add(i)
+                        yield i, j
+                blocks[x, y].append(j)
 
 
 def find_non_overlapping_claim(
     claims: List[Tuple[int, int, int, int]]
     ) -> int:
 
-    fabric = cover_fabric_with_claims(claims)
+    groups = UnionFind(len(claims))
+    for i, j in overlapping_pairs(claims):
+        groups.union(i, j)
 
-    for idx, claim in enumerate(claims):
-        left, top, width, height = claim
-        if all(fabric[i][j] < 2
-            for i in range(top, top + height)
-            for j in range(left, left + width)):
+    for idx in range(len(claims)):
+        if groups.size(idx) == 1:
             return idx + 1
 
     return -1
@@ -40,10 +73,41 @@ def test_find_non_overlapping_claim():
     assert find_non_overlapping_claim(claims) == 3
 
 
+def test_overlapping_pairs():
+
+    claims = [
+        (1, 3, 4, 4),
+        (3, 1, 4, 4),
+        (5, 5, 2, 2),
+        (4, 0, 1, 1),
+        (5, 4, 3, 1)
+    ]
+
+    # Claims that only touch at an edge do not overlap.
+    assert sorted(map(sorted, overlapping_pairs(claims))) == \
+        [[0, 1], [1, 4]]
+
+
+def test_no_area():
+
+    assert list(overlapping_pairs([])) == []
+    assert find_non_overlapping_claim([]) == -1
+    assert list(overlapping_pairs([(2, 2, 0, 0), (2, 2, 0, 0)])) == []
+    assert find_non_overlapping_claim([(2, 2, 0, 0), (2, 2, 0, 0)]) == 1
+
+
+def solve(filename: Source) -> int:
+
+    return find_non_overlapping_claim(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_find_non_overlapping_claim()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_find_non_overlapping_claim()
+        test_overlapping_pairs()
+        test_no_area()
+        print("all tests passed.")
 
-    answer = find_non_overlapping_claim(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
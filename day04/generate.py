@@ -0,0 +1,60 @@
+"""
+Generates guard shift records for day 4 at a chosen size.
+
+    python generate.py 5000 > big.txt
+
+The size is the number of shifts; there is one shift per night starting in
+1518, with the records shuffled like the real input.
+"""
+import random
+import sys
+from datetime import datetime, timedelta
+
+
+SIZES = [1000, 4000, 16000, 64000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    guards = [rng.randint(10, 3499) for _ in range(max(2, size // 40))]
+
+    records = []
+    night = datetime(1518, 1, 1, 23, 55)
+    for _ in range(size):
+        start = night + timedelta(minutes=rng.randint(0, 10))
+        records.append((start, "Guard #{} begins shift".format(
+            rng.choice(guards))))
+
+        midnight = night.replace(hour=0, minute=0) + timedelta(days=1)
+        minutes = sorted(rng.sample(range(1, 60), 2 * rng.randint(0, 3)))
+        for asleep, awake in zip(minutes[::2], minutes[1::2]):
+            records.append(
+                (midnight + timedelta(minutes=asleep), "falls asleep"))
+            records.append(
+                (midnight + timedelta(minutes=awake), "wakes up"))
+
+        night += timedelta(days=1)
+
+    rng.shuffle(records)
+
+    return ''.join(
+        "[{}] {}\n".format(dt.strftime("%Y-%m-%d %H:%M"), action)
+        for dt, action in records
+    )
+
+
+def test_generate():
+
+    lines = generate(30, seed=4).splitlines()
+
+    assert sum("begins shift" in line for line in lines) == 30
+    assert (sum("falls asleep" in line for line in lines)
+        == sum("wakes up" in line for line in lines))
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
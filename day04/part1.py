@@ -82,22 +82,30 @@ analyzed.
 What is the ID of the guard you chose multiplied by the minute you chose? (In
 the above example, the answer would be 10 * 24 = 240.)
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from datetime import datetime
-from typing import List, Tuple, Dict
+from typing import Dict, Iterator, List, Tuple
 
+from aoc.inputs import Source, open_input
 
-def read_input(filename: str) -> List[Tuple[datetime, str]]:
 
-    records = []
-    with open(filename) as f:
+def iter_input(filename: Source) -> Iterator[Tuple[datetime, str]]:
+    """
+    Records in the order of the file, which is not the order of time.
+    """
+    with open_input(filename) as f:
         for line in f:
             timestamp, action = line.strip().split(']')
             dt = datetime.strptime(timestamp.strip('['), "%Y-%m-%d %H:%M")
-            records.append((dt, action))
+            yield dt, action
+
 
-    records.sort(key=lambda x: (x[0].month, x[0].day, x[0].hour, x[0].minute))
+def read_input(filename: Source) -> List[Tuple[datetime, str]]:
 
-    return records
+    return sorted(iter_input(filename), key=lambda x: x[0])
 
 
 def process(records: List[Tuple[datetime, str]]) -> Dict[int, List[int]]:
@@ -164,15 +172,23 @@ def test_find_most_asleep_minute():
     assert find_most_asleep_minute(records[guard]) == 24
 
 
-if __name__ == "__main__":
+def solve(filename: Source) -> int:
 
-    test_read_input()
-    test_process()
-    test_find_most_asleep_guard()
-    test_find_most_asleep_minute()
-    print("all tests passed.")
-
-    records = process(read_input("input.txt"))
+    records = process(read_input(filename))
     guard = find_most_asleep_guard(records)
     minute = find_most_asleep_minute(records[guard])
-    print("answer:", guard * minute)
+
+    return guard * minute
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_read_input()
+        test_process()
+        test_find_most_asleep_guard()
+        test_find_most_asleep_minute()
+        print("all tests passed.")
+
+    answer = solve("input.txt")
+    print("answer:", answer)
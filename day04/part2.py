@@ -11,9 +11,15 @@ any minute asleep at most twice.)
 What is the ID of the guard you chose multiplied by the minute you chose? (In
 the above example, the answer would be 99 * 45 = 4455.)
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import Dict, List, Tuple
 from part1 import read_input, process
 
+from aoc.inputs import Source
+
 
 def find_times_most_asleep(records: Dict[int, List[int]]) -> Tuple[int, int]:
 
@@ -33,11 +39,19 @@ def test_times_find_most_asleep():
     assert records[guard].index(times) == 45
 
 
+def solve(filename: Source) -> int:
+
+    records = process(read_input(filename))
+    guard, times = find_times_most_asleep(records)
+
+    return guard * records[guard].index(times)
+
+
 if __name__ == "__main__":
 
-    test_times_find_most_asleep()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_times_find_most_asleep()
+        print("all tests passed.")
 
-    records = process(read_input("input.txt"))
-    guard, times = find_times_most_asleep(records)
-    print("answer:", guard * records[guard].index(times))
+    answer = solve("input.txt")
+    print("answer:", answer)
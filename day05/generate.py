@@ -0,0 +1,34 @@
+"""
+Generates polymers for day 5 at a chosen size.
+
+    python generate.py 1000000 > big.txt
+"""
+import random
+import string
+import sys
+
+
+SIZES = [10000, 50000, 250000, 1000000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    units = string.ascii_letters
+
+    return ''.join(rng.choice(units) for _ in range(size)) + '\n'
+
+
+def test_generate():
+
+    polymer = generate(1000, seed=5).strip()
+
+    assert len(polymer) == 1000
+    assert polymer.isalpha()
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -40,10 +40,16 @@ How many units remain after fully reacting the polymer you scanned? (Note: in
 this puzzle and others, the input is large; if you copy/paste your input, make
 sure you get the whole thing.)
 """
-from typing import List
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import Iterable, Iterator, List
 
-def scan(s: str) -> int:
+from aoc.inputs import Source, open_input
+
+
+def scan(s: Iterable[str]) -> int:
 
     stack: List[str] = []
     for c in s:
@@ -54,9 +60,18 @@ def scan(s: str) -> int:
     return len(stack)
 
 
-def read_input(filename: str) -> str:
+def iter_input(filename: Source, block: int = 1 << 16) -> Iterator[str]:
+    """
+    Units of the polymer one at a time, reading a block at a time.
+    """
+    with open_input(filename) as f:
+        for chunk in iter(lambda: f.read(block), ""):
+            yield from chunk.strip()
+
+
+def read_input(filename: Source) -> str:
 
-    with open(filename) as f:
+    with open_input(filename) as f:
         result = f.read().strip()
 
     return result
@@ -71,10 +86,16 @@ def test_scan():
     assert scan("dabAcCaCBAcCcaDA") == 10
 
 
+def solve(filename: Source) -> int:
+
+    return scan(iter_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_scan()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_scan()
+        print("all tests passed.")
 
-    answer = scan(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -24,8 +24,15 @@ In this example, removing all C/c units was best, producing the answer 4.
 What is the length of the shortest polymer you can produce by removing all
 units of exactly one type and fully reacting the result?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
 from part1 import read_input, scan
 
+from aoc.inputs import Source
+
 
 def remove_unit(polymer: str, unit: str) -> str:
 
@@ -54,11 +61,17 @@ def test_length_of_shorted_polymer():
     assert length_of_shorted_polymer("dabAcCaCBAcCcaDA") == 4
 
 
+def solve(filename: Source) -> int:
+
+    return length_of_shorted_polymer(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_remove_unit()
-    test_length_of_shorted_polymer()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_remove_unit()
+        test_length_of_shorted_polymer()
+        print("all tests passed.")
 
-    answer = length_of_shorted_polymer(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
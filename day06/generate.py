@@ -0,0 +1,42 @@
+"""
+Generates coordinate lists for day 6 at a chosen size.
+
+    python generate.py 200 > big.txt
+
+The coordinates are spread over a square that grows with the square root of
+their number, like the 50 coordinates over about 350x350 in the real input.
+"""
+import math
+import random
+import sys
+
+
+SIZES = [25, 50, 100, 200]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    side = int(50 * math.sqrt(size)) + 10
+
+    coordinates = set()
+    while len(coordinates) < size:
+        coordinates.add((rng.randrange(side), rng.randrange(side)))
+
+    return ''.join("{}, {}\n".format(x, y) for x, y in sorted(
+        coordinates, key=lambda _: rng.random()))
+
+
+def test_generate():
+
+    lines = generate(50, seed=6).splitlines()
+
+    assert len(lines) == 50
+    assert len(set(lines)) == 50
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -68,18 +68,28 @@ in this example, the size of the largest area is 17.
 
 What is the size of the largest area that isn't infinite?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from collections import defaultdict
-from typing import List, Tuple, Dict, Set
+from typing import Dict, Iterator, List, Set, Tuple
+
+from aoc.inputs import Source, open_input
+from aoc.spatial import SpatialIndex
 
 
-def read_input(filename: str) -> List[Tuple[int, int]]:
+def iter_input(filename: Source) -> Iterator[Tuple[int, int]]:
 
-    result = []
-    with open(filename) as f:
+    with open_input(filename) as f:
         for line in f:
             x, y = line.strip().split(',')
-            result.append((int(x), int(y)))
-    return result
+            yield int(x), int(y)
+
+
+def read_input(filename: Source) -> List[Tuple[int, int]]:
+
+    return list(iter_input(filename))
 
 
 def create_grid(
@@ -94,20 +104,12 @@ def create_grid(
     return top, bottom, left, right
 
 
-def closest_point(
-    x: int,
-    y: int,
-    coordinates: List[Tuple[int, int]]
-    ) -> int:
-
-    dist = []
-    for i, (a, b) in enumerate(coordinates):
-        dist.append((i, abs(x - a) + abs(y - b)))
+def closest_point(x: int, y: int, index: SpatialIndex) -> int:
 
-    dist.sort(key=lambda x: x[1])
+    nearest = index.nearest((x, y), 2)
 
-    if dist[0][1] != dist[1][1]:
-        return dist[0][0]
+    if len(nearest) == 1 or nearest[0][0] != nearest[1][0]:
+        return nearest[0][1]
 
     return -1
 
@@ -115,11 +117,12 @@ def closest_point(
 def fill_grid(coordinates: List[Tuple[int, int]]) -> Dict[int, int]:
 
     top, bottom, left, right = create_grid(coordinates)
+    index = SpatialIndex(coordinates)
 
     d: Dict[int, int] = defaultdict(int)
     for i in range(top, bottom + 1):
         for j in range(left, right + 1):
-            k = closest_point(i, j, coordinates)
+            k = closest_point(i, j, index)
             d[k] += 1
 
     return d
@@ -128,18 +131,19 @@ def fill_grid(coordinates: List[Tuple[int, int]]) -> Dict[int, int]:
 def infinite_points(coordinates: List[Tuple[int, int]]) -> Set[int]:
 
     top, bottom, left, right = create_grid(coordinates)
+    index = SpatialIndex(coordinates)
 
     points: Set[int] = set()
 
     for i in range(top, bottom + 1):
-        points.add(closest_point(i, left, coordinates))
-        points.add(closest_point(i, right, coordinates))
+        points.add(closest_point(i, left, index))
+        points.add(closest_point(i, right, index))
 
     for j in range(left, right + 1):
-        points.add(closest_point(top, j, coordinates))
-        points.add(closest_point(bottom, j, coordinates))
+        points.add(closest_point(top, j, index))
+        points.add(closest_point(bottom, j, index))
 
-    points.remove(-1)
+    points.discard(-1)
 
     return points
 
@@ -198,9 +202,10 @@ def test_closest_point():
 
     grid = [list(row) for row in grid.strip().replace(' ', '').split('\n')]
 
+    index = SpatialIndex(example)
     for i in range(len(grid)):
         for j in range(len(grid[0])):
-            point = closest_point(i, j, example)
+            point = closest_point(i, j, index)
             char = chr(point + ord('a')) if point != -1 else '.'
             assert grid[j][i].lower() == char
 
@@ -233,13 +238,19 @@ def test_largest_area():
     assert largest_area(example) == 17
 
 
+def solve(filename: Source) -> int:
+
+    return largest_area(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_create_grid()
-    test_closest_point()
-    test_infinite_points()
-    test_largest_area()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_create_grid()
+        test_closest_point()
+        test_infinite_points()
+        test_largest_area()
+        print("all tests passed.")
 
-    answer = largest_area(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -44,8 +44,16 @@ instead including all locations with a total distance of less than 10000.
 What is the size of the region containing all locations which have a total
 distance to all given coordinates of less than 10000?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
 from part1 import read_input, create_grid
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+from aoc import backend
+from aoc.inputs import Source
 
 
 def sum_of_distances(
@@ -61,6 +69,7 @@ def sum_of_distances(
     return dist
 
 
+@backend.dispatch
 def size_of_region(
     coordinates: List[Tuple[int, int]],
     threshold: int = 10000
@@ -77,6 +86,42 @@ def size_of_region(
     return count
 
 
+def distance_sums(
+    values: Sequence[int],
+    low: int,
+    high: int
+    ) -> Sequence[int]:
+    """
+    Sum of |p - v| over the values, for every p from low to high.
+    """
+    np = backend.numpy()
+    values = np.sort(values)
+    sums = np.concatenate(([0], values.cumsum()))
+    p = np.arange(low, high + 1, dtype=np.int64)
+    below = np.searchsorted(values, p, side="right")
+
+    return (p * below - sums[below]
+            + (sums[-1] - sums[below]) - p * (len(values) - below))
+
+
+@size_of_region.register("numpy")
+def size_of_region_numpy(
+    coordinates: List[Tuple[int, int]],
+    threshold: int = 10000
+    ) -> int:
+
+    np = backend.numpy()
+    top, bottom, left, right = create_grid(coordinates)
+    points = np.array(coordinates, dtype=np.int64)
+
+    # The total distance is a sum over x plus a sum over y, so count the
+    # pairs of rows and columns whose sums add up to under the threshold.
+    rows = distance_sums(points[:, 0], top, bottom)
+    columns = np.sort(distance_sums(points[:, 1], left, right))
+
+    return int(np.searchsorted(columns, threshold - rows, side="left").sum())
+
+
 def test_sum_of_distances():
 
     example = [
@@ -105,11 +150,26 @@ def test_size_of_region():
     assert size_of_region(example, 32) == 16
 
 
+def test_backends():
+
+    coordinates = read_input(backend.generated(6, 20))
+
+    backend.compare(size_of_region, coordinates, 3000)
+    backend.compare(size_of_region, coordinates)
+
+
+def solve(filename: Source) -> int:
+
+    return size_of_region(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_sum_of_distances()
-    test_size_of_region()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_sum_of_distances()
+        test_size_of_region()
+        test_backends()
+        print("all tests passed.")
 
-    answer = size_of_region(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,50 @@
+"""
+Generates step dependency lists for day 7 at a chosen size.
+
+    python generate.py 26 > big.txt
+
+Steps are named by single letters, so there are at most 26 of them; the
+size is the number of steps and each step depends on a few earlier ones.
+"""
+import random
+import string
+import sys
+
+
+SIZES = [6, 13, 26]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    if not 2 <= size <= 26:
+        raise ValueError("day 7 supports between 2 and 26 steps")
+
+    rng = random.Random(seed)
+    steps = rng.sample(string.ascii_uppercase, size)
+
+    edges = []
+    for j in range(1, size):
+        for i in rng.sample(range(j), min(j, rng.randint(1, 5))):
+            edges.append((steps[i], steps[j]))
+    rng.shuffle(edges)
+
+    return ''.join(
+        "Step {} must be finished before step {} can begin.\n".format(a, b)
+        for a, b in edges
+    )
+
+
+def test_generate():
+
+    lines = generate(26, seed=7).splitlines()
+    steps = {line.split()[1] for line in lines} | {
+        line.split()[7] for line in lines}
+
+    assert len(steps) == 26
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
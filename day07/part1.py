@@ -62,15 +62,21 @@ So, in this example, the correct order is CABDFE.
 
 In what order should the steps in your instructions be completed?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from collections import defaultdict
 from typing import Dict, Set
 
+from aoc.inputs import Source, open_input
+
 
-def read_input(filename: str) -> Dict[str, Set[str]]:
+def read_input(filename: Source) -> Dict[str, Set[str]]:
 
     deps: Dict[str, Set[str]] = defaultdict(set)
 
-    with open(filename) as f:
+    with open_input(filename) as f:
         for line in f:
             words = line.split()
             before, after = words[1], words[7]
@@ -136,12 +142,18 @@ def test_process():
     assert process(deps) == "CABDFE"
 
 
+def solve(filename: Source) -> str:
+
+    return process(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_read_input()
-    test_find_available()
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_read_input()
+        test_find_available()
+        test_process()
+        print("all tests passed.")
 
-    answer = process(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -47,10 +47,16 @@ steps.
 With 5 workers and the 60+ second step durations described above, how long will
 it take to complete all of the steps?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 import heapq
 from typing import Dict, Set
 from part1 import read_input, find_available, remove_dependency
 
+from aoc.inputs import Source
+
 
 def process(
     dependencies: Dict[str, Set[str]],
@@ -96,10 +102,16 @@ def test_process():
     assert process(deps, workers=2, duration=0) == 15
 
 
+def solve(filename: Source) -> int:
+
+    return process(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_process()
+        print("all tests passed.")
 
-    answer = process(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,77 @@
+"""
+Generates license trees for day 8 at a chosen size.
+
+    python generate.py 10000 > big.txt
+
+The size is the number of nodes. Each node has up to five children and one
+to three metadata entries, which are valid child references often enough
+for part two to be interesting.
+"""
+import random
+import sys
+from typing import List
+
+
+SIZES = [2000, 8000, 32000, 128000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    data: List[int] = []
+
+    # Each entry on the stack is a node still to be written and the number
+    # of nodes, itself included, in its subtree.
+    stack = [(size, False)]
+    metadata_stack: List[List[int]] = []
+
+    while stack:
+        n, closing = stack.pop()
+        if closing:
+            data.extend(metadata_stack.pop())
+            continue
+
+        budget = n - 1
+        children = []
+        while budget > 0 and len(children) < 5:
+            if len(children) == 4:
+                children.append(budget)
+            else:
+                children.append(rng.randint(1, budget))
+            budget -= children[-1]
+
+        num_metadata = rng.randint(1, 3)
+        data.extend([len(children), num_metadata])
+        metadata_stack.append([
+            rng.randint(1, max(1, len(children) + 1))
+            if children and rng.random() < 0.7 else rng.randint(1, 9)
+            for _ in range(num_metadata)
+        ])
+
+        stack.append((n, True))
+        for child in reversed(children):
+            stack.append((child, False))
+
+    return ' '.join(str(x) for x in data) + '\n'
+
+
+def test_generate():
+
+    data = [int(x) for x in generate(50, seed=8).split()]
+
+    def _count(i):
+        num_children, num_metadata = data[i], data[i + 1]
+        i, nodes = i + 2, 1
+        for _ in range(num_children):
+            i, n = _count(i)
+            nodes += n
+        return i + num_metadata, nodes
+
+    assert _count(0) == (len(data), 50)
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -47,16 +47,24 @@ metadata entries. In this example, that sum is 1+1+2+10+11+12+2+99=138.
 
 What is the sum of all metadata entries?
 """
-from typing import List
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import Iterator, List, Sequence
 
-def read_input(filename: str) -> List[int]:
+from aoc.inputs import Source, integer_blocks, integers
 
-    with open("input.txt") as f:
-    
-        data = [int(x) for x in f.read().strip().split()]
 
-    return data
+def iter_input(filename: Source) -> Iterator[int]:
+
+    for block in integer_blocks(filename):
+        yield from block
+
+
+def read_input(filename: Source) -> Sequence[int]:
+
+    return integers(filename)
 
 
 def process(data: List[int]) -> int:
@@ -92,10 +100,16 @@ def test_process():
     assert process(A) == 138
 
 
+def solve(filename: Source) -> int:
+
+    return process(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_process()
+        print("all tests passed.")
 
-    answer = process(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -36,9 +36,15 @@ So, in this example, the value of the root node is 66.
 
 What is the value of the root node?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import List
 from part1 import read_input
 
+from aoc.inputs import Source
+
 
 def process(data: List[int]) -> int:
 
@@ -79,10 +85,16 @@ def test_process():
     assert process(A) == 66
 
 
+def solve(filename: Source) -> int:
+
+    return process(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_process()
+        print("all tests passed.")
 
-    answer = process(read_input("input.txt"))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,36 @@
+"""
+Generates marble game settings for day 9 at a chosen size.
+
+    python generate.py 70000 > input.txt
+
+The size is the value of the last marble; part two plays a hundred times as
+many marbles.
+"""
+import random
+import sys
+
+
+SIZES = [2500, 5000, 10000, 20000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+
+    return "{} players; last marble is worth {} points\n".format(
+        rng.randint(9, 500), size)
+
+
+def test_generate():
+
+    tokens = generate(1618, seed=9).split()
+
+    assert tokens[1:6] == ["players;", "last", "marble", "is", "worth"]
+    assert int(tokens[6]) == 1618
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -74,7 +74,24 @@ Here are a few more examples:
 
 What is the winning Elf's score?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 import itertools
+from typing import Tuple
+
+from aoc.inputs import Source, open_input
+
+
+def read_input(filename: Source) -> Tuple[int, int]:
+    """
+    Reads the puzzle input, e.g. "10 players; last marble is worth 1618 points".
+    """
+    with open_input(filename) as f:
+        tokens = f.read().split()
+
+    return int(tokens[0]), int(tokens[6])
 
 
 def play(num_players: int, last_marble: int) -> int:
@@ -110,12 +127,16 @@ def test_play():
     assert play(30, 5807) == 37305
 
 
+def solve(filename: Source) -> int:
+
+    return play(*read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_play()
-    print("all tests passed")
+    if "--solve-only" not in sys.argv[1:]:
+        test_play()
+        print("all tests passed")
 
-    num_players = input("Enter number of players: ")
-    last_marble = input("Enter how much last marble is worth: ")
-    answer = play(int(num_players), int(last_marble))
+    answer = solve("input.txt")
     print("answer:", answer)
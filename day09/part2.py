@@ -6,6 +6,14 @@ Amused by the speed of your answer, the Elves are curious:
 What would the new winning Elf's score be if the number of the last marble were
 100 times larger?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
+from part1 import read_input
+
+from aoc.inputs import Source
 
 
 class Node:
@@ -66,12 +74,18 @@ def test_play():
     assert play(30, 5807) == 37305
 
 
+def solve(filename: Source) -> int:
+
+    num_players, last_marble = read_input(filename)
+
+    return play(num_players, last_marble * 100)
+
+
 if __name__ == "__main__":
 
-    test_play()
-    print("all tests passed")
+    if "--solve-only" not in sys.argv[1:]:
+        test_play()
+        print("all tests passed")
 
-    num_players = input("Enter number of players: ")
-    last_marble = input("Enter how much last marble is worth: ")
-    answer = play(int(num_players), int(last_marble))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,46 @@
+"""
+Generates moving points of light for day 10 at a chosen size.
+
+    python generate.py 1000 > big.txt
+
+The points start far apart and all converge on a small random pattern at
+the same second, somewhere below the 20000 seconds that the solver scans.
+"""
+import random
+import sys
+
+
+SIZES = [100, 300, 1000, 3000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    t = rng.randint(5000, 15000)
+    width = max(10, size // 4)
+
+    lines = []
+    for _ in range(size):
+        x, y = rng.randrange(width), rng.randrange(10)
+        vx, vy = 0, 0
+        while vx == vy == 0:
+            vx, vy = rng.randint(-5, 5), rng.randint(-5, 5)
+        lines.append("position=<{:6d}, {:6d}> velocity=<{:2d}, {:2d}>\n".format(
+            x - vx * t, y - vy * t, vx, vy))
+
+    return ''.join(lines)
+
+
+def test_generate():
+
+    lines = generate(20, seed=10).splitlines()
+
+    assert len(lines) == 20
+    assert all(line.startswith("position=<") for line in lines)
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
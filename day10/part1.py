@@ -160,18 +160,29 @@ be much longer and will take many more seconds to appear.
 
 What message will eventually appear in the sky?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 import itertools
 from typing import List, Tuple
 
+from aoc import backend
+from aoc.inputs import Source, open_input
+
+
+# Seconds searched for the message.
+SECONDS = 20000
+
 
 def read_input(
-    filename: str
+    filename: Source
     ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
 
     position = []
     velocity = []
 
-    with open(filename) as f:
+    with open_input(filename) as f:
         for line in f:
             splitted = line.strip().lstrip('position=<').rstrip('>').split(',')
             mid = splitted[1].split('> velocity=<')
@@ -185,11 +196,11 @@ def read_input(
     return position, velocity
 
 
-def draw_message(
+def render_message(
     t: int,
     position: List[Tuple[int, int]],
     velocity: List[Tuple[int, int]]
-    ) -> None:
+    ) -> str:
 
     result = []
     for (y0, x0), (dy, dx) in zip(position, velocity):
@@ -209,10 +220,19 @@ def draw_message(
     for x, y in result:
         grid[x - min_height][y - min_width] = '#'
 
-    for row in grid:
-        print(''.join(row))
+    return '\n'.join(''.join(row) for row in grid)
 
 
+def draw_message(
+    t: int,
+    position: List[Tuple[int, int]],
+    velocity: List[Tuple[int, int]]
+    ) -> None:
+
+    print(render_message(t, position, velocity))
+
+
+@backend.dispatch
 def find_min(
     position: List[Tuple[int, int]],
     velocity: List[Tuple[int, int]]
@@ -220,7 +240,7 @@ def find_min(
 
     result = []
 
-    for t in range(20000):
+    for t in range(SECONDS):
 
         min_height = min(x + t * vx for (y, x), (vy, vx) in zip(position, velocity))
         max_height = max(x + t * vx for (y, x), (vy, vx) in zip(position, velocity))
@@ -233,13 +253,51 @@ def find_min(
     return result.index(min(result))
 
 
+@find_min.register("numpy")
+def find_min_numpy(
+    position: List[Tuple[int, int]],
+    velocity: List[Tuple[int, int]]
+    ) -> int:
+
+    np = backend.numpy()
+    points = np.array(position, dtype=np.int64)
+    speeds = np.array(velocity, dtype=np.int64)
+
+    # Width plus height of the bounding box at every second, a block of
+    # seconds at a time to keep the positions of all points small.
+    spread = np.zeros(SECONDS, dtype=np.int64)
+    for start in range(0, SECONDS, 1000):
+        t = np.arange(start, min(start + 1000, SECONDS))[:, None]
+        for axis in range(2):
+            moved = points[:, axis] + t * speeds[:, axis]
+            spread[start:start + len(t)] += moved.max(1) - moved.min(1)
+
+    return int(spread.argmin())
+
+
+def test_backends():
+
+    position, velocity = read_input(backend.generated(10, 40))
+
+    backend.compare(find_min, position, velocity)
+
+
+def solve(filename: Source) -> str:
+
+    pos, vel = read_input(filename)
+
+    return render_message(find_min(pos, vel), pos, vel)
+
+
 if __name__ == "__main__":
 
-    pos, vel = read_input('test.txt')
-    t = find_min(pos, vel)
-    pos, vel = read_input('test.txt')
-    print(f"After {t} seconds:")
-    draw_message(t, pos, vel)
+    if "--solve-only" not in sys.argv[1:]:
+        test_backends()
+        pos, vel = read_input('test.txt')
+        t = find_min(pos, vel)
+        pos, vel = read_input('test.txt')
+        print(f"After {t} seconds:")
+        draw_message(t, pos, vel)
 
     pos, vel = read_input('input.txt')
     t = find_min(pos, vel)
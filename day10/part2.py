@@ -8,8 +8,19 @@ Impressed by your sub-hour communication capabilities, the Elves are curious:
 exactly how many seconds would they have needed to wait for that message to
 appear?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from part1 import read_input, find_min, draw_message
 
+from aoc.inputs import Source
+
+
+def solve(filename: Source) -> int:
+
+    return find_min(*read_input(filename))
+
 
 if __name__ == "__main__":
 
@@ -0,0 +1,32 @@
+"""
+Generates grid serial numbers for day 11.
+
+    python generate.py 1 > input.txt
+
+The fuel grid is fixed at 300x300 by the puzzle, so the size has no effect
+on the work done; only the serial number changes with the seed.
+"""
+import random
+import sys
+
+
+SIZES = [300]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+
+    return "{}\n".format(rng.randint(1000, 9999))
+
+
+def test_generate():
+
+    assert 1000 <= int(generate(300, seed=11)) <= 9999
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -74,12 +74,30 @@ total power of 30); they are in the middle of this region:
 What is the X,Y coordinate of the top-left fuel cell of the 3x3 square with the
 largest total power?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from array import array
+import functools
 from typing import List, Tuple
 
+from aoc import backend
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
+
+
+def read_input(filename: Source) -> int:
+
+    with open_input(filename) as f:
+        serial_number = int(f.read().strip())
 
-def create_grid() -> List[List[int]]:
+    return serial_number
 
-    grid = [[-999] * 301 for _ in range(301)]
+
+def create_grid() -> Grid:
+
+    grid = Grid(301, 301, fill=-999, typecode="i")
 
     return grid
 
@@ -95,28 +113,64 @@ def power_level(x: int, y: int, n: int) -> int:
     return hundreds_digit - 5
 
 
-def fill_grid(grid: List[List[int]], n: int) -> List[List[int]]:
+@functools.lru_cache(maxsize=None)
+def rack_terms() -> Tuple[List[List[int]], List[int]]:
+
+    # The power level is ((x + 10) ** 2 * y + n * (x + 10)) // 100 % 10 - 5,
+    # so everything but the serial number n is shared by all the grids.
+    racks = [x + 10 for x in range(1, 301)]
+    squares = [
+        [rack * rack * y for rack in racks]
+        for y in range(301)
+    ]
+
+    return squares, racks
+
+
+@backend.dispatch
+def fill_grid(grid: Grid, n: int) -> Grid:
 
     grid = create_grid()
+    squares, racks = rack_terms()
 
     for y in range(1, 301):
-        for x in range(1, 301):
-            grid[y][x] = power_level(x, y, n)
+        start = grid.index(y, 1)
+        grid.cells[start:start + 300] = array('i', [
+            (square + n * rack) // 100 % 10 - 5
+            for square, rack in zip(squares[y], racks)
+        ])
 
     return grid
 
 
-def scan(grid: List[List[int]]) -> Tuple[int, int]:
+@fill_grid.register("numpy")
+def fill_grid_numpy(grid: Grid, n: int) -> Grid:
+
+    np = backend.numpy()
+    grid = create_grid()
+    racks = np.arange(11, 311, dtype=np.int64)
+    ys = np.arange(1, 301, dtype=np.int64)[:, None]
+
+    backend.view(grid)[1:, 1:] = (
+        (racks * racks * ys + n * racks) // 100 % 10 - 5)
+
+    return grid
+
+
+def scan(grid: Grid) -> Tuple[int, int]:
 
     max_power = float('-inf')
     result = (0, 0)
+    cells, stride = grid.cells, grid.stride
 
     for y in range(1, 301 - 3):
         for x in range(1, 301 - 3):
-            sum_power = 0
-            for dy in range(y, y + 3):
-                for dx in range(x, x + 3):
-                    sum_power += grid[dy][dx]
+            i = grid.index(y, x)
+            sum_power = (
+                sum(cells[i:i + 3])
+                + sum(cells[i + stride:i + stride + 3])
+                + sum(cells[i + 2 * stride:i + 2 * stride + 3])
+            )
             if sum_power > max_power:
                 max_power = sum_power
                 result = (x, y)
@@ -141,17 +195,43 @@ def test_power_level():
     assert power_level(101, 153, 71) == 4
 
 
+def test_fill_grid():
+
+    grid = fill_grid(create_grid(), 57)
+
+    assert grid[79, 122] == power_level(122, 79, 57) == -5
+    assert all(
+        grid[y, x] == power_level(x, y, 57)
+        for y in range(1, 301, 37) for x in range(1, 301, 41)
+    )
+
+
+def test_backends():
+
+    n = read_input(backend.generated(11, 300))
+
+    backend.compare(fill_grid, create_grid(), n)
+
+
 def test_process():
 
     assert process(18) == (33, 45)
     assert process(42) == (21, 61)
 
+
+def solve(filename: Source) -> str:
+
+    return ','.join(str(x) for x in process(read_input(filename)))
+
+
 if __name__ == "__main__":
 
-    test_power_level()
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_power_level()
+        test_fill_grid()
+        test_backends()
+        test_process()
+        print("all tests passed.")
 
-    serial_number = input("Enter your puzzle input: ")
-    answer = process(int(serial_number))
-    print("answer:", ','.join(str(x) for x in answer))
+    answer = solve("input.txt")
+    print("answer:", answer)
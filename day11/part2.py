@@ -20,33 +20,61 @@ For example:
 
 What is the X,Y,size identifier of the square with the largest total power?
 """
-from typing import List, Tuple
-from part1 import create_grid, fill_grid
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+import operator
+from typing import Tuple
+from part1 import create_grid, fill_grid, read_input
 
-def get_prefix_sum(grid: List[List[int]]) -> List[List[int]]:
+from aoc import backend
+from aoc.grid import Grid
+from aoc.inputs import Source
 
-    table = [[0] * len(grid[0]) for _ in range(len(grid))]
 
-    for y in range(1, len(grid)):
-        for x in range(1, len(grid[0])):
-            table[y][x] = (
-                grid[y][x]
-                + table[y - 1][x]
-                + table[y][x - 1]
-                - table[y - 1][x - 1]
+@backend.dispatch
+def get_prefix_sum(grid: Grid) -> Grid:
+
+    table = Grid(grid.rows, grid.cols, typecode="q")
+    cells, sums, stride = grid.cells, table.cells, table.stride
+
+    for y in range(1, grid.rows):
+        for x in range(1, grid.cols):
+            i = table.index(y, x)
+            sums[i] = (
+                cells[i]
+                + sums[i - stride]
+                + sums[i - 1]
+                - sums[i - stride - 1]
             )
 
     return table
 
 
-def get_sum(table: List[List[int]], x: int, y: int, size: int) -> int:
+@get_prefix_sum.register("numpy")
+def get_prefix_sum_numpy(grid: Grid) -> Grid:
+
+    np = backend.numpy()
+    table = Grid(grid.rows, grid.cols, typecode="q")
+
+    backend.view(table)[1:, 1:] = (
+        backend.view(grid)[1:, 1:].cumsum(0, dtype=np.int64).cumsum(1))
+
+    return table
+
+
+def get_sum(table: Grid, x: int, y: int, size: int) -> int:
+
+    sums = table.cells
+    top_left = table.index(y - 1, x - 1)
+    bottom_left = table.index(y + size - 1, x - 1)
 
     return (
-        table[y + size - 1][x + size - 1]
-        - table[y + size - 1][x - 1]
-        - table[y - 1][x + size - 1]
-        + table[y - 1][x - 1]
+        sums[bottom_left + size]
+        - sums[bottom_left]
+        - sums[top_left + size]
+        + sums[top_left]
     )
 
 
@@ -55,16 +83,24 @@ def process(n: int) -> Tuple[int, int, int]:
     grid = create_grid()
     grid = fill_grid(grid, n)
     table = get_prefix_sum(grid)
+    sums = table.cells
 
     max_power = 0
     result = (0, 0, 0)
     for size in range(1, 301):
         for y in range(1, 301 - size):
-            for x in range(1, 301 - size):
-                power = get_sum(table, x, y, size)
-                if power > max_power:
-                    max_power = power
-                    result = (x, y, size)
+            top = table.index(y - 1, 0)
+            bottom = table.index(y + size - 1, 0)
+            # columns[i] is the sum of rows y..y+size-1 over columns 1..i,
+            # so the square at x is columns[x + size - 1] - columns[x - 1].
+            columns = list(map(
+                operator.sub, sums[bottom:bottom + 300], sums[top:top + 300]))
+            powers = list(map(
+                operator.sub, columns[size:], columns[:300 - size]))
+            power = max(powers)
+            if power > max_power:
+                max_power = power
+                result = (powers.index(power) + 1, y, size)
 
     return result
 
@@ -85,7 +121,7 @@ def test_prefix_sum():
         [0, 12, 27, 45]
     ]
 
-    assert get_prefix_sum(grid) == prefix_sum
+    assert get_prefix_sum(Grid.from_rows(grid)).to_rows() == prefix_sum
 
 
 def test_get_sum():
@@ -97,7 +133,7 @@ def test_get_sum():
         [0, 7, 8, 9]
     ]
 
-    prefix_sum = get_prefix_sum(grid)
+    prefix_sum = get_prefix_sum(Grid.from_rows(grid))
     assert get_sum(prefix_sum, 1, 1, 1) == 1
     assert get_sum(prefix_sum, 1, 1, 2) == 1 + 2 + 4 + 5
     assert get_sum(prefix_sum, 2, 2, 2) == 5 + 6 + 8 + 9
@@ -117,19 +153,32 @@ def test_get_sum():
     assert get_sum(table, 232, 251, 12) == 119
 
 
+def test_backends():
+
+    grid = fill_grid(create_grid(), read_input(backend.generated(11, 300, 1)))
+
+    backend.compare(get_prefix_sum, grid)
+
+
 def test_process():
 
     assert process(18) == (90, 269, 16)
     assert process(42) == (232, 251, 12)
 
 
+def solve(filename: Source) -> str:
+
+    return ','.join(str(x) for x in process(read_input(filename)))
+
+
 if __name__ == "__main__":
 
-    test_prefix_sum()
-    test_get_sum()
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_prefix_sum()
+        test_get_sum()
+        test_backends()
+        test_process()
+        print("all tests passed.")
 
-    serial_number = input("Enter your puzzle input: ")
-    answer = process(int(serial_number))
-    print("answer:", ','.join(str(x) for x in answer))
+    answer = solve("input.txt")
+    print("answer:", answer)
@@ -0,0 +1,68 @@
+"""
+Generates pot rows for day 12 at a chosen size.
+
+    python generate.py 1000 > big.txt
+
+The size is the length of the initial state. The rules are a fixed set that
+settles into gliders for most starting rows; rows that keep growing are
+rejected, since part two relies on the pattern settling down.
+"""
+import random
+import sys
+
+from part1 import grow
+
+
+SIZES = [250, 500, 1000, 2000]
+
+RULES = {
+    ".##.#": "#", "...#.": "#", "#...#": "#", ".#...": "#", ".#.##": "#",
+    "#..#.": "#", "##.#.": "#", ".####": "#", "#.##.": "#", ".#..#": "#",
+    "..#.#": "#", "##..#": "#", ".#.#.": "#", "#.#.#": "#", "###.#": "#",
+}
+
+
+def settles(state: str, generations: int) -> bool:
+
+    start_idx = 0
+    for _ in range(generations):
+        start_idx, next_state = grow(start_idx, state, RULES)
+        if next_state == state:
+            return True
+        state = next_state
+
+    return False
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+
+    while True:
+        state = ''.join(rng.choice(".#") for _ in range(size))
+        if settles(state, 2 * size + 100):
+            break
+
+    patterns = [
+        ''.join(".#"[(i >> k) & 1] for k in range(4, -1, -1))
+        for i in range(32)
+    ]
+    rng.shuffle(patterns)
+
+    return "initial state: {}\n\n{}".format(state, ''.join(
+        "{} => {}\n".format(p, RULES.get(p, '.')) for p in patterns))
+
+
+def test_generate():
+
+    lines = generate(50, seed=12).splitlines()
+
+    assert len(lines[0].split()[2]) == 50
+    assert len(lines) == 34
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
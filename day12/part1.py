@@ -103,12 +103,18 @@ produces 325.
 After 20 generations, what is the sum of the numbers of all pots which contain
 a plant?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import List, Dict, Tuple
 
+from aoc.inputs import Source, open_input
+
 
-def get_initial_state_from_file(filename: str) -> str:
+def get_initial_state_from_file(filename: Source) -> str:
 
-    with open(filename) as f:
+    with open_input(filename) as f:
         line = f.readline()
 
     initial_state = line.strip().split()[2]
@@ -116,10 +122,10 @@ def get_initial_state_from_file(filename: str) -> str:
     return initial_state
 
 
-def get_changes_from_file(filename: str) -> Dict[str, str]:
+def get_changes_from_file(filename: Source) -> Dict[str, str]:
 
     result: Dict[str, str] = dict()
-    with open(filename) as f:
+    with open_input(filename) as f:
         for line in f:
             if line.startswith("initial state:"):
                 continue
@@ -225,16 +231,22 @@ def test_process():
     assert process(initial_state, changes) == 325
 
 
+def solve(filename: Source) -> int:
+
+    initial_state = get_initial_state_from_file(filename)
+    changes = get_changes_from_file(filename)
+
+    return process(initial_state, changes)
+
+
 if __name__ == "__main__":
 
-    test_get_initial_state_from_file()
-    test_get_changes_from_file()
-    test_grow()
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_get_initial_state_from_file()
+        test_get_changes_from_file()
+        test_grow()
+        test_process()
+        print("all tests passed.")
 
-    
-    initial_state = get_initial_state_from_file("input.txt")
-    changes = get_changes_from_file("input.txt")
-    answer = process(initial_state, changes)
+    answer = solve("input.txt")
     print("answer:", answer)
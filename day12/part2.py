@@ -8,26 +8,30 @@ your future.
 After fifty billion (50000000000) generations, what is the sum of the numbers
 of all pots which contain a plant?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from part1 import get_initial_state_from_file, get_changes_from_file, grow
 from typing import Dict, Tuple
 
+from aoc.cycles import fast_forward
+from aoc.inputs import Source
+
+
+Pots = Tuple[int, str]
 
-def process(initial_state: str, changes: Dict[str, str], epochs: int) -> int:
 
-    state = initial_state
-    start_idx = 0
+def shift(before: Pots, after: Pots, cycles: int) -> Pots:
 
-    cache: Dict[Tuple[int, str], Tuple[int, str]] = dict()
+    return after[0] + cycles * (after[0] - before[0]), after[1]
+
+
+def process(initial_state: str, changes: Dict[str, str], epochs: int) -> int:
 
-    for t in range(epochs):
-        if (start_idx, state) in cache:
-            start_idx, state = cache[start_idx, state]
-        else:
-            cache[start_idx, state] = grow(start_idx, state, changes)
-            if cache[start_idx, state][1] == state:
-                start_idx += epochs - t
-                break
-            start_idx, state = cache[start_idx, state]
+    start_idx, state = fast_forward(
+        (0, initial_state), lambda pots: grow(pots[0], pots[1], changes),
+        epochs, key=lambda pots: pots[1], extrapolate=shift)
 
     return sum(i + start_idx for i, x in enumerate(state) if x == '#')
 
@@ -45,13 +49,19 @@ def test_process():
     assert process(initial_state, changes, 20) == 3605
 
 
+def solve(filename: Source) -> int:
+
+    initial_state = get_initial_state_from_file(filename)
+    changes = get_changes_from_file(filename)
+
+    return process(initial_state, changes, 50000000000)
+
+
 if __name__ == "__main__":
 
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_process()
+        print("all tests passed.")
 
-    
-    initial_state = get_initial_state_from_file("input.txt")
-    changes = get_changes_from_file("input.txt")
-    answer = process(initial_state, changes, 50000000000)
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,86 @@
+"""
+Generates mine cart tracks for day 13 at a chosen size.
+
+    python generate.py 100 > big.txt
+
+The size is the number of rectangular loops. Loops never share a row or a
+column, so their tracks only meet at intersections. Carts are placed in
+pairs heading towards each other on a straight stretch, plus one cart on its
+own, so there is always a first crash and a last cart standing.
+"""
+import random
+import sys
+from typing import List
+
+
+SIZES = [25, 50, 100, 200]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    side = 6 * size + 4
+
+    rows = rng.sample(range(1, side - 1), 2 * size)
+    cols = rng.sample(range(1, side - 1), 2 * size)
+
+    grid: List[List[str]] = [[' '] * side for _ in range(side)]
+
+    def _draw(r, c, char):
+        if grid[r][c] in "-|" and grid[r][c] != char:
+            grid[r][c] = '+'
+        else:
+            grid[r][c] = char
+
+    edges = []
+    for i in range(size):
+        top, bottom = sorted(rows[2 * i: 2 * i + 2])
+        left, right = sorted(cols[2 * i: 2 * i + 2])
+        for c in range(left + 1, right):
+            _draw(top, c, '-')
+            _draw(bottom, c, '-')
+        for r in range(top + 1, bottom):
+            _draw(r, left, '|')
+            _draw(r, right, '|')
+        grid[top][left] = grid[bottom][right] = '/'
+        grid[top][right] = grid[bottom][left] = '\\'
+        edges.extend([(top, left, right), (bottom, left, right)])
+
+    taken = set()
+
+    def _free(r, a, b):
+        return all(grid[r][c] == '-' and (r, c) not in taken
+            for c in range(a - 2, b + 3))
+
+    for _ in range(20 * size):
+        r, left, right = rng.choice(edges)
+        if right - left < 8:
+            continue
+        a = rng.randint(left + 3, right - 4)
+        b = min(right - 3, a + rng.randint(1, 12))
+        if not _free(r, a, b):
+            continue
+        if not taken:
+            grid[r][a] = '>'
+            taken.update((r, c) for c in range(a - 2, a + 3))
+            continue
+        grid[r][a], grid[r][b] = '>', '<'
+        taken.update((r, c) for c in range(a - 2, b + 3))
+
+    return ''.join(''.join(row).rstrip() + '\n' for row in grid)
+
+
+def test_generate():
+
+    text = generate(10, seed=13)
+    carts = text.count('>') + text.count('<')
+
+    assert carts % 2 == 1
+    assert text.count('/') == text.count('\\') == 20
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -189,8 +189,16 @@ and the furthest top row is Y=0:
 
 In this example, the location of the first crash is 7,3.
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 import itertools
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Optional, Tuple, Set
+
+from aoc import trace
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
 
 
 STATUS = {
@@ -201,30 +209,33 @@ STATUS = {
 }
 
 
-def cars(m: List[List[str]]) -> Dict[Tuple[int, int], Tuple[str, int]]:
+PATH = bytes.maketrans(b"><^v", b"--||")
+
+# The width of the track and the carts on it.
+State = Tuple[int, Dict[Tuple[int, int], Tuple[str, int]]]
+
+
+def cars(m: Grid) -> Dict[Tuple[int, int], Tuple[str, int]]:
 
     result = dict()
-    for i, row in enumerate(m):
-        for j, x in enumerate(row):
+    for i in range(m.rows):
+        for j, x in enumerate(m.row(i).decode()):
             if x in STATUS:
                 result[i, j] = (x, 0)
     return result
 
 
-def path(m: List[List[str]]) -> List[List[str]]:
+def path(m: Grid) -> Grid:
+
+    m.cells[:] = m.cells.translate(PATH)
 
-    for i, row in enumerate(m):
-        for j, x in enumerate(row):
-            if m[i][j] in "><":
-                m[i][j] = '-'
-            if m[i][j] in "^v":
-                m[i][j] = '|'
     return m
 
 
 def move(
     cars: Dict[Tuple[int, int], Tuple[str, int]],
-    path:List[List[str]]
+    path: Grid,
+    recorder: Optional[trace.Recorder] = None
     ) -> Dict[Tuple[int, int], Tuple[str, int]]:
 
     result: Dict[Tuple[int, int], Tuple[str, int]] = dict(cars)
@@ -233,8 +244,9 @@ def move(
 
         symbol, turn = cars[row, col]
         dr, dc = STATUS[symbol]
+        track = chr(path[row + dr, col + dc])
 
-        if path[row + dr][col + dc] == '\\':
+        if track == '\\':
             if symbol == '>':
                 next_symbol, next_turn = 'v', turn
             if symbol == 'v':
@@ -244,7 +256,7 @@ def move(
             if symbol == '^':
                 next_symbol, next_turn = '<', turn
 
-        elif path[row + dr][col + dc] == '/':
+        elif track == '/':
             if symbol == '>':
                 next_symbol, next_turn = '^', turn
             if symbol == 'v':
@@ -254,7 +266,7 @@ def move(
             if symbol == '^':
                 next_symbol, next_turn = '>', turn
 
-        elif path[row + dr][col + dc] == '+':
+        elif track == '+':
 
             if turn % 3 == 0:
                 if symbol == '>':
@@ -279,7 +291,7 @@ def move(
                 if symbol == '^':
                     next_symbol, next_turn = '>', turn + 1
 
-        elif path[row + dr][col + dc] in ['|', '-']:
+        elif track in ['|', '-']:
             next_symbol, next_turn = symbol, turn
 
         else:
@@ -292,9 +304,37 @@ def move(
         else:
             result[row + dr, col + dc] = (next_symbol, next_turn)
 
+        if recorder is not None:
+            moved, turned = result[row + dr, col + dc]
+            recorder.event(
+                trace.MOVE, path.index(row, col),
+                path.index(row + dr, col + dc), ord(moved), turned)
+            if moved == 'X':
+                recorder.event(trace.CRASH, path.index(row + dr, col + dc))
+
     return result
 
 
+def apply_event(state: State, event: trace.Event) -> State:
+
+    width, cars = state
+    if event.kind == trace.MOVE:
+        del cars[divmod(event.a, width)]
+        cars[divmod(event.b, width)] = (chr(event.c), event.d)
+    elif event.kind == trace.REMOVE:
+        del cars[divmod(event.a, width)]
+
+    return state
+
+
+def draw_state(state: State) -> List[str]:
+
+    return [
+        "{},{} {} turn {}".format(col, row, symbol, turn)
+        for (row, col), (symbol, turn) in sorted(state[1].items())
+    ]
+
+
 def test_cars():
 
     example = [
@@ -305,7 +345,7 @@ def test_cars():
         "\\-+-/  \\-+--/",
         "   \\------/  "
     ]
-    example = [list(line) for line in example]
+    example = Grid.from_lines(example)
     init = cars(example)
 
     assert len(init) == 2
@@ -323,9 +363,9 @@ def test_path():
         "\\-+-/  \\-+--/",
         "   \\------/  "
     ]
-    example = [list(line) for line in example]
+    example = Grid.from_lines(example)
 
-    assert len(path(example)) > 0
+    assert path(example).rows > 0
     assert len(cars(path(example))) == 0
 
 
@@ -339,7 +379,7 @@ def test_move():
         "\\-+-/  \\-+--/",
         "  \\------/   "
     ]
-    example = [list(line) for line in example]
+    example = Grid.from_lines(example)
 
     c = cars(example)
     p = path(example)
@@ -356,35 +396,81 @@ def test_move():
 
     assert first_crash == (3, 7)
 
-def read_input(filename: str) -> List[List[str]]:
 
-    result = []
-    with open(filename) as f:
-        for line in f:
-            result.append(list(line))
+def test_trace():
 
-    return result
+    import tempfile
+
+    example = [
+        "/->-\\        ",
+        "|   |  /----\\",
+        "| /-+--+-\\  |",
+        "| | |  | v  |",
+        "\\-+-/  \\-+--/",
+        "  \\------/   "
+    ]
+    example = Grid.from_lines(example)
+    c = cars(example)
+    p = path(example)
 
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "carts.trace")
+        with trace.recording(filename, every=5):
+            recorder = trace.start()
+            states = []
+            for t in range(14):
+                recorder.round(t, lambda: (p.stride, c))
+                states.append(c)
+                c = move(c, p, recorder)
+            recorder.end(14, lambda: (p.stride, c))
 
-if __name__ == "__main__":
+        replay = trace.Replay(filename)
+        for t in (3, 5, 9, 13):
+            assert replay.state(t, apply_event)[1] == states[t]
+        assert replay.state(14, apply_event)[1] == c
+        crashes = [e for e in replay.events() if e.kind == trace.CRASH]
+        assert [(e.round, divmod(e.a, p.stride)) for e in crashes] == \
+            [(13, (3, 7))]
+
+def read_input(filename: Source) -> Grid:
 
-    test_cars()
-    test_path()
-    test_move()
-    print("all tests passed.")
+    with open_input(filename) as f:
+        return Grid.from_lines(f)
 
-    m = read_input("input.txt")
+
+def solve(filename: Source) -> str:
+
+    m = read_input(filename)
     c = cars(m)
     p = path(m)
 
     first_crash = (-1, -1)
+    recorder = trace.start()
 
     for t in range(1000):
 
-        c = move(c, p)
+        if recorder is not None:
+            recorder.round(t, lambda: (p.stride, c))
+        c = move(c, p, recorder)
         crashed = any(v.count('X') for v in c.values())
         if crashed:
             first_crash = next(k for k, v in c.items() if v.count('X'))
             break
 
-    print("answer:", '{},{}'.format(*reversed(first_crash)))
+    if recorder is not None:
+        recorder.end(t + 1, lambda: (p.stride, c))
+
+    return '{},{}'.format(*reversed(first_crash))
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_cars()
+        test_path()
+        test_move()
+        test_trace()
+        print("all tests passed.")
+
+    answer = solve("input.txt")
+    print("answer:", answer)
@@ -49,13 +49,22 @@ its final location is 6,4.
 What is the location of the last cart at the end of the first tick where it is
 the only cart left?
 """
-from part1 import cars, path, read_input, STATUS
-from typing import Dict, Tuple, List
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from part1 import apply_event, cars, draw_state, path, read_input, STATUS
+from typing import Dict, Optional, Tuple
+
+from aoc import trace
+from aoc.grid import Grid
+from aoc.inputs import Source
 
 
 def move(
     cars: Dict[Tuple[int, int], Tuple[str, int]],
-    path:List[List[str]]
+    path: Grid,
+    recorder: Optional[trace.Recorder] = None
     ) -> Dict[Tuple[int, int], Tuple[str, int]]:
 
     result: Dict[Tuple[int, int], Tuple[str, int]] = dict(cars)
@@ -67,8 +76,9 @@ def move(
 
         symbol, turn = cars[row, col]
         dr, dc = STATUS[symbol]
+        track = chr(path[row + dr, col + dc])
 
-        if path[row + dr][col + dc] == '\\':
+        if track == '\\':
             if symbol == '>':
                 next_symbol, next_turn = 'v', turn
             if symbol == 'v':
@@ -78,7 +88,7 @@ def move(
             if symbol == '^':
                 next_symbol, next_turn = '<', turn
 
-        elif path[row + dr][col + dc] == '/':
+        elif track == '/':
             if symbol == '>':
                 next_symbol, next_turn = '^', turn
             if symbol == 'v':
@@ -88,7 +98,7 @@ def move(
             if symbol == '^':
                 next_symbol, next_turn = '>', turn
 
-        elif path[row + dr][col + dc] == '+':
+        elif track == '+':
 
             if turn % 3 == 0:
                 if symbol == '>':
@@ -113,7 +123,7 @@ def move(
                 if symbol == '^':
                     next_symbol, next_turn = '>', turn + 1
 
-        elif path[row + dr][col + dc] in ['|', '-']:
+        elif track in ['|', '-']:
             next_symbol, next_turn = symbol, turn
 
         else:
@@ -123,8 +133,18 @@ def move(
 
         if (row + dr, col + dc) in result:
             del result[row + dr, col + dc]
+            if recorder is not None:
+                crash = path.index(row + dr, col + dc)
+                recorder.event(trace.CRASH, crash)
+                recorder.event(trace.REMOVE, path.index(row, col))
+                recorder.event(trace.REMOVE, crash)
         else:
             result[row + dr, col + dc] = (next_symbol, next_turn)
+            if recorder is not None:
+                recorder.event(
+                    trace.MOVE, path.index(row, col),
+                    path.index(row + dr, col + dc), ord(next_symbol),
+                    next_turn)
 
     return result
 
@@ -147,7 +167,7 @@ def test_remove_crash():
         "  |   ^",
         "  \\<->/",
     ]
-    example = [list(line) for line in example]
+    example = Grid.from_lines(example)
 
     c = cars(example)
     p = path(example)
@@ -161,19 +181,62 @@ def test_remove_crash():
     assert next(iter(c.keys())) == (4, 6)
 
 
-if __name__ == "__main__":
+def test_trace():
+
+    import tempfile
 
-    test_remove_crash()
-    print("all tests passed.")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "carts.trace")
+        with open(filename, "w") as f:
+            f.write("\n".join([
+                "/>-<\\  ",
+                "|   |  ",
+                "| /<+-\\",
+                "| | | v",
+                "\\>+</ |",
+                "  |   ^",
+                "  \\<->/",
+            ]))
+        with trace.recording(filename + ".trace", every=1):
+            assert solve(filename) == "6,4"
 
-    m = read_input("input.txt")
+        replay = trace.Replay(filename + ".trace")
+        assert replay.rounds() == 3
+        assert draw_state(replay.state(3, apply_event)) == ["6,4 ^ turn 0"]
+        assert len(replay.state(1, apply_event)[1]) == 3
+        assert sum(e.kind == trace.CRASH for e in replay.events()) == 4
+
+
+def solve(filename: Source) -> str:
+
+    m = read_input(filename)
     c = cars(m)
     p = path(m)
 
+    recorder = trace.start()
+    ticks = 0
+
     while len(c) > 1:
 
-        c = move(c, p)
+        if recorder is not None:
+            recorder.round(ticks, lambda: (p.stride, c))
+        c = move(c, p, recorder)
         while any(v.count('X') for v in c.values()):
             c = remove_crash(c)
+        ticks += 1
+
+    if recorder is not None:
+        recorder.end(ticks, lambda: (p.stride, c))
+
+    return '{},{}'.format(*reversed(next(iter(c.keys()))))
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_remove_crash()
+        test_trace()
+        print("all tests passed.")
 
-    print("answer:", '{},{}'.format(*reversed(next(iter(c.keys())))))
+    answer = solve("input.txt")
+    print("answer:", answer)
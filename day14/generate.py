@@ -0,0 +1,38 @@
+"""
+Generates recipe counts for day 14 at a chosen size.
+
+    python generate.py 100000 > input.txt
+
+The input is a random number between the size and twice the size: part one
+scores the recipes after that many, and part two looks for its digits on the
+scoreboard, so round sizes like 10000 are avoided as inputs.
+"""
+import random
+import sys
+
+
+SIZES = [10000, 100000, 1000000]
+
+# Size of the input aoc.regress times; part two needs about ten million
+# recipes to find a seven digit sequence, which is too slow to repeat.
+REFERENCE_SIZE = 100000
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+
+    return "{}\n".format(rng.randint(size, 2 * size - 1))
+
+
+def test_generate():
+
+    assert 2018 <= int(generate(2018)) < 4036
+    assert generate(2018, seed=1) == generate(2018, seed=1)
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
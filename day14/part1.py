@@ -69,6 +69,21 @@ example:
 What are the scores of the ten recipes immediately after the number of recipes
 in your puzzle input?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
+from aoc.inputs import Source, open_input
+
+
+def read_input(filename: Source) -> str:
+
+    with open_input(filename) as f:
+        result = f.read().strip()
+
+    return result
+
 
 def process(n: int) -> str:
 
@@ -92,11 +107,16 @@ def test_process():
     assert process(2018) == "5941429882"
 
 
+def solve(filename: Source) -> str:
+
+    return process(int(read_input(filename)))
+
+
 if __name__ == "__main__":
 
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_process()
+        print("all tests passed.")
 
-    n = input("Enter your puzzle input: ")
-    answer = process(int(n))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -13,6 +13,16 @@ whose scores are the digits from your puzzle input.
 How many recipes appear on the scoreboard to the left of the score sequence in
 your puzzle input?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+
+from part1 import read_input
+
+from aoc.inputs import Source
+
+
 def process(n: str) -> int:
 
     scores = [3, 7]
@@ -43,11 +53,16 @@ def test_process():
     assert process("59414") == 2018
 
 
+def solve(filename: Source) -> int:
+
+    return process(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_process()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_process()
+        print("all tests passed.")
 
-    n = input("Enter your puzzle input: ")
-    answer = process(n.strip())
+    answer = solve("input.txt")
     print("answer:", answer)
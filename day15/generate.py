@@ -0,0 +1,60 @@
+"""
+Generates cave maps for day 15 at a chosen size.
+
+    python generate.py 32 > big.txt
+
+The size is the side of the square map. The open cavern is carved by a
+random walk from the centre, so every unit can reach every other one, and
+about one in thirty open squares holds a unit.
+"""
+import random
+import sys
+
+
+SIZES = [12, 16, 24, 32]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    if size < 5:
+        raise ValueError("day 15 needs a map of at least 5x5")
+
+    rng = random.Random(seed)
+    grid = [['#'] * size for _ in range(size)]
+
+    row = col = size // 2
+    open_squares = set()
+    while len(open_squares) < (size - 2) ** 2 // 2:
+        for dr in (0, 1):
+            for dc in (0, 1):
+                if 0 < row + dr < size - 1 and 0 < col + dc < size - 1:
+                    grid[row + dr][col + dc] = '.'
+                    open_squares.add((row + dr, col + dc))
+        dr, dc = rng.choice([(-1, 0), (1, 0), (0, -1), (0, 1)])
+        if 0 < row + dr < size - 1 and 0 < col + dc < size - 1:
+            row, col = row + dr, col + dc
+
+    squares = sorted(open_squares)
+    n = max(1, len(squares) // 60)
+    units = rng.sample(squares, 2 * n)
+    for r, c in units[:n]:
+        grid[r][c] = 'G'
+    for r, c in units[n:]:
+        grid[r][c] = 'E'
+
+    return ''.join(''.join(row) + '\n' for row in grid)
+
+
+def test_generate():
+
+    text = generate(16, seed=15)
+
+    assert text.count('G') == text.count('E') > 0
+    assert all(len(line) == 16 for line in text.splitlines())
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -350,8 +350,23 @@ Outcome: 20 * 937 = 18740
 
 What is the outcome of the combat described in your puzzle input?
 """
-from collections import deque
-from typing import List, Dict, Tuple, Deque, Set
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from array import array
+from typing import List, Dict, Optional, Sequence, Set, Tuple
+
+from aoc import trace
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
+from aoc.search import UNREACHED, grid_bfs
+
+
+OPEN = ord('.')
+
+# The board and the type and hit points of each unit by board index.
+State = Tuple[Grid, Dict[int, Tuple[str, int]]]
 
 
 class Mob:
@@ -370,9 +385,10 @@ class Board:
 
     def __init__(self) -> None:
 
-        self.board = [['.'] * 10 for _ in range(10)]
+        self.board = Grid(10, 10, fill='.', pad=1)
         self.mobs: Dict[Tuple[int, int], Mob] = dict()
         self.rounds = 0
+        self.recorder: Optional[trace.Recorder] = None
 
     @property
     def sum_remaining_hp(self) -> int:
@@ -384,24 +400,26 @@ class Board:
 
         return self.rounds * self.sum_remaining_hp
 
-    def read_from_file(self, filename: str) -> List[List[str]]:
+    def read_from_file(self, filename: Source) -> Grid:
 
-        with open(filename) as f:
-            self.board = [list(line.strip()) for line in f]
+        with open_input(filename) as f:
+            self.board = Grid.from_lines(
+                [line.strip() for line in f], pad=1, fill='#')
 
         return self.board
 
-    def read_from_array(self, array: List[List[str]]) -> List[List[str]]:
+    def read_from_array(self, array: Sequence[Sequence[str]]) -> Grid:
 
-        self.board = array
+        self.board = Grid.from_lines(
+            [''.join(row) for row in array], pad=1, fill='#')
 
         return self.board
 
     def print_board(self) -> None:
 
         print("After {} rounds:".format(self.rounds))
-        for i, r in enumerate(self.board):
-            line = ''.join(r) + ' ' * 4
+        for i, r in enumerate(self.board.lines()):
+            line = r + ' ' * 4
             for j, c in enumerate(r):
                 if c == 'G':
                     line += "G(" + str(self.mobs[i, j].hp) + ") "
@@ -409,9 +427,16 @@ class Board:
                     line += "E(" + str(self.mobs[i, j].hp) + ") "
             print(line)
 
+    def snapshot(self) -> State:
+
+        return self.board.copy(), {
+            self.board.index(*position): (mob.type, mob.hp)
+            for position, mob in self.mobs.items() if mob.alive
+        }
+
     def get_mobs(self) -> Dict[Tuple[int, int], Mob]:
 
-        for i, r in enumerate(self.board):
+        for i, r in enumerate(self.board.lines()):
             for j, c in enumerate(r):
                 if c == 'G':
                     self.mobs[i, j] = Mob('G', i, j)
@@ -429,10 +454,21 @@ class Board:
 
     def play(self) -> None:
 
+        self.recorder = trace.start()
+        self._play()
+        if self.recorder is not None:
+            self.recorder.end(self.rounds, self.snapshot)
+
+    def _play(self) -> None:
+
         mobs = self.get_mobs()
+        recorder = self.recorder
 
         while self.are_both_teams_alive():
 
+            if recorder is not None:
+                recorder.round(self.rounds, self.snapshot)
+
             remaining = sorted(
                 [k for k, v in self.mobs.items() if v.alive],
                 reverse=True
@@ -456,10 +492,14 @@ class Board:
                         remaining.remove(enemy)
                     continue
 
-                self.board[row][col] = '.'
+                self.board[row, col] = '.'
                 new_row, new_col = self.move_mob(row, col)
+                if recorder is not None and (new_row, new_col) != (row, col):
+                    recorder.event(
+                        trace.MOVE, self.board.index(row, col),
+                        self.board.index(new_row, new_col))
                 self.mobs[new_row, new_col] = self.mobs.pop((row, col))
-                self.board[new_row][new_col] = self.mobs[new_row, new_col].type
+                self.board[new_row, new_col] = self.mobs[new_row, new_col].type
 
                 in_range_targets = self.get_in_range_targets(new_row, new_col)
                 if in_range_targets:
@@ -471,7 +511,6 @@ class Board:
 
             self.rounds += 1
 
-
     def get_in_range_targets(
         self,
         row: int,
@@ -500,13 +539,35 @@ class Board:
         ) -> bool:
 
         self.mobs[enemy_row, enemy_col].hp -= self.mobs[mob_row, mob_col].power
+        if self.recorder is not None:
+            self.recorder.event(
+                trace.ATTACK, self.board.index(mob_row, mob_col),
+                self.board.index(enemy_row, enemy_col),
+                self.mobs[mob_row, mob_col].power,
+                self.mobs[enemy_row, enemy_col].hp)
         if self.mobs[enemy_row, enemy_col].hp <= 0:
-            self.board[enemy_row][enemy_col] = '.'
+            self.board[enemy_row, enemy_col] = '.'
             self.mobs[enemy_row, enemy_col].alive = False
+            if self.recorder is not None:
+                self.recorder.event(
+                    trace.DEATH, self.board.index(enemy_row, enemy_col))
             return True
 
         return False
 
+    def distances(
+        self,
+        start: int,
+        targets: Optional[Set[int]] = None
+        ) -> array:
+        """
+        Steps from a board index to every open square it can reach, stopping
+        after the first distance at which any of the targets is reached.
+        """
+        return grid_bfs(
+            self.board.cells, self.board.offsets(), [start], OPEN, targets
+        ).distance
+
     def move_mob(self, row: int, col: int) -> Tuple[int, int]:
 
         cur = (row, col)
@@ -518,69 +579,67 @@ class Board:
             if self.mobs[cur].type != self.mobs[x].type and self.mobs[x].alive
         ]
 
-        offsets = [(-1, 0), (0, -1), (0, 1), (1, 0)]
-        in_range = []
+        board = self.board
+        cells, offsets = board.cells, board.offsets()
+
+        in_range = set()
         for r, c in enemies:
-            for dr, dc in offsets:
-                if self.board[r + dr][c + dc] == '.':
-                    in_range.append((r + dr, c + dc))
-
-        reachable = dict()
-        q: Deque[Tuple[int, int, int]] = deque()
-        q.append((row, col, 0))
-        visited: Set[Tuple[int, int]] = set()
-        while q:
-            r, c, d = q.popleft()
-            if (r, c) in visited:
-                continue
-            visited.add((r, c))
-            if (r, c) in in_range:
-                reachable[r, c] = d
-            for dr, dc in offsets:
-                if (0 <= r + dr < len(self.board)
-                    and 0 <= c + dc < len(self.board[0])
-                    and self.board[r + dr][c + dc] == '.'):
-                    q.append((r + dr, c + dc, d + 1))
-
-        nearest = [
-            k for k, v in reachable.items() if v == min(reachable.values())
-        ]
-        if not nearest:
+            i = board.index(r, c)
+            for offset in offsets:
+                if cells[i + offset] == OPEN:
+                    in_range.add(i + offset)
+
+        start = board.index(row, col)
+        distance = self.distances(start, in_range)
+        reachable = [k for k in in_range if distance[k] != UNREACHED]
+        if not reachable:
             return row, col
 
-        nearest.sort()
-        chosen = nearest[0]
-
-        distance = {
-            (row + dr, col + dc): float('inf') for dr, dc in offsets
-        }
-        q = deque()
-        q.append((*chosen, 0))
-        visited = set()
-        while q:
-            r, c, d = q.popleft()
-            if (r, c) in visited:
-                continue
-            visited.add((r, c))
-            if (r, c) in distance:
-                distance[r, c] = d
-            for dr, dc in offsets:
-                if (0 <= r + dr < len(self.board)
-                    and 0 <= c + dc < len(self.board[0])
-                    and self.board[r + dr][c + dc] == '.'):
-                    q.append((r + dr, c + dc, d + 1))
+        # Flat indices are in reading order, so ties go to the smallest.
+        chosen = min(reachable, key=lambda k: (distance[k], k))
 
+        distance = self.distances(chosen)
         step = [
-            k for k, v in distance.items()
-            if v < float('inf') and v == min(distance.values())
+            start + offset for offset in offsets
+            if distance[start + offset] != UNREACHED
         ]
-        step.sort()
         if step:
-            return step[0]
+            return board.position(min(step, key=lambda k: (distance[k], k)))
 
         return row, col
 
 
+def apply_event(state: State, event: trace.Event) -> State:
+
+    board, units = state
+    if event.kind == trace.MOVE:
+        units[event.b] = units.pop(event.a)
+        board.cells[event.b] = board.cells[event.a]
+        board.cells[event.a] = OPEN
+    elif event.kind == trace.ATTACK:
+        units[event.b] = (units[event.b][0], event.d)
+    elif event.kind == trace.DEATH:
+        del units[event.a]
+        board.cells[event.a] = OPEN
+
+    return state
+
+
+def draw_state(state: State) -> List[str]:
+
+    board, units = state
+    result = []
+    for row, line in enumerate(board.lines()):
+        start = board.index(row, 0)
+        hit_points = [
+            "{}({})".format(*units[start + col])
+            for col in range(len(line)) if start + col in units
+        ]
+        result.append((line + "   " + ", ".join(hit_points)).rstrip())
+
+    return result
+
+
 def test_all():
 
     example = [
@@ -603,7 +662,6 @@ def test_all():
         "#....G#",
         "#######"
     ]
-    result = [list(row) for row in result]
 
     board = Board()
     board.read_from_array(example)
@@ -611,7 +669,7 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 47
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.mobs[1, 1].hp == 200
     assert board.mobs[2, 2].hp == 131
     assert board.mobs[3, 5].hp == 59
@@ -642,7 +700,6 @@ def test_all():
         "#.....#",
         "#######"
     ]
-    result = [list(row) for row in result]
 
     board = Board()
     board.read_from_array(example)
@@ -650,7 +707,7 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 37
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.sum_remaining_hp == 982
     assert board.outcome == 36334
 
@@ -674,7 +731,6 @@ def test_all():
         "#...#.#",
         "#######"
     ]
-    result = [list(row) for row in result]
 
     board = Board()
     board.read_from_array(example)
@@ -682,7 +738,7 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 46
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.sum_remaining_hp == 859
     assert board.outcome == 39514
 
@@ -706,7 +762,6 @@ def test_all():
         "#...G.#",
         "#######"
     ]
-    result = [list(row) for row in result]
 
     board = Board()
     board.read_from_array(example)
@@ -714,7 +769,7 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 35
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.sum_remaining_hp == 793
     assert board.outcome == 27755
 
@@ -738,7 +793,6 @@ def test_all():
         "#G.G#G#",
         "#######"
     ]
-    result = [list(row) for row in result]
 
     board = Board()
     board.read_from_array(example)
@@ -746,7 +800,7 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 54
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.sum_remaining_hp == 536
     assert board.outcome == 28944
 
@@ -774,7 +828,6 @@ def test_all():
         "#.......#",
         "#########"
     ]
-    result = [list(row) for row in result]
 
     board = Board()
     board.read_from_array(example)
@@ -782,18 +835,66 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 20
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.sum_remaining_hp == 937
     assert board.outcome == 18740
 
 
-if __name__ == "__main__":
+def test_trace():
+
+    import tempfile
 
-    test_all()
-    print("all tests passed.")
+    example = [
+        "#######",
+        "#.G...#",
+        "#...EG#",
+        "#.#.#G#",
+        "#..G#E#",
+        "#.....#",
+        "#######"
+    ]
+
+    after_23_rounds = [
+        "#######",
+        "#...G.#   G(200)",
+        "#..G.G#   G(200), G(131)",
+        "#.#.#G#   G(131)",
+        "#...#E#   E(131)",
+        "#.....#",
+        "#######"
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "combat.trace")
+        board = Board()
+        board.read_from_array(example)
+        with trace.recording(path, every=10):
+            board.play()
+
+        replay = trace.Replay(path)
+        assert replay.rounds() == 47
+        assert draw_state(replay.state(23, apply_event)) == after_23_rounds
+        final = replay.state(47, apply_event)
+        assert final[0].lines() == board.board.lines()
+        assert draw_state(final) == draw_state(board.snapshot())
+        assert sum(1 for e in replay.events() if e.kind == trace.DEATH) == 2
+
+
+def solve(filename: Source) -> int:
 
     board = Board()
-    board.read_from_file("input.txt")
+    board.read_from_file(filename)
     board.play()
-    board.print_board()
-    print("answer:", board.outcome)
+
+    return board.outcome
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_all()
+        test_trace()
+        print("all tests passed.")
+
+    answer = solve("input.txt")
+    print("answer:", answer)
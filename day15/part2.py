@@ -1,6 +1,12 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import Dict, Tuple, List
 from part1 import Board, Mob
 
+from aoc.inputs import Source, open_input
+
 
 class PowerMob(Mob):
 
@@ -24,7 +30,7 @@ class PowerBoard(Board):
 
     def get_mobs(self) -> Dict[Tuple[int, int], Mob]:
 
-        for i, r in enumerate(self.board):
+        for i, r in enumerate(self.board.lines()):
             for j, c in enumerate(r):
                 if c == 'G':
                     self.mobs[i, j] = Mob('G', i, j)
@@ -79,7 +85,6 @@ def test_all():
         "#.....#",
         "#######"
     ]
-    result = [list(row) for row in result]
 
     t = find_lowest_attack_power_for_elves(example)
     board = PowerBoard(t)
@@ -88,7 +93,7 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 29
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.sum_remaining_hp == 172
     assert board.outcome == 4988
 
@@ -112,7 +117,6 @@ def test_all():
         "#...#.#",
         "#######"
     ]
-    result = [list(row) for row in result]
 
     t = find_lowest_attack_power_for_elves(example)
     board = PowerBoard(t)
@@ -121,22 +125,28 @@ def test_all():
     board.print_board()
 
     assert board.rounds == 33
-    assert board.board == result
+    assert board.board.lines() == result
     assert board.sum_remaining_hp == 948
     assert board.outcome == 31284
 
 
-if __name__ == "__main__":
-
-    test_all()
-    print("all tests passed.")
+def solve(filename: Source) -> int:
 
+    with open_input(filename) as f:
+        t = find_lowest_attack_power_for_elves([list(line) for line in f])
 
-    t = find_lowest_attack_power_for_elves(
-        [list(line) for line in open("input.txt")]
-    )
     board = PowerBoard(t)
-    board.read_from_file("input.txt")
+    board.read_from_file(filename)
     board.play()
-    board.print_board()
-    print("answer:", board.outcome)
+
+    return board.outcome
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_all()
+        print("all tests passed.")
+
+    answer = solve("input.txt")
+    print("answer:", answer)
@@ -0,0 +1,98 @@
+"""
+Generates opcode samples and a test program for day 16 at a chosen size.
+
+    python generate.py 4000 > big.txt
+
+The size is the number of samples; the program that follows is as long.
+Samples are drawn so that the opcodes can be pinned down one at a time, in
+some order, the way match_opcode resolves them. The program avoids the
+multiplying opcodes so that register values stay small.
+"""
+import itertools
+import os
+import random
+import sys
+from typing import List, Set, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc.elfcode import OPCODES, execute
+
+
+SIZES = [1000, 4000, 16000, 64000]
+
+SAFE_OPERATORS = [1, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15]
+
+
+def samples_by_operator() -> List[List[Tuple[List[int], List[int], Set[int]]]]:
+    """
+    Every sample with register values and arguments between 0 and 3, grouped
+    by the operator that produced it, with the set of operators it matches.
+    """
+    result: List[List[Tuple[List[int], List[int], Set[int]]]] = [
+        [] for _ in OPCODES
+    ]
+    for before in itertools.product(range(4), repeat=4):
+        for args in itertools.product(range(4), repeat=3):
+            outputs = [
+                execute(op, before, *args) for op in range(len(OPCODES))]
+            for j, after in enumerate(outputs):
+                matches = {k for k, x in enumerate(outputs) if x == after}
+                result[j].append((list(before), list(args), matches))
+
+    return result
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    if size < len(OPCODES):
+        raise ValueError("day 16 needs at least one sample per opcode")
+
+    rng = random.Random(seed)
+    opcodes = rng.sample(range(len(OPCODES)), len(OPCODES))
+    samples = samples_by_operator()
+
+    # Find an order in which every operator has samples that only match
+    # itself and the operators resolved before it.
+    while True:
+        order = rng.sample(range(len(OPCODES)), len(OPCODES))
+        pools = [
+            [s for s in samples[j] if s[2] <= set(order[:k + 1])]
+            for k, j in enumerate(order)
+        ]
+        if all(pools):
+            break
+
+    lines = []
+    for i in range(size):
+        k = i % len(order)
+        before, args, _ = rng.choice(pools[k])
+        instr = [opcodes[order[k]]] + args
+        after = execute(order[k], before, *args)
+        lines.append("Before: {}".format(before))
+        lines.append(' '.join(str(x) for x in instr))
+        lines.append("After:  {}".format(after))
+        lines.append("")
+
+    lines.extend(["", ""])
+    for _ in range(size):
+        op = rng.choice(SAFE_OPERATORS)
+        lines.append(' '.join(str(x) for x in
+            [opcodes[op]] + [rng.randint(0, 3) for _ in range(3)]))
+
+    return '\n'.join(lines) + '\n'
+
+
+def test_generate():
+
+    lines = generate(32, seed=16).splitlines()
+
+    assert sum(line.startswith("Before:") for line in lines) == 32
+    assert len(lines) == 32 * 4 + 2 + 32
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
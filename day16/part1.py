@@ -118,105 +118,15 @@ input) - you can ignore it for now.
 Ignoring the opcode numbers, how many samples in your puzzle input behave like 
 three or more opcodes?
 """
-from functools import partial
-import operator
-from typing import List, Callable, Tuple
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import List, Tuple
 
-def op_register(op: Callable, reg: List[int], instr: List[int]) -> List[int]:
+from aoc.elfcode import OPCODES, execute
+from aoc.inputs import Source, open_input
 
-    reg_a, reg_b = reg[instr[1]], reg[instr[2]]
-    reg[instr[3]] = op(reg_a, reg_b)
-
-    return reg
-
-
-def op_immediate(op: Callable, reg: List[int], instr: List[int]) -> List[int]:
-
-    reg_a, val_b = reg[instr[1]], instr[2]
-    reg[instr[3]] = op(reg_a, val_b)
-
-    return reg
-
-
-ADDR = partial(op_register, operator.add)
-ADDI = partial(op_immediate, operator.add)
-MULR = partial(op_register, operator.mul)
-MULI = partial(op_immediate, operator.mul)
-BANR = partial(op_register, operator.and_)
-BANI = partial(op_immediate, operator.and_)
-BORR = partial(op_register, operator.or_)
-BORI = partial(op_immediate, operator.or_)
-
-
-def setr(reg: List[int], instr: List[int]) -> List[int]:
-
-    reg_a = reg[instr[1]]
-    reg[instr[3]] = reg_a
-
-    return reg
-
-
-def seti(reg: List[int], instr: List[int]) -> List[int]:
-
-    val_a = instr[1]
-    reg[instr[3]] = val_a
-
-    return reg
-
-
-SETR = setr
-SETI = seti
-
-
-def cmp_immediate_register(
-    cmp: Callable,
-    reg: List[int],
-    instr: List[int]
-    ) -> List[int]:
-
-    val_a, reg_b = instr[1], reg[instr[2]]
-    reg[instr[3]] = 1 if cmp(val_a, reg_b) else 0
-
-    return reg
-
-
-def cmp_register_immediate(
-    cmp: Callable,
-    reg: List[int],
-    instr: List[int]
-    ) -> List[int]:
-
-    reg_a, val_b = reg[instr[1]], instr[2]
-    reg[instr[3]] = 1 if cmp(reg_a, val_b) else 0
-
-    return reg
-
-
-def cmp_register_register(
-    cmp: Callable,
-    reg: List[int],
-    instr: List[int]
-    ) -> List[int]:
-
-    reg_a, reg_b = reg[instr[1]], reg[instr[2]]
-    reg[instr[3]] = 1 if cmp(reg_a, reg_b) else 0
-
-    return reg
-
-
-GTIR = partial(cmp_immediate_register, operator.gt)
-GTRI = partial(cmp_register_immediate, operator.gt)
-GTRR = partial(cmp_register_register, operator.gt)
-EQIR = partial(cmp_immediate_register, operator.eq)
-EQRI = partial(cmp_register_immediate, operator.eq)
-EQRR = partial(cmp_register_register, operator.eq)
-
-
-OPERATORS = [
-    ADDR, ADDI, MULR, MULI, BANR, BANI, BORR, BORI,
-    SETR, SETI, GTIR, GTRI, GTRR, EQIR, EQRI, EQRR
-]
 
 def count_opcodes(
     instr: List[int],
@@ -224,17 +134,21 @@ def count_opcodes(
     after: List[int]
     ) -> int:
 
+    _, a, b, c = instr
 
-    return sum(op(list(before), instr) == after for op in OPERATORS)
+    return sum(
+        execute(opcode, before, a, b, c) == after
+        for opcode in range(len(OPCODES))
+    )
 
 
 def read_input(
-    filename: str
+    filename: Source
     ) -> Tuple[List[List[int]], List[List[int]], List[List[int]]]:
 
     before, instr, after = [], [], []
 
-    with open(filename) as f:
+    with open_input(filename) as f:
         lines = f.readlines()
 
     for i in range(len(lines)):
@@ -255,9 +169,9 @@ def read_input(
 
 def test_opcodes():
 
-    assert ADDI([3, 2, 1, 1], [9, 2, 1, 2]) == [3, 2, 2, 1]
-    assert MULR([3, 2, 1, 1], [9, 2, 1, 2]) == [3, 2, 2, 1]
-    assert SETI([3, 2, 1, 1], [9, 2, 1, 2]) == [3, 2, 2, 1]
+    assert execute(OPCODES.index("addi"), [3, 2, 1, 1], 2, 1, 2) == [3, 2, 2, 1]
+    assert execute(OPCODES.index("mulr"), [3, 2, 1, 1], 2, 1, 2) == [3, 2, 2, 1]
+    assert execute(OPCODES.index("seti"), [3, 2, 1, 1], 2, 1, 2) == [3, 2, 2, 1]
 
 
 def test_count_opcodes():
@@ -265,14 +179,22 @@ def test_count_opcodes():
     assert count_opcodes([9, 2, 1, 2], [3, 2, 1, 1], [3, 2, 2, 1]) == 3
 
 
-if __name__ == "__main__":
+def solve(filename: Source) -> int:
 
-    test_opcodes()
-    test_count_opcodes()
-    print("all tests passed")
-
-    instr_list, before_list, after_list = read_input("input.txt")
+    instr_list, before_list, after_list = read_input(filename)
     answer = 0
     for instr, before, after in zip(instr_list, before_list, after_list):
         answer += 1 if count_opcodes(instr, before, after) >= 3 else 0
+
+    return answer
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_opcodes()
+        test_count_opcodes()
+        print("all tests passed")
+
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -6,32 +6,40 @@ the test program (the second section of your puzzle input).
 
 What value is contained in register 0 after executing the test program?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from collections import defaultdict
-from typing import List, Dict, Callable
-from part1 import OPERATORS, read_input
+from typing import List, Dict
+from part1 import read_input
+
+from aoc.cache import artifact
+from aoc.elfcode import OPCODES, VM, Program, execute
+from aoc.inputs import Source, open_input
 
 
 def match_opcode(
     instr_list: List[List[int]],
     before_list: List[List[int]],
     after_list: List[List[int]]
-    ) -> Dict[int, Callable]:
+    ) -> Dict[int, int]:
 
     candidates: Dict[int, List[int]] = defaultdict(list)
     
     for instr, before, after in zip(instr_list, before_list, after_list):
-        for i in range(len(OPERATORS)):
-            operator = OPERATORS[i]
-            if operator(list(before), instr) == after:
+        _, a, b, c = instr
+        for i in range(len(OPCODES)):
+            if execute(i, before, a, b, c) == after:
                 candidates[instr[0]].append(i)
 
-    result: Dict[int, Callable] = dict()
+    result: Dict[int, int] = dict()
 
     while candidates:
         for i in list(candidates.keys()):
             if len(set(candidates[i])) == 1:
                 idx = candidates[i][0]
-                result[i] = OPERATORS[idx]
+                result[i] = idx
                 for j in list(candidates.keys()):
                     candidates[j] = [x for x in candidates[j] if x != idx]
                     if not candidates[j]:
@@ -40,9 +48,9 @@ def match_opcode(
     return result
 
 
-def read_input_second_section(filename:str) -> List[List[int]]:
+def read_input_second_section(filename: Source) -> List[List[int]]:
 
-    with open(filename) as f:
+    with open_input(filename) as f:
         lines = f.readlines()
 
     i = 0
@@ -57,14 +65,22 @@ def read_input_second_section(filename:str) -> List[List[int]]:
 
     return result
 
+def solve(filename: Source) -> int:
+
+    instr_list, before_list, after_list = read_input(filename)
+    opcodes = artifact(
+        "opcode table",
+        lambda: match_opcode(instr_list, before_list, after_list))
+    program = Program(
+        (opcodes[op], a, b, c)
+        for op, a, b, c in read_input_second_section(filename))
+    vm = VM(program, after_list[-1])
+    vm.run()
+
+    return vm.registers[0]
+
+
 if __name__ == "__main__":
 
-    instr_list, before_list, after_list = read_input("input.txt")
-    opcodes = match_opcode(instr_list, before_list, after_list)
-    register = after_list[-1]
-    instructions = read_input_second_section("input.txt")
-    for instr in instructions:
-        operator = opcodes[instr[0]]
-        register = operator(list(register), instr)
-    
-    print("answer:", register[0])
+    answer = solve("input.txt")
+    print("answer:", answer)
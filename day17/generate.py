@@ -0,0 +1,58 @@
+"""
+Generates clay scans for day 17 at a chosen size.
+
+    python generate.py 300 > big.txt
+
+The size is the number of clay veins. They come in threes, forming open
+buckets that do not touch each other, scattered below the spring at x=500.
+"""
+import random
+import sys
+
+
+SIZES = [30, 90, 300, 900]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    buckets = max(1, size // 3)
+    width, height = 60 + buckets, 10 * buckets + 20
+
+    taken = set()
+    lines = []
+    while len(lines) < 3 * buckets:
+        w, h = rng.randint(2, 16), rng.randint(2, 12)
+        left = rng.randint(500 - width // 2, 500 + width // 2 - w)
+        top = rng.randint(2, height - h)
+        cells = {
+            (x, y)
+            for x in range(left - 2, left + w + 3)
+            for y in range(top - 2, top + h + 3)
+        }
+        if cells & taken:
+            continue
+        taken |= cells
+        bottom, right = top + h, left + w
+        lines.append("x={}, y={}..{}".format(left, top, bottom))
+        lines.append("x={}, y={}..{}".format(right, top, bottom))
+        lines.append("y={}, x={}..{}".format(bottom, left, right))
+
+    rng.shuffle(lines)
+
+    return ''.join(line + '\n' for line in lines)
+
+
+def test_generate():
+
+    lines = generate(30, seed=17).splitlines()
+
+    assert len(lines) == 30
+    assert sum(line.startswith('y') for line in lines) == 10
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
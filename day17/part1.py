@@ -185,10 +185,20 @@ reach is 57.
 
 How many tiles can the water reach within the range of y values in your scan?
 """
-from typing import List, Tuple
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import List
 
-def create_grid(scan: List[str]) -> List[List[str]]:
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
+
+
+SPRING, FLOWING, SETTLED, CLAY, SAND = b"+|~#."
+
+
+def create_grid(scan: List[str]) -> Grid:
 
     coord = []
     for line in scan:
@@ -210,75 +220,93 @@ def create_grid(scan: List[str]) -> List[List[str]]:
     min_x = min(x for x, y in coord)
     max_x = max(x for x, y in coord)
 
-    grid = [['.'] * (max_x - min_x + 3) for _ in range(max_y - min_y + 1)]
+    grid = Grid(max_y - min_y + 1, max_x - min_x + 3, fill='.')
 
-    grid[0][500 - min_x + 1] = '+'
+    grid[0, 500 - min_x + 1] = '+'
 
     for x, y in coord:
-        grid[y][x - min_x + 1] = '#'
+        grid[y, x - min_x + 1] = '#'
 
     return grid
 
 
-def fill_water(grid: List[List[str]]) -> None:
+def find_source(grid: Grid) -> int:
+    """
+    Index of the sand square below the spring or flowing water in the lowest
+    row that can still fall, the leftmost one in that row; -1 if none can.
+    """
+    cells, stride = grid.cells, grid.stride
+    spring = cells.find(SPRING)
+
+    end = len(cells) - stride
+    while end > 0:
+        k = cells.rfind(FLOWING, 0, end)
+        if spring < end:
+            k = max(k, spring)
+        if k < 0:
+            break
+        if cells[k + stride] == SAND:
+            for j in range(k - k % stride, k + 1):
+                if cells[j] in (SPRING, FLOWING) and cells[j + stride] == SAND:
+                    return j + stride
+        end = k
+
+    return -1
+
 
-    x, y = 0, 0
+def fill_water(grid: Grid) -> None:
 
-    for i in range(len(grid) - 1):
-        for j in range(len(grid[i])):
-            if ((grid[i][j] == '+' and grid[i + 1][j] == '.') or
-                (grid[i][j] == '|' and grid[i + 1][j] == '.')):
-                x, y = j, i + 1
-                break
+    cells, stride, m = grid.cells, grid.stride, grid.rows
 
-    if x == y == 0:
+    source = find_source(grid)
+    if source < 0:
         return
 
-    while 0 < y < len(grid):
+    y, x = divmod(source, stride)
 
-        while y < len(grid) and grid[y][x] == '.':
-            grid[y][x] = '|'
+    while 0 < y < m:
+
+        while y < m and cells[y * stride + x] == SAND:
+            cells[y * stride + x] = FLOWING
             y += 1
 
+        here, above = y * stride, (y - 1) * stride
+
         left = right = x
-        while (0 <= y < len(grid) and left >= 0
-            and grid[y][left] in '#~' and grid[y - 1][left] in '.|'):
+        while (0 <= y < m and left >= 0
+            and cells[here + left] in b'#~' and cells[above + left] in b'.|'):
             left -= 1
 
-        while (0 <= y < len(grid) and right < len(grid[y])
-            and grid[y][right] in '#~' and grid[y - 1][right] in '.|'):
+        while (0 <= y < m and right < stride
+            and cells[here + right] in b'#~' and cells[above + right] in b'.|'):
             right += 1
 
-        if grid[y - 1][left] == '#' and grid[y - 1][right] == '#':
-            for i in range(left + 1, right):
-                grid[y - 1][i] = '~'
+        if cells[above + left] == CLAY and cells[above + right] == CLAY:
+            cells[above + left + 1:above + right] = b'~' * (right - left - 1)
             y -= 1
-        elif grid[y - 1][left] == '#':
-            for i in range(left + 1, right + 1):
-                grid[y - 1][i] = '|'
+        elif cells[above + left] == CLAY:
+            cells[above + left + 1:above + right + 1] = b'|' * (right - left)
             return
-        elif grid[y - 1][right] == '#':
-            for i in range(left, right):
-                grid[y - 1][i] = '|'
+        elif cells[above + right] == CLAY:
+            cells[above + left:above + right] = b'|' * (right - left)
             return
         else:
-            for i in range(left, right + 1):
-                grid[y - 1][i] = '|'
+            cells[above + left:above + right + 1] = b'|' * (right - left + 1)
             return
 
 
-def count_tiles(grid: List[List[str]]) -> int:
+def count_tiles(grid: Grid) -> int:
 
     prev_count = 0
     while True:
         fill_water(grid)
-        curr_count = sum(sum(x.count(c) for x in grid) for c in '~|')
+        curr_count = grid.count('~') + grid.count('|')
         if curr_count == prev_count:
             break
         prev_count = curr_count
 
-    first_clay_line = next(i for i, x in enumerate(grid) if '#' in x)
-    ignore_tiles = sum(x.count('|') for x in grid[:first_clay_line])
+    first_clay_line = grid.cells.find(CLAY) // grid.stride
+    ignore_tiles = grid.cells.count(FLOWING, 0, first_clay_line * grid.stride)
 
     return curr_count - ignore_tiles
 
@@ -315,7 +343,7 @@ def test_create_grid():
 
     grid = create_grid(example)
 
-    assert initial_grid == [''.join(row) for row in grid]
+    assert initial_grid == grid.lines()
 
 
 def test_fill_water():
@@ -336,17 +364,25 @@ def test_fill_water():
         "....#.....#...",
         "....#######..."
     ]
-    grid = [list(row) for row in grid]
+    grid = Grid.from_lines(grid)
 
     assert count_tiles(grid) == 57
 
 
+def solve(filename: Source) -> int:
+
+    with open_input(filename) as f:
+        grid = create_grid([line.strip() for line in f])
+
+    return count_tiles(grid)
+
+
 if __name__ == "__main__":
 
-    test_create_grid()
-    test_fill_water()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_create_grid()
+        test_fill_water()
+        print("all tests passed.")
 
-    grid = create_grid([line.strip() for line in open("input.txt")])
-    answer = count_tiles(grid)
+    answer = solve("input.txt")
     print("answer:", answer)
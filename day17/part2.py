@@ -10,23 +10,24 @@ total of 29 tiles.
 How many water tiles are left after the water spring stops producing water and
 all remaining water not at rest has drained?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from part1 import create_grid, fill_water
-from typing import List
+
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
 
 
-def count_retained_water(grid: List[List[str]]) -> int:
+def count_retained_water(grid: Grid) -> int:
 
     prev_count = 0
     while True:
         fill_water(grid)
 
-        retained_water_count = spring_water_count = 0
-        for row in grid:
-            for char in row:
-                if char == '~':
-                    retained_water_count += 1
-                if char == '|':
-                    spring_water_count += 1
+        retained_water_count = grid.count('~')
+        spring_water_count = grid.count('|')
 
         if prev_count == retained_water_count + spring_water_count:
             break
@@ -54,16 +55,24 @@ def test_fill_water():
         "....#.....#...",
         "....#######..."
     ]
-    grid = [list(row) for row in grid]
+    grid = Grid.from_lines(grid)
 
     assert count_retained_water(grid) == 29
 
 
+def solve(filename: Source) -> int:
+
+    with open_input(filename) as f:
+        grid = create_grid([line.strip() for line in f])
+
+    return count_retained_water(grid)
+
+
 if __name__ == "__main__":
 
-    test_fill_water()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_fill_water()
+        print("all tests passed.")
 
-    grid = create_grid([line.strip() for line in open("input.txt")])
-    answer = count_retained_water(grid)
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,39 @@
+"""
+Generates lumber collection areas for day 18 at a chosen size.
+
+    python generate.py 100 > big.txt
+
+The size is the side of the square area, which is filled at random with
+open ground, trees and lumberyards in roughly the real input's proportions.
+"""
+import random
+import sys
+
+
+SIZES = [25, 50, 100, 200]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    acres = ".|#"
+
+    return ''.join(
+        ''.join(rng.choices(acres, weights=(5, 3, 2), k=size)) + '\n'
+        for _ in range(size)
+    )
+
+
+def test_generate():
+
+    lines = generate(10, seed=18).splitlines()
+
+    assert len(lines) == 10
+    assert all(len(line) == 10 and set(line) <= set(".|#") for line in lines)
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -175,55 +175,74 @@ value after ten minutes: 37 * 31 = 1147.
 What will the total resource value of the lumber collection area be after 10 
 minutes?
 """
-from typing import List
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from aoc import backend
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
+
+
+OPEN, TREES, LUMBERYARD = b".|#"
+
+
+@backend.dispatch
+def change(before: Grid) -> Grid:
+
+    after = before.copy()
+    cells, result, stride = before.cells, after.cells, before.stride
+
+    for row in range(before.rows):
+        start = before.index(row, 0)
+        for i in range(start, start + before.cols):
+            # The 3x3 block around the acre, including the acre itself.
+            block = (
+                cells[i - stride - 1:i - stride + 2]
+                + cells[i - 1:i + 2]
+                + cells[i + stride - 1:i + stride + 2]
+            )
+            if cells[i] == OPEN:
+                if block.count(TREES) >= 3:
+                    result[i] = TREES
+            elif cells[i] == TREES:
+                if block.count(LUMBERYARD) >= 3:
+                    result[i] = LUMBERYARD
+            elif not (block.count(LUMBERYARD) >= 2 and block.count(TREES) >= 1):
+                result[i] = OPEN
 
+    return after
 
-def change(before: List[List[str]]) -> List[List[str]]:
-
-    offsets = [
-        (-1, -1), (-1, 0), (-1, 1),
-        (0, -1), (0, 1),
-        (1, -1), (1, 0), (1, 1)
-    ]
 
-    m, n = len(before), len(before[0])
-
-    after = [[''] * n for _ in range(m)]
-
-    for i in range(m):
-        for j in range(n):
-            open_ground = trees = lumberyard = 0
-            for di, dj in offsets:
-                if 0 <= i + di < m and 0 <= j + dj < n:
-                    if before[i + di][j + dj] == '.':
-                        open_ground += 1
-                    elif before[i + di][j + dj] == '|':
-                        trees += 1
-                    else:
-                        lumberyard += 1
-            if before[i][j] == '.':
-                if trees >= 3:
-                    after[i][j] = '|'
-                else:
-                    after[i][j] = before[i][j]
-            elif before[i][j] == '|':
-                if lumberyard >= 3:
-                    after[i][j] = '#'
-                else:
-                    after[i][j] = before[i][j]
-            else:
-                if lumberyard >= 1 and trees >= 1:
-                    after[i][j] = before[i][j]
-                else:
-                    after[i][j] = '.'
+@change.register("numpy")
+def change_numpy(before: Grid) -> Grid:
+
+    after = before.copy()
+    area = backend.view(before, 1)
+    acres = area[1:-1, 1:-1]
+    rows, cols = acres.shape
+
+    # Acres of each kind in the 3x3 block around every acre.
+    counts = []
+    for kind in (TREES, LUMBERYARD):
+        matches = (area == kind).astype("B")
+        counts.append(sum(
+            matches[dy:dy + rows, dx:dx + cols]
+            for dy in range(3) for dx in range(3)))
+    trees, lumberyards = counts
+    result = backend.view(after)
+    result[(acres == OPEN) & (trees >= 3)] = TREES
+    result[(acres == TREES) & (lumberyards >= 3)] = LUMBERYARD
+    result[(acres == LUMBERYARD)
+           & ~((lumberyards >= 2) & (trees >= 1))] = OPEN
 
     return after
 
 
-def get_resource_value(area: List[List[str]]) -> int:
+def get_resource_value(area: Grid) -> int:
 
-    wooded_acres = sum(row.count('|') for row in area)
-    lumberyards = sum(row.count('#') for row in area)
+    wooded_acres = area.count(TREES)
+    lumberyards = area.count(LUMBERYARD)
 
     return wooded_acres * lumberyards
 
@@ -242,7 +261,7 @@ def test_change():
         "|.||||..|.",
         "...#.|..|."
     ]
-    example = [list(row) for row in example]
+    example = Grid.from_lines(example, pad=1)
 
     after_10_minutes = [
         ".||##.....",
@@ -256,13 +275,12 @@ def test_change():
         "||||#|||||",
         "||||||||||"
     ]
-    after_10_minutes = [list(row) for row in after_10_minutes]
 
     area = example
     for _ in range(10):
         area = change(area)
 
-    assert area == after_10_minutes
+    assert area.lines() == after_10_minutes
 
 
 def test_get_resource_value():
@@ -279,19 +297,43 @@ def test_get_resource_value():
         "||||#|||||",
         "||||||||||"
     ]
-    after_10_minutes = [list(row) for row in after_10_minutes]
+    after_10_minutes = Grid.from_lines(after_10_minutes, pad=1)
 
     assert get_resource_value(after_10_minutes) == 1147
 
 
-if __name__ == "__main__":
+def test_backends():
+
+    area = read_input(backend.generated(18, 30))
+
+    for _ in range(10):
+        area = backend.compare(change, area)
+
+
+def read_input(filename: Source) -> Grid:
 
-    test_change()
-    test_get_resource_value()
-    print("all tests passed.")
+    with open_input(filename) as f:
+        area = Grid.from_lines([line.strip() for line in f], pad=1)
 
-    area = [list(line.strip()) for line in open("input.txt")]
+    return area
+
+
+def solve(filename: Source) -> int:
+
+    area = read_input(filename)
     for _ in range(10):
         area = change(area)
-    answer = get_resource_value(area)
+
+    return get_resource_value(area)
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_change()
+        test_get_resource_value()
+        test_backends()
+        print("all tests passed.")
+
+    answer = solve("input.txt")
     print("answer:", answer)
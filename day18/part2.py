@@ -6,32 +6,28 @@ years. Are the Elves collecting this lumber sustainably?
 What will the total resource value of the lumber collection area be after 
 1000000000 minutes?
 """
-from part1 import change, get_resource_value
-from typing import Dict
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from part1 import change, get_resource_value, read_input
 
-if __name__ == "__main__":
+from aoc.cycles import fast_forward
+from aoc.grid import Grid
+from aoc.inputs import Source
+
+
+def process(area: Grid, target_minutes: int) -> int:
 
-    area = [list(line.strip()) for line in open("input.txt")]
+    return get_resource_value(fast_forward(area, change, target_minutes))
 
-    visited: Dict[str, int] = dict()
-    joined = ''.join(''.join(row) for row in area)
-    visited[joined] = 0
 
-    target_minutes = 1000000000
-    t = 0
-    already_jumped = False
+def solve(filename: Source) -> int:
 
-    while t < target_minutes:
-        t += 1
-        area = change(area)
-        joined = ''.join(''.join(row) for row in area)
-        if joined in visited and not already_jumped:
-            jump = (target_minutes - t) // (t - visited[joined])
-            t += jump * (t - visited[joined])
-            already_jumped = True
-            continue
-        visited[joined] = t
+    return process(read_input(filename), 1000000000)
+
+
+if __name__ == "__main__":
 
-    answer = get_resource_value(area)
+    answer = solve("input.txt")
     print("answer:", answer)
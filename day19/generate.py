@@ -0,0 +1,80 @@
+"""
+Generates background programs for day 19 at a chosen size.
+
+    python generate.py 1000 > big.txt
+
+The program is the usual divisor-sum routine; part two patches its inner
+loop by instruction address, so only the constants that set up the number
+are changed. The size is the number used by part one, which runs in time
+quadratic in it; part two adds a fixed 10550400 to it.
+"""
+import sys
+
+
+SIZES = [100, 200, 400, 800]
+
+PROGRAM = """#ip 5
+addi 5 16 5
+seti 1 1 4
+seti 1 8 2
+mulr 4 2 3
+eqrr 3 1 3
+addr 3 5 5
+addi 5 1 5
+addr 4 0 0
+addi 2 1 2
+gtrr 2 1 3
+addr 5 3 5
+seti 2 6 5
+addi 4 1 4
+gtrr 4 1 3
+addr 3 5 5
+seti 1 4 5
+mulr 5 5 5
+addi 1 2 1
+mulr 1 1 1
+mulr 5 1 1
+muli 1 {} 1
+addi 3 {} 3
+mulr 3 5 3
+addi 3 {} 3
+addr 1 3 1
+addr 5 0 5
+seti 0 9 5
+setr 5 8 3
+mulr 3 5 3
+addr 5 3 3
+mulr 5 3 3
+muli 3 14 3
+mulr 3 5 3
+addr 1 3 1
+seti 0 4 0
+seti 0 3 5
+"""
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    # Part one's number is 2 * 2 * 19 * a + 22 * b + c.
+    if size < 76:
+        raise ValueError("day 19 needs a number of at least 76")
+
+    a = 1
+    b, c = divmod(size - 76, 22)
+
+    return PROGRAM.format(a, b, c)
+
+
+def test_generate():
+
+    lines = generate(836).splitlines()
+
+    assert lines[0] == "#ip 5"
+    assert len(lines) == 37
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
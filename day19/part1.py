@@ -95,27 +95,22 @@ In detail, when running this program, the following events occur:
 
 What value is left in register 0 when the background process halts?
 """
-from opcodes import OPERATORS
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import List
 
+from aoc.elfcode import VM, Program
+from aoc.inputs import Source, open_input
 
-def run(program: List[str]) -> List[int]:
 
-    ip = int(program[0].split()[1])
-    
-    instructions = program[1:]
-    register = [0, 0, 0, 0, 0, 0]
+def run(program: List[str]) -> List[int]:
 
-    while True:
-        op, *tail = instructions[register[ip]].split()
-        instr = [0] + [int(x) for x in tail]
-        f = OPERATORS[op]
-        register = f(register, instr)
-        if register[ip] + 1 >= len(instructions):
-            break
-        register[ip] += 1
+    vm = VM(Program.parse(program))
+    vm.run()
 
-    return register
+    return vm.registers
 
 
 def test_run():
@@ -134,10 +129,19 @@ def test_run():
     assert run(example) == [6, 5, 6, 0, 0, 9]
 
 
+def solve(filename: Source) -> int:
+
+    with open_input(filename) as f:
+        program = f.readlines()
+
+    return run(program)[0]
+
+
 if __name__ == "__main__":
 
-    test_run()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_run()
+        print("all tests passed.")
 
-    answer = run(open("input.txt").readlines())
-    print("answer:", answer[0])
+    answer = solve("input.txt")
+    print("answer:", answer)
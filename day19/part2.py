@@ -7,43 +7,45 @@ started with the value 1.
 
 What value is left in register 0 when this new background process halts?
 """
-from opcodes import OPERATORS
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import List
 
+from aoc.elfcode import VM, Program
+from aoc.inputs import Source, open_input
+
 
 def run(program: List[str]) -> List[int]:
 
-    ip = int(program[0].split()[1])
-    
-    instructions = program[1:]
-    register = [1, 0, 0, 0, 0, 0]
+    vm = VM(Program.parse(program), [1, 0, 0, 0, 0, 0])
 
-    while True:
+    while vm.run(breakpoints={2}) is not None:
 
-        op, *tail = instructions[register[ip]].split()
-        instr = [0] + [int(x) for x in tail]
-        f = OPERATORS[op]
+        register = vm.registers
 
-        if register[ip] == 2 and register[4] != 0:
+        # Instructions 2 to 11 add register 4 to register 0 if it divides
+        # register 1, the slow way; do it directly and jump past them.
+        if register[4] != 0:
             if register[1] % register[4] == 0:
                 register[0] += register[4]
-                print(register)
             register[2] = register[1]
             register[3] = 1
-            register[ip] = 12
-            continue
+            vm.ip = 12
+
+    return vm.registers
 
-        register = f(register, instr)
 
-        if register[ip] + 1 >= len(instructions):
-            break
+def solve(filename: Source) -> int:
 
-        register[ip] += 1
+    with open_input(filename) as f:
+        program = f.readlines()
 
-    return register
+    return run(program)[0]
 
 
 if __name__ == "__main__":
 
-    answer = run(open("input.txt").readlines())
-    print("answer:", answer[0])
+    answer = solve("input.txt")
+    print("answer:", answer)
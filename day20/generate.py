@@ -0,0 +1,76 @@
+"""
+Generates facility regexes for day 20 at a chosen size.
+
+    python generate.py 10000 > big.txt
+
+The size is roughly the length of the regex. Like the real input, groups
+are either detours that come back to where they started, written with an
+empty last option such as (NEWS|), or branches that end the route. Walks
+prefer rooms that have not been visited yet, so the map is mostly a tree.
+"""
+import random
+import sys
+from typing import Tuple
+
+
+SIZES = [1000, 2000, 4000, 8000]
+
+OPPOSITE = {'N': 'S', 'S': 'N', 'E': 'W', 'W': 'E'}
+
+MOVES = {'N': (-1, 0), 'S': (1, 0), 'E': (0, 1), 'W': (0, -1)}
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    visited = {(0, 0)}
+
+    def _walk(n: int, pos: Tuple[int, int]) -> Tuple[str, Tuple[int, int]]:
+        steps = []
+        for _ in range(n):
+            moves = [
+                (d, (pos[0] + dx, pos[1] + dy))
+                for d, (dx, dy) in MOVES.items()
+            ]
+            fresh = [m for m in moves if m[1] not in visited]
+            d, pos = rng.choice(fresh or moves)
+            visited.add(pos)
+            steps.append(d)
+        return ''.join(steps), pos
+
+    def _route(budget: int, depth: int, pos: Tuple[int, int]) -> str:
+        parts = []
+        while budget > 0:
+            steps, pos = _walk(min(budget, rng.randint(3, 20)), pos)
+            parts.append(steps)
+            budget -= len(steps)
+            if budget > 10 and rng.random() < 0.3:
+                out, _ = _walk(rng.randint(1, 4), pos)
+                back = ''.join(OPPOSITE[d] for d in reversed(out))
+                parts.append("({}{}|)".format(out, back))
+                budget -= 2 * len(out) + 3
+            if budget > 20 and depth < 20 and rng.random() < 0.2:
+                options = rng.randint(2, 3)
+                share = (budget - options - 1) // options
+                parts.append("({})".format('|'.join(
+                    _route(share, depth + 1, pos) for _ in range(options))))
+                break
+        return ''.join(parts)
+
+    return '^' + _route(size, 0, (0, 0)) + '$\n'
+
+
+def test_generate():
+
+    regex = generate(500, seed=20).strip()
+
+    assert regex[0] == '^' and regex[-1] == '$'
+    assert regex.count('(') == regex.count(')')
+    assert 400 <= len(regex) <= 600
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
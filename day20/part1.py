@@ -188,31 +188,36 @@ reach a room? That is, find the room for which the shortest path from your
 starting location to that room would require passing through the most doors; 
 what is the fewest doors you can pass through to reach it?
 """
-from collections import deque
-from typing import List, Deque, Set, Tuple
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import List, Tuple
 
-def create_grid(regex: str) -> List[List[str]]:
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
+from aoc.search import UNREACHED, bfs
 
-    n = regex.count('N')
-    s = regex.count('S')
-    e = regex.count('E')
-    w = regex.count('W')
 
-    grid = []
-    for i in range(n + s + 1):
-        grid.append("#?" + "#?" * (e + w) + "#")
-        grid.append("?." + "?." * (e + w) + "?")
-    grid.append("#?" + "#?" * (e + w) + "#")
+WALLS = bytes.maketrans(b"?", b"#")
+DOORS = b'|-'
 
-    result = [list(row) for row in grid]
 
-    return result
+def create_grid(rooms_down: int, rooms_across: int) -> Grid:
 
+    grid = Grid(2 * rooms_down + 1, 2 * rooms_across + 1)
+    wall = b"#?" * rooms_across + b"#"
+    pair = wall + b"?." * rooms_across + b"?"
+    for i in range(rooms_down):
+        grid.cells[2 * i * grid.stride:2 * (i + 1) * grid.stride] = pair
+    grid.cells[-grid.stride:] = wall
 
-def search(regex: str) -> List[List[str]]:
+    return grid
+
+
+def search(regex: str) -> Grid:
 
-    def _move(row, col, remaining):
+    def _move(pos, remaining):
 
         if not remaining:
             return
@@ -221,17 +226,17 @@ def search(regex: str) -> List[List[str]]:
         while left <= right:
             c = remaining[left]
             if c == 'N':
-                grid[row - 1][col] = '-'
-                row -= 2
+                doors.append((pos - stride, ord('-')))
+                pos -= 2 * stride
             if c == 'S':
-                grid[row + 1][col] = '-'
-                row += 2
+                doors.append((pos + stride, ord('-')))
+                pos += 2 * stride
             if c == 'E':
-                grid[row][col + 1] = '|'
-                col += 2
+                doors.append((pos + 1, ord('|')))
+                pos += 2
             if c == 'W':
-                grid[row][col - 1] = '|'
-                col -= 2
+                doors.append((pos - 1, ord('|')))
+                pos -= 2
             if c == '(':
                 right_paren = right
                 while left < right_paren and remaining[right_paren] != ')':
@@ -239,7 +244,7 @@ def search(regex: str) -> List[List[str]]:
                 stack = []
                 for mid in range(left + 1, right_paren + 1):
                     if remaining[mid] in '|)' and not stack:
-                        _move(row, col, remaining[left + 1: mid])
+                        _move(pos, remaining[left + 1: mid])
                         left = mid
                     elif remaining[mid] == '(':
                         stack.append('(')
@@ -249,54 +254,58 @@ def search(regex: str) -> List[List[str]]:
 
         return
 
-    grid = create_grid(regex)
-    m, n = len(grid), len(grid[0])
-    start_row, start_col = (m - 1) // 2, (n - 1) // 2
-    grid[start_row][start_col] = 'X'
+    # Walk on a plan big enough for any path, noting the doors, then draw
+    # only the rooms that were reached; the plan would be mostly empty.
+    stride = 2 * (regex.count('E') + regex.count('W') + 1) + 1
+    rows = 2 * (regex.count('N') + regex.count('S') + 1) + 1
+    start = (rows - 1) // 2 * stride + (stride - 1) // 2
+    doors: List[Tuple[int, int]] = []
 
-    _move(start_row, start_col, regex)
+    _move(start, regex)
 
-    for i in range(m):
-        for j in range(n):
-            if grid[i][j] == '?':
-                grid[i][j] = '#'
-
-    return grid
+    rooms = [divmod(start, stride)]
+    for door, symbol in doors:
+        step = stride if symbol == ord('-') else 1
+        rooms += [divmod(door - step, stride), divmod(door + step, stride)]
+    top, bottom = min(r for r, _ in rooms), max(r for r, _ in rooms)
+    left, right = min(c for _, c in rooms), max(c for _, c in rooms)
 
+    grid = create_grid((bottom - top) // 2 + 1, (right - left) // 2 + 1)
+    cells = grid.cells
 
-def shortest_path_to_furthest_room(grid:List[List[str]]) -> int:
+    def place(pos: int) -> int:
+        row, col = divmod(pos, stride)
+        return grid.index(row - top + 1, col - left + 1)
 
-    m, n = len(grid), len(grid[0])
+    cells[place(start)] = ord('X')
+    for door, symbol in doors:
+        cells[place(door)] = symbol
 
-    for i in range(m):
-        for j in range(n):
-            if grid[i][j] == 'X':
-                row, col = i, j
+    for i in range(0, len(cells), grid.stride):
+        cells[i:i + grid.stride] = cells[i:i + grid.stride].translate(WALLS)
 
-    q: Deque = deque()
-    q.append((row, col, 0))
+    return grid
 
-    visited: Set[Tuple[int, int]] = set()
 
-    furthest = 0
+def room_distances(grid: Grid) -> List[int]:
+    """
+    Doors passed through on the shortest path from X to every room it can
+    reach, in no particular order.
+    """
+    cells, stride = grid.cells, grid.stride
+    steps = (1, -1, stride, -stride)
 
-    while q:
+    def neighbours(room: int) -> List[int]:
+        return [room + 2 * step for step in steps if cells[room + step] in DOORS]
 
-         row, col, dist = q.popleft()
+    distance = bfs(len(cells), [cells.find(b'X')], neighbours).distance
 
-         if (row, col) in visited or not (0 <= row < m and 0 <= col < n):
-             continue
-         visited.add((row, col))
+    return [d for d in distance if d != UNREACHED]
 
-         furthest = max(furthest, dist)
 
-         for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-             if (0 <= row + dr < m and 0 <= col + dc < n
-                 and grid[row + dr][col + dc] in '|-'
-                 and (row + dr, col + dc) not in visited):
-                 q.append((row + 2 * dr, col + 2 * dc, dist + 1))
+def shortest_path_to_furthest_room(grid: Grid) -> int:
 
-    return furthest
+    return max(room_distances(grid))
 
 
 def test_search():
@@ -322,10 +331,19 @@ def test_search():
     assert shortest_path_to_furthest_room(grid) == 31
 
 
+def solve(filename: Source) -> int:
+
+    with open_input(filename) as f:
+        regex = f.read()
+
+    return shortest_path_to_furthest_room(search(regex))
+
+
 if __name__ == "__main__":
 
-    test_search()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_search()
+        print("all tests passed.")
 
-    answer = shortest_path_to_furthest_room(search(open("input.txt").read()))
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,74 @@
+"""
+Generates activation programs for day 21 at a chosen size.
+
+    python generate.py 24 > big.txt
+
+The program is the usual hash loop; both parts patch it by instruction
+address, so only its constants change. The size is the number of bits kept
+by the hash, which sets how long part two runs before a value repeats.
+"""
+import random
+import sys
+
+
+SIZES = [12, 16, 20, 24]
+
+PROGRAM = """#ip 1
+seti 123 0 4
+bani 4 456 4
+eqri 4 72 4
+addr 4 1 1
+seti 0 0 1
+seti 0 2 4
+bori 4 65536 3
+seti {seed} 1 4
+bani 3 255 5
+addr 4 5 4
+bani 4 {mask} 4
+muli 4 65899 4
+bani 4 {mask} 4
+gtir 256 3 5
+addr 5 1 1
+addi 1 1 1
+seti 27 7 1
+seti 0 1 5
+addi 5 1 2
+muli 2 256 2
+gtrr 2 3 2
+addr 2 1 1
+addi 1 1 1
+seti 25 0 1
+addi 5 1 5
+seti 17 2 1
+setr 5 7 3
+seti 7 8 1
+eqrr 4 0 5
+addr 5 1 1
+seti 5 0 1
+"""
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    if not 8 <= size <= 24:
+        raise ValueError("day 21 supports hashes of 8 to 24 bits")
+
+    rng = random.Random(seed)
+    mask = (1 << size) - 1
+
+    return PROGRAM.format(seed=rng.randint(1, mask), mask=mask)
+
+
+def test_generate():
+
+    lines = generate(24, seed=21).splitlines()
+
+    assert lines[0] == "#ip 1"
+    assert lines[11] == "bani 4 16777215 4"
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -44,39 +44,45 @@ What is the lowest non-negative integer value for register 0 that causes the
 program to halt after executing the fewest instructions? (Executing the same 
 instruction multiple times counts as multiple instructions executed.)
 """
-from opcodes import OPERATORS
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import List
 
+from aoc.elfcode import VM, Program
+from aoc.inputs import Source, open_input
+
 
 def run(program: List[str]) -> int:
 
-    ip = int(program[0].split()[1])
-    
-    instructions = program[1:]
-    register = [0, 0, 0, 0, 0, 0]
+    vm = VM(Program.parse(program))
 
     while True:
-        op, *tail = instructions[register[ip]].split()
-        instr = [0] + [int(x) for x in tail]
-        f = OPERATORS[op]
+        ip = vm.run(breakpoints={17, 28})
+
+        if ip is None:
+            return -1
 
-        if register[ip] == 17:
-            register[3] //= 256
-            register[ip] = 8
+        # Instructions 17 to 27 divide register 3 by 256 one step at a time.
+        if ip == 17:
+            vm.registers[3] //= 256
+            vm.ip = 8
             continue
 
-        if register[ip] == 28:
-            return register[4]
+        if ip == 28:
+            return vm.registers[4]
+
+
+def solve(filename: Source) -> int:
 
-        register = f(register, instr)
-        if register[ip] + 1 >= len(instructions):
-            break
-        register[ip] += 1
+    with open_input(filename) as f:
+        program = f.readlines()
 
-    return -1
+    return run(program)
 
 
 if __name__ == "__main__":
 
-    answer = run(open("input.txt").readlines())
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -8,47 +8,88 @@ What is the lowest non-negative integer value for register 0 that causes the
 program to halt after executing the most instructions? (The program must
 actually halt; running forever does not count as halting.)
 """
-from collections import defaultdict
-from opcodes import OPERATORS
-from typing import List
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import List, Optional, Tuple
 
-def run(program: List[str]) -> int:
+from aoc.cycles import find_cycle
+from aoc.elfcode import VM, Program
+from aoc.inputs import Source, open_input
+
+
+Registers = Tuple[int, ...]
 
-    ip = int(program[0].split()[1])
-    
-    instructions = program[1:]
-    register = [0, 0, 0, 0, 0, 0]
+BREAKPOINTS = frozenset({17, 28})
 
-    seen: List[int] = []
-    count = 0
 
+def next_check(vm: VM) -> Optional[Registers]:
+    """
+    Registers the next time the program compares register 0, at
+    instruction 28, or None if it halts first.
+    """
     while True:
-        op, *tail = instructions[register[ip]].split()
-        instr = [0] + [int(x) for x in tail]
-        f = OPERATORS[op]
+        ip = vm.run(BREAKPOINTS)
 
-        if register[ip] == 17:
-            register[3] //= 256
-            register[ip] = 8
+        if ip is None:
+            return None
+
+        if ip == 17:
+            vm.registers[3] //= 256
+            vm.ip = 8
             continue
 
-        if register[ip] == 28:
-            if register[4] in seen:
-                return seen[-1]
-            seen.append(register[4])
-            print(register[4])
+        return tuple(vm.registers)
+
+
+def run(program: List[str]) -> int:
+
+    vm = VM(Program.parse(program))
+
+    def step(registers: Registers) -> Registers:
+        vm.registers[:] = registers
+        vm.ip = 28
+        following = next_check(vm)
+        if following is None:
+            raise ValueError("no cycle")
+        return following
 
-        register = f(register, instr)
-        if register[ip] + 1 >= len(instructions):
-            break
-        register[ip] += 1
-        count += 1
+    first = next_check(vm)
+    if first is None:
+        return -1
 
-    return -1
+    # A program that halts before a value repeats has no last value.
+    try:
+        cycle = find_cycle(first, step, key=lambda registers: registers[4])
+    except ValueError:
+        return -1
+    if cycle is None:
+        return -1
+
+    return cycle.last[4]
+
+
+def test_run():
+
+    # Halts before its first check, and right after it.
+    assert run(["#ip 1"] + ["seti 0 0 5"] * 3) == -1
+    assert run(["#ip 1", "seti 27 0 1"] + ["seti 0 0 5"] * 28) == -1
+
+
+def solve(filename: Source) -> int:
+
+    with open_input(filename) as f:
+        program = f.readlines()
+
+    return run(program)
 
 
 if __name__ == "__main__":
 
-    answer = run(open("input.txt").readlines())
+    if "--solve-only" not in sys.argv[1:]:
+        test_run()
+        print("all tests passed.")
+
+    answer = solve("input.txt")
     print("answer:", answer)
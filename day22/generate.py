@@ -0,0 +1,39 @@
+"""
+Generates cave scans for day 22 at a chosen size.
+
+    python generate.py 100 > big.txt
+
+The size is the distance of the target from the mouth of the cave, split
+at random between its x and y coordinates. The depth is a multiple of three,
+which is what makes the mouth and the target rocky.
+"""
+import random
+import sys
+
+
+SIZES = [25, 50, 100, 200]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    x = rng.randint(size // 10, size // 3)
+
+    return "depth: {}\ntarget: {},{}\n".format(
+        3 * rng.randint(1000, 4000), x, size - x)
+
+
+def test_generate():
+
+    depth, target = generate(100, seed=22).splitlines()
+    x, y = target.split()[1].split(',')
+
+    assert int(depth.split()[1]) % 3 == 0
+    assert int(x) + int(y) == 100
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -97,7 +97,28 @@ In the cave system above, because the mouth is at 0,0 and the target is at
 What is the total risk level for the smallest rectangle that includes 0,0 and 
 the target's coordinates?
 """
-from typing import List
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from array import array
+from typing import List, Optional, Tuple
+
+from aoc import backend
+from aoc.cache import artifact
+from aoc.grid import Grid
+from aoc.inputs import Source, open_input
+
+
+def read_input(filename: Source) -> Tuple[str, str]:
+
+    with open_input(filename) as f:
+        depth, target = f.read().strip().split("\n")
+
+    _, depth = depth.split()
+    _, target = target.split()
+
+    return depth, target
 
 
 class Cave:
@@ -107,23 +128,18 @@ class Cave:
         self.depth = int(depth)
         self.target_x, self.target_y = map(int, target.split(','))
 
-        self._map = [
-            [-1] * (self.target_y + buf)
-            for _ in range(self.target_x + buf)
-        ]
-        self._el_mem = [
-            [-1] * (self.target_y + buf)
-            for _ in range(self.target_x + buf)
-        ]
-        self._gi_mem = [
-            [-1] * (self.target_y + buf)
-            for _ in range(self.target_x + buf)
-        ]
+        self._map = Grid(
+            self.target_x + buf, self.target_y + buf, fill=-1, typecode="b")
+        # Only for geologic_index; the map is computed a row at a time.
+        self._gi_mem: Optional[Grid] = None
 
     def geologic_index(self, x: int, y: int) -> int:
 
-        if self._gi_mem[y][x] != -1:
-            return self._gi_mem[y][x]
+        if self._gi_mem is None:
+            self._gi_mem = Grid(
+                self._map.rows, self._map.cols, fill=-1, typecode="i")
+        if self._gi_mem[y, x] != -1:
+            return self._gi_mem[y, x]
 
         if x == 0 and y == 0:
             return 0
@@ -137,10 +153,10 @@ class Cave:
         if x == 0:
             return y * 48271
 
-        self._gi_mem[y][x] = (
+        self._gi_mem[y, x] = (
             self.erosion_level(x - 1, y) * self.erosion_level(x, y - 1))
 
-        return self._gi_mem[y][x]
+        return self._gi_mem[y, x]
 
     def erosion_level(self, x: int, y: int) -> int:
 
@@ -152,11 +168,69 @@ class Cave:
 
     def _fill_map(self) -> None:
 
-        m, n = len(self._map), len(self._map[0])
-        for i in range(m):
-            for j in range(n):
-                if self._map[i][j] == -1:
-                    self._map[i][j] = self.region_type(j, i)
+        m, n = self._map.rows, self._map.cols
+        self._map = artifact(
+            "filled map {} {},{} {}x{}".format(
+                self.depth, self.target_x, self.target_y, m, n),
+            self._compute_map)
+
+    @backend.dispatch
+    def _compute_map(self) -> Grid:
+
+        # Same rules as geologic_index, a row at a time, keeping only the
+        # erosion levels of the row above.
+        m, n = self._map.rows, self._map.cols
+        above = [0] * n
+        for y in range(m):
+            row = [0] * n
+            for x in range(n):
+                if x == self.target_x and y == self.target_y:
+                    index = 0
+                elif y == 0:
+                    index = x * 16807
+                elif x == 0:
+                    index = y * 48271
+                else:
+                    index = row[x - 1] * above[x]
+                row[x] = (index + self.depth) % 20183
+            start = self._map.index(y, 0)
+            self._map.cells[start:start + n] = array("b", [e % 3 for e in row])
+            above = row
+
+        return self._map
+
+    @_compute_map.register("numpy")
+    def _compute_map_numpy(self) -> Grid:
+
+        # Every region depends on the ones left of and above it, which lie
+        # on the previous anti-diagonal x + y = d - 1, so the map is filled
+        # a diagonal at a time. last[y] is the erosion level at (d - 1 - y, y).
+        np = backend.numpy()
+        m, n = self._map.rows, self._map.cols
+        regions = backend.view(self._map)
+        target = self.target_x + self.target_y
+        last = np.zeros(m, dtype=np.int64)
+        erosion = np.zeros(m, dtype=np.int64)
+        for d in range(m + n - 1):
+            low, high = max(0, d - n + 1), min(d, m - 1)
+            top, bottom = max(low, 1), min(high, d - 1)
+            if top <= bottom:
+                erosion[top:bottom + 1] = (
+                    last[top:bottom + 1] * last[top - 1:bottom])
+            if low == 0:
+                erosion[0] = d * 16807
+            if high == d:
+                erosion[d] = d * 48271
+            if d == target and low <= self.target_y <= high:
+                erosion[self.target_y] = 0
+            erosion[low:high + 1] += self.depth
+            erosion[low:high + 1] %= 20183
+
+            ys = np.arange(low, high + 1)
+            regions[ys, d - ys] = erosion[low:high + 1] % 3
+            last, erosion = erosion, last
+
+        return self._map
 
     def draw_map(self) -> List[str]:
 
@@ -164,7 +238,10 @@ class Cave:
 
         symbols = ".=|"
 
-        result = [[symbols[i] for i in row] for row in self._map]
+        result = [
+            [symbols[i] for i in self._map.row(y)]
+            for y in range(self._map.rows)
+        ]
         result[0][0] = 'M'
         result[self.target_y][self.target_x] = 'T'
 
@@ -179,8 +256,8 @@ class Cave:
         self._fill_map()
 
         return sum(
-            sum(row[:self.target_x + 1])
-            for row in self._map[:self.target_y + 1]
+            sum(self._map.row(y)[:self.target_x + 1])
+            for y in range(self.target_y + 1)
         )
 
 
@@ -200,17 +277,32 @@ def test_all():
         ".===|=|===T"
     ]
     cave = Cave("510", "10,10")
+    assert cave._gi_mem is None
     assert cave.draw_map() == example
     assert cave.risk_level == 114
+    assert cave._gi_mem is None
+    assert cave.erosion_level(1, 1) == 1805
+    assert cave.region_type(10, 10) == 0
+
+
+def test_backends():
+
+    depth, target = read_input(backend.generated(22, 60))
+
+    backend.compare(lambda: Cave(depth, target, buf=20)._compute_map())
+
+
+def solve(filename: Source) -> int:
+
+    return Cave(*read_input(filename)).risk_level
 
 
 if __name__ == "__main__":
 
-    test_all()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_all()
+        test_backends()
+        print("all tests passed.")
 
-    depth, target = open("input.txt").read().strip().split("\n")
-    _, depth = depth.split()
-    _, target = target.split()
-    cave = Cave(depth, target)
-    print("answer:", cave.risk_level)
+    answer = solve("input.txt")
+    print("answer:", answer)
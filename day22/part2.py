@@ -299,47 +299,55 @@ minutes each) and the remaining 24 minutes are spent moving.
 
 What is the fewest number of minutes you can take to reach the target?
 """
-from collections import defaultdict
-import heapq
-from typing import Dict, Tuple
-from part1 import Cave
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import List, Tuple
+from part1 import Cave, read_input
 
-class RescueCave(Cave):
-
-    def shortest_rescue(self) -> int:
-
-        self._fill_map()
-        m, n = len(self._map), len(self._map[0])
-
-        q = [(0, 0, 0, 1)]
-
-        dist: Dict[Tuple[int, int, int], int] = dict()
-
-        target = (self.target_x, self.target_y, 1)
+from aoc.inputs import Source
+from aoc.search import dijkstra
 
-        while q:
 
-            time, x, y, tool = heapq.heappop(q)
+TORCH = 1
+SWITCH = 7
 
-            if (x, y, tool) == target:
-                return time
 
-            if (x, y, tool) in dist and dist[x, y, tool] <= time:
-                continue
-
-            dist[x, y, tool] = time
-
-            for next_tool in range(3):
-                if tool != next_tool and next_tool != self.region_type(x, y):
-                    heapq.heappush(q, (time + 7, x, y, next_tool))
+class RescueCave(Cave):
 
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                if (0 <= y + dy < m and 0 <= x + dx < n
-                    and tool != self.region_type(x + dx, y + dy)):
-                    heapq.heappush(q, (time + 1, x + dx, y + dy, tool))
+    def shortest_rescue(self) -> int:
 
-        return dist[target]
+        self._fill_map()
+        m, n = self._map.rows, self._map.cols
+        region = self._map.cells
+
+        # A node is a region and the tool in hand, region * 3 + tool; a tool
+        # cannot be used in the region type of the same number.
+        def edges(node: int) -> List[Tuple[int, int]]:
+            i, tool = divmod(node, 3)
+            y, x = divmod(i, n)
+            result = [(node - tool + 3 - tool - region[i], SWITCH)]
+            if x > 0 and region[i - 1] != tool:
+                result.append((node - 3, 1))
+            if x < n - 1 and region[i + 1] != tool:
+                result.append((node + 3, 1))
+            if y > 0 and region[i - n] != tool:
+                result.append((node - 3 * n, 1))
+            if y < m - 1 and region[i + n] != tool:
+                result.append((node + 3 * n, 1))
+            return result
+
+        def heuristic(node: int) -> int:
+            i, tool = divmod(node, 3)
+            y, x = divmod(i, n)
+            return (abs(x - self.target_x) + abs(y - self.target_y)
+                    + (SWITCH if tool != TORCH else 0))
+
+        target = (self.target_y * n + self.target_x) * 3 + TORCH
+        tree = dijkstra(3 * m * n, [TORCH], edges, {target}, heuristic)
+
+        return tree.distance[target]
 
 
 def test_all():
@@ -361,13 +369,16 @@ def test_all():
     assert cave.shortest_rescue() == 45
 
 
+def solve(filename: Source) -> int:
+
+    return RescueCave(*read_input(filename)).shortest_rescue()
+
+
 if __name__ == "__main__":
 
-    test_all()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_all()
+        print("all tests passed.")
 
-    depth, target = open("input.txt").read().strip().split("\n")
-    _, depth = depth.split()
-    _, target = target.split()
-    cave = RescueCave(depth, target)
-    print("answer:", cave.shortest_rescue())
+    answer = solve("input.txt")
+    print("answer:", answer)
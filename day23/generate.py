@@ -0,0 +1,42 @@
+"""
+Generates nanobot lists for day 23 at a chosen size.
+
+    python generate.py 10000 > big.txt
+
+Positions and radii are drawn from the same ranges as the real input.
+"""
+import random
+import sys
+
+
+SIZES = [1000, 10000, 100000, 1000000]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    spread = 150000000
+
+    return ''.join(
+        "pos=<{},{},{}>, r={}\n".format(
+            rng.randint(-spread, spread),
+            rng.randint(-spread, spread),
+            rng.randint(-spread, spread),
+            rng.randint(50000000, 100000000))
+        for _ in range(size)
+    )
+
+
+def test_generate():
+
+    lines = generate(10, seed=23).splitlines()
+
+    assert len(lines) == 10
+    assert all(line.startswith("pos=<") for line in lines)
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -59,22 +59,30 @@ largest signal radius.
 Find the nanobot with the largest signal radius. How many nanobots are in range
 of its signals?
 """
-from typing import List, Tuple
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from typing import Iterator, List, Tuple
 
-def read_input(filename: str) -> List[Tuple[int, int, int, int]]:
+from aoc.inputs import Source, open_input, records
 
-    result = []
-    with open(filename) as f:
+
+def iter_input(filename: Source) -> Iterator[Tuple[int, int, int, int]]:
+
+    with open_input(filename) as f:
         for line in f:
             splitted = line.split(',')
             pos0 = splitted[0].lstrip('pos=<')
             pos1 = splitted[1]
             pos2 = splitted[2].rstrip('>')
             r = splitted[3].strip().split('=')[1]
-            result.append((int(pos0), int(pos1), int(pos2), int(r)))
+            yield int(pos0), int(pos1), int(pos2), int(r)
+
+
+def read_input(filename: Source) -> List[Tuple[int, int, int, int]]:
 
-    return result
+    return list(records(filename, 4))  # type: ignore
 
 
 def strongest(
@@ -96,6 +104,8 @@ def how_many_in_range(
     data: List[Tuple[int, int, int, int]],
     target: Tuple[int, int, int, int]) -> int:
 
+    # A scan, not aoc.spatial: for one query, building the index costs more
+    # than the scan it saves, at every input size.
     x0, y0, z0, r0 = target
 
     return sum(
@@ -131,13 +141,20 @@ def test_how_many_in_range():
     assert how_many_in_range(data, strongest(data)) == 7
 
 
+def solve(filename: Source) -> int:
+
+    data = read_input(filename)
+
+    return how_many_in_range(data, strongest(data))
+
+
 if __name__ == "__main__":
 
-    test_strongest()
-    test_distance()
-    test_how_many_in_range()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_strongest()
+        test_distance()
+        test_how_many_in_range()
+        print("all tests passed.")
 
-    data = read_input("input.txt")
-    answer = how_many_in_range(data, strongest(data))
+    answer = solve("input.txt")
     print("answer:", answer)
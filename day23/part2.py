@@ -26,10 +26,16 @@ coordinate's distance from 0,0,0 is 36.
 Find the coordinates that are in range of the largest number of nanobots. What
 is the shortest manhattan distance between any of those points and 0,0,0?
 """
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 import heapq
 from typing import List, Tuple
 from part1 import read_input, distance
 
+from aoc.inputs import Source
+
 
 def shortest_distance_to_most_nanobots(
     data: List[Tuple[int, int, int, int]]
@@ -61,11 +67,16 @@ def test_shortest_distance_to_most_nanobots():
     assert shortest_distance_to_most_nanobots(data) == 36
 
 
+def solve(filename: Source) -> int:
+
+    return shortest_distance_to_most_nanobots(read_input(filename))
+
+
 if __name__ == "__main__":
 
-    test_shortest_distance_to_most_nanobots()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_shortest_distance_to_most_nanobots()
+        print("all tests passed.")
 
-    data = read_input("input.txt")
-    answer = shortest_distance_to_most_nanobots(data)
+    answer = solve("input.txt")
     print("answer:", answer)
@@ -0,0 +1,73 @@
+"""
+Generates army lists for day 24 at a chosen size.
+
+    python generate.py 20 > big.txt
+
+The size is the number of groups in each army. Every group has at least
+one attack type that each enemy group is not immune to, so a large enough
+boost always lets the immune system win.
+"""
+import random
+import sys
+
+from part1 import ATTACK_TYPES
+
+
+SIZES = [5, 10, 20, 40]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    initiatives = rng.sample(range(1, 2 * size + 1), 2 * size)
+
+    lines = []
+    for side, name in enumerate(["Immune System:", "Infection:"]):
+        if side:
+            lines.append("")
+        lines.append(name)
+        for i in range(size):
+            attack_type = rng.choice(ATTACK_TYPES)
+            others = [x for x in ATTACK_TYPES if x != attack_type]
+            rng.shuffle(others)
+            weak = others[:rng.randint(0, 2)]
+            immune = [] if side == 0 else others[2:2 + rng.randint(0, 2)]
+
+            traits = []
+            if weak:
+                traits.append("weak to " + ', '.join(weak))
+            if immune:
+                traits.append("immune to " + ', '.join(immune))
+
+            units = rng.randint(100, 3000)
+            hit_points = rng.randint(1000, 10000)
+            damage = rng.randint(5, 100) if side == 0 else rng.randint(5, 50)
+            lines.append(
+                "{} units each with {} hit points {}with an attack that does "
+                "{} {} damage at initiative {}".format(
+                    units,
+                    hit_points,
+                    "({}) ".format('; '.join(traits)) if traits else '',
+                    damage,
+                    attack_type,
+                    initiatives[side * size + i]
+                )
+            )
+
+    return '\n'.join(lines) + '\n'
+
+
+def test_generate():
+
+    lines = generate(3, seed=24).splitlines()
+
+    assert lines[0] == "Immune System:"
+    assert lines[5] == "Infection:"
+    assert len(lines) == 9
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
@@ -203,11 +203,23 @@ In the example above, the winning army ends up with 782 + 4434 = 5216 units.
 You scan the reindeer's condition (your puzzle input); the white-bearded man 
 looks nervous. As it stands now, how many units would the winning army have?
 """
-from typing import List, Tuple, Optional
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from typing import List, Tuple, Optional, Sequence
+
+from aoc import trace
+from aoc.inputs import Source, open_input
 
 
 ATTACK_TYPES = ['slashing', 'fire', 'bludgeoning', 'radiation', 'cold']
 
+TEAMS = ['Immune System', 'Infection']
+
+# The team and number of units of every group.
+State = List[Tuple[int, int]]
+
 
 class Units:
 
@@ -241,11 +253,11 @@ class Units:
         self._n = max(0, value)
 
 
-def read_input(filename: str) -> List[List[Units]]:
+def read_input(filename: Source) -> List[List[Units]]:
 
     units: List[List[Units]] = [[], []]
 
-    with open(filename) as f:
+    with open_input(filename) as f:
 
         for line in f:
 
@@ -315,7 +327,8 @@ def damage(attacking: Units, defending: Units) -> int:
 
 
 def select_target(
-    units: List[Units]
+    units: List[Units],
+    recorder: Optional[trace.Recorder] = None
     ) -> List[Tuple[Units, Optional[Units]]]:
 
     choosing = sorted(
@@ -344,10 +357,20 @@ def select_target(
         else:
             result.append((attacking, None))
 
+        if recorder is not None:
+            target = result[-1][1]
+            recorder.event(
+                trace.TARGET, units.index(attacking),
+                units.index(target) if target is not None else -1)
+
     return result
 
 
-def attack(targets: List[Tuple[Units, Optional[Units]]]) -> None:
+def attack(
+    targets: List[Tuple[Units, Optional[Units]]],
+    recorder: Optional[trace.Recorder] = None,
+    groups: Sequence[Units] = ()
+    ) -> None:
 
     pairs = sorted(
         targets,
@@ -359,16 +382,32 @@ def attack(targets: List[Tuple[Units, Optional[Units]]]) -> None:
         if attacking.n > 0 and defending:
             curr_damage = damage(attacking, defending)
             defending.n -= curr_damage // defending.hit_points
+            if recorder is not None:
+                target = groups.index(defending)
+                recorder.event(
+                    trace.ATTACK, groups.index(attacking), target,
+                    curr_damage, defending.n)
+                if defending.n == 0:
+                    recorder.event(trace.DEATH, target)
 
 
 def fight(immune: List[Units], infection: List[Units]) -> Tuple[int, int]:
 
     both_alive = True
     prev_immune_left = prev_infection_left = 0
+    groups = immune + infection
+    recorder = trace.start()
+    rounds = 0
+
+    def snapshot() -> State:
+        return [(unit.team, unit.n) for unit in groups]
 
     while both_alive:
-        targets = select_target(immune + infection)
-        attack(targets)
+        if recorder is not None:
+            recorder.round(rounds, snapshot)
+        targets = select_target(groups, recorder)
+        attack(targets, recorder, groups)
+        rounds += 1
 
         immune_left = sum(unit.n for unit in immune)
         infection_left = sum(unit.n for unit in infection)
@@ -382,9 +421,35 @@ def fight(immune: List[Units], infection: List[Units]) -> Tuple[int, int]:
 
         both_alive = immune_left > 0 and infection_left > 0
 
+    if recorder is not None:
+        recorder.end(rounds, snapshot)
+
     return immune_left, infection_left
 
 
+def apply_event(state: State, event: trace.Event) -> State:
+
+    if event.kind == trace.ATTACK:
+        state[event.b] = (state[event.b][0], event.d)
+
+    return state
+
+
+def draw_state(state: State) -> List[str]:
+
+    result = []
+    for team, name in enumerate(TEAMS):
+        result.append(name + ":")
+        groups = [n for t, n in state if t == team]
+        for number, n in enumerate(groups, 1):
+            if n > 0:
+                result.append("Group {} contains {} units".format(number, n))
+        if not any(groups):
+            result.append("No groups remain.")
+
+    return result
+
+
 def test_effective_power():
 
     units = Units(
@@ -409,12 +474,50 @@ def test_fight():
     assert infection_left == 782 + 4434
 
 
+def test_trace():
+
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "fight.trace")
+        with trace.recording(filename, every=3):
+            immune, infection = read_input("test.txt")
+            fight(immune, infection)
+
+        replay = trace.Replay(filename)
+        assert replay.rounds() == 8
+        assert draw_state(replay.state(1, apply_event)) == [
+            "Immune System:",
+            "Group 2 contains 905 units",
+            "Infection:",
+            "Group 1 contains 797 units",
+            "Group 2 contains 4434 units",
+        ]
+        assert draw_state(replay.state(8, apply_event)) == [
+            "Immune System:",
+            "No groups remain.",
+            "Infection:",
+            "Group 1 contains 782 units",
+            "Group 2 contains 4434 units",
+        ]
+        first = [e for e in replay.events(stop=1) if e.kind == trace.TARGET]
+        assert (first[0].a, first[0].b) == (2, 0)
+
+
+def solve(filename: Source) -> int:
+
+    immune, infection = read_input(filename)
+
+    return max(fight(immune, infection))
+
+
 if __name__ == "__main__":
 
-    test_effective_power()
-    test_fight()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_effective_power()
+        test_fight()
+        test_trace()
+        print("all tests passed.")
 
-    immune, infection = read_input("input.txt")
-    answer = fight(immune, infection)
-    print("answer:", max(answer))
+    answer = solve("input.txt")
+    print("answer:", answer)
@@ -1,6 +1,12 @@
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
 from typing import List
 from part1 import Units, read_input, fight
 
+from aoc.inputs import Source
+
 
 def boost(units: List[Units], amount: int) -> None:
 
@@ -18,18 +24,24 @@ def test_boost():
     assert infection_left == 0
 
 
-if __name__ == "__main__":
-
-    test_boost()
+def solve(filename: Source) -> int:
 
     boost_amount = 1
     while True:
-        immune, infection = read_input("input.txt")
+        immune, infection = read_input(filename)
         boost(immune, boost_amount)
         immune_left, infection_left = fight(immune, infection)
-        print(boost_amount, immune_left, infection_left)
         if infection_left == 0:
             break
         boost_amount += 1
 
-    print("answer:", immune_left)
+    return immune_left
+
+
+if __name__ == "__main__":
+
+    if "--solve-only" not in sys.argv[1:]:
+        test_boost()
+
+    answer = solve("input.txt")
+    print("answer:", answer)
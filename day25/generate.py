@@ -0,0 +1,40 @@
+"""
+Generates four-dimensional points for day 25 at a chosen size.
+
+    python generate.py 2000 > big.txt
+
+The points fill a hypercube that grows with the fourth root of their
+number, so the density stays that of the real input's 1300 points in
+[-8, 8]^4.
+"""
+import random
+import sys
+
+
+SIZES = [300, 600, 1200, 2400]
+
+
+def generate(size: int, seed: int = 0) -> str:
+
+    rng = random.Random(seed)
+    half = max(2, round(8 * (size / 1300) ** 0.25))
+
+    return ''.join(
+        "{},{},{},{}\n".format(*(rng.randint(-half, half) for _ in range(4)))
+        for _ in range(size)
+    )
+
+
+def test_generate():
+
+    lines = generate(100, seed=25).splitlines()
+
+    assert len(lines) == 100
+    assert all(len(line.split(',')) == 4 for line in lines)
+
+
+if __name__ == "__main__":
+
+    size = int(sys.argv[1])
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    sys.stdout.write(generate(size, seed))
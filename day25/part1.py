@@ -1,5 +1,29 @@
-from collections import deque, defaultdict
-from typing import List, Tuple, Set, Dict, Deque
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from typing import Iterator, List, Set, Tuple
+
+from aoc.inputs import Source, open_input, records
+from aoc.spatial import SpatialIndex
+from aoc.unionfind import UnionFind
+
+
+DIMENSIONS = 4
+# Points this close are in the same constellation.
+NEAR = 3
+
+
+def iter_input(filename: Source) -> Iterator[Tuple[int, ...]]:
+
+    with open_input(filename) as f:
+        for line in f:
+            yield tuple(map(int, line.strip().split(',')))
+
+
+def read_input(filename: Source) -> List[Tuple[int, ...]]:
+
+    return list(records(filename, DIMENSIONS))
 
 
 def distance(a, b):
@@ -7,50 +31,34 @@ def distance(a, b):
     return sum(abs(ax - bx) for ax, bx in zip(a, b))
 
 
+class Constellations:
+
+    def __init__(self) -> None:
+
+        self.index = SpatialIndex([], NEAR)
+        self.sets = UnionFind()
+
+    def __len__(self) -> int:
+
+        return self.sets.components
+
+    def add(self, point: Tuple[int, ...]) -> None:
+
+        i = self.sets.add()
+        for j in self.index.within(point, NEAR):
+            self.sets.union(i, j)
+        self.index.add(point)
+
+
 def get_constellations(
     points: List[Tuple[int, ...]]
     ) -> List[Set[Tuple[int, ...]]]:
 
-    n = len(points)
-    graph: Dict[Tuple[int, ...], Set[Tuple[int, ...]]] = defaultdict(set)
-    
-    for i in range(n):
-        for j in range(n):
-            if i == j or distance(points[i], points[j]) > 3:
-                continue
-            graph[points[i]].add(points[j])
-    
-    
-    constellations = []
-    
-    q: Deque[Tuple[int, ...]] = deque()
-    visited: Set[Tuple[int, ...]] = set()
-    remaining = set(points)
-    constellation: Set[Tuple[int, ...]] = set()
-    
-    while q or remaining:
-    
-        if q:
-            point = q.popleft()
-            if point in remaining:
-                remaining.remove(point)
-        else:
-            if constellation:
-                constellations.append(constellation)
-            point = remaining.pop()
-            constellation = set([point])
-    
-        if point in visited:
-            continue
-        visited.add(point)
-    
-        for neighbor in graph[point]:
-            q.append(neighbor)
-    
-    if constellation:
-        constellations.append(constellation)
+    sky = Constellations()
+    for point in points:
+        sky.add(point)
 
-    return constellations
+    return [set(points[i] for i in group) for group in sky.sets.groups()]
 
 
 def test_get_constellations():
@@ -114,14 +122,34 @@ def test_get_constellations():
     assert len(get_constellations(points)) == 8
 
 
+def test_constellations():
+
+    sky = Constellations()
+    counts = []
+    for point in [(0, 0, 0, 0), (6, 0, 0, 0), (0, 0, 0, 9), (3, 0, 0, 0),
+                  (0, 0, 0, 6), (0, 0, 0, 3)]:
+        sky.add(point)
+        counts.append(len(sky))
+
+    # (3, 0, 0, 0) joins the first two, (0, 0, 0, 3) the other two.
+    assert counts == [1, 2, 3, 2, 2, 1]
+
+
+def solve(filename: Source) -> int:
+
+    sky = Constellations()
+    for point in iter_input(filename):
+        sky.add(point)
+
+    return len(sky)
+
+
 if __name__ == "__main__":
 
-    test_get_constellations()
-    print("all tests passed.")
+    if "--solve-only" not in sys.argv[1:]:
+        test_get_constellations()
+        test_constellations()
+        print("all tests passed.")
 
-    points = [
-        tuple(map(int, line.strip().split(',')))
-        for line in open("input.txt")
-    ]
-    answer = len(get_constellations(points))
+    answer = solve("input.txt")
     print("answer:", answer)